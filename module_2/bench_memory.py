@@ -0,0 +1,123 @@
+"""
+Module 2 — Peak-RSS benchmark for the cleaners.
+
+Generates a synthetic GradCafe-shaped JSONL (default 500k rows, with the
+same kind of repetition as real scrapes: a few statuses/degrees/terms,
+~300 programs, ~1000 universities, ~20 rows per results-page URL), then runs
+each cleaner in a fresh child process and reports its peak RSS and time.
+
+Usage:
+    python module_2/bench_memory.py --rows 500000
+    # compare against another checkout (e.g. a git worktree of an older commit)
+    python module_2/bench_memory.py --root /tmp/old_checkout --root .
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Tuple
+import argparse
+import json
+import os
+import random
+import resource
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+
+# Cleaner name → (script relative to the repo root, CLI args template).
+CLEANERS: Dict[str, Tuple[str, List[str]]] = {
+    "module_2": ("module_2/clean.py",
+                 ["--src", "{src}", "--out", "{out}", "--llm", "{missing}"]),
+    "module_2_new": ("module_2_new/clean.py",
+                     ["--src", "{src}", "--out", "{out}", "--llm_prep", "{llm}"]),
+}
+
+
+def make_input(path: Path, rows: int, seed: int = 7) -> None:
+    """Write a synthetic scrape JSONL with realistic value repetition."""
+    rnd = random.Random(seed)
+    programs = [f"Program {i} Masters" for i in range(300)]
+    unis = [f"University {i}" for i in range(1000)]
+    statuses = ["Accepted", "Rejected", "Waitlisted", "Interview"]
+    with path.open("w", encoding="utf-8") as f:
+        for i in range(rows):
+            f.write(json.dumps({
+                "program": rnd.choice(programs),
+                "university": rnd.choice(unis),
+                "comments": f"comment {i}" if i % 3 == 0 else None,
+                "date_added": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}",
+                "entry_url": f"https://www.thegradcafe.com/survey/?q=cs&page={i // 20}",
+                "status": rnd.choice(statuses),
+                "accept_date": None,
+                "reject_date": None,
+                "start_term": rnd.choice(["Fall", "Spring"]),
+                "start_year": rnd.choice(["2024", "2025"]),
+                "intl_american": rnd.choice(["International", "American", None]),
+                "gre_total": rnd.choice([None, "320", "330"]),
+                "gre_verbal": rnd.choice([None, "160"]),
+                "gre_aw": rnd.choice([None, "4.0"]),
+                "degree": rnd.choice(["PhD", "Masters"]),
+                "gpa": rnd.choice([None, "3.5", "3.9", "3.75"]),
+            }) + "\n")
+
+
+def _child(script: str, argv: List[str]) -> None:
+    """Run one cleaner in this process and print peak RSS (KiB) as JSON."""
+    sys.argv = [script] + argv
+    sys.path.insert(0, str(Path(script).parent))
+    t0 = time.perf_counter()
+    runpy.run_path(script, run_name="__main__")
+    seconds = time.perf_counter() - t0
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print("BENCH " + json.dumps({"peak_rss_mib": round(peak_kib / 1024, 1),
+                                 "seconds": round(seconds, 2)}))
+
+
+def run(root: Path, name: str, src: Path, work: Path) -> Dict[str, float]:
+    """Run cleaner `name` from checkout `root` in a fresh child process."""
+    script, template = CLEANERS[name]
+    fill = {"src": str(src), "out": str(work / f"{name}.csv"),
+            "llm": str(work / f"{name}_llm.jsonl"), "missing": str(work / "none.json")}
+    argv = [a.format(**fill) for a in template]
+    proc = subprocess.run(
+        [sys.executable, __file__, "--child", str(root / script), "--"] + argv,
+        capture_output=True, text=True, check=True,
+    )
+    line = [ln for ln in proc.stdout.splitlines() if ln.startswith("BENCH ")][-1]
+    return json.loads(line[len("BENCH "):])
+
+
+def main() -> None:
+    """CLI entry point."""
+    ap = argparse.ArgumentParser(description="Peak-RSS benchmark for the cleaners.")
+    ap.add_argument("--rows", type=int, default=500_000)
+    ap.add_argument("--root", action="append", type=Path,
+                    help="Repo checkout(s) to measure (default: this one).")
+    ap.add_argument("--cleaner", action="append", choices=sorted(CLEANERS))
+    ap.add_argument("--child", help=argparse.SUPPRESS)
+    ap.add_argument("rest", nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        _child(args.child, [a for a in args.rest if a != "--"])
+        return
+
+    roots = args.root or [Path(__file__).resolve().parents[1]]
+    names = args.cleaner or sorted(CLEANERS)
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(tmp)
+        src = work / "applicant_data.jsonl"
+        make_input(src, args.rows)
+        print(f"input: {args.rows} rows, {os.path.getsize(src) / 2**20:.0f} MiB")
+        for root in roots:
+            for name in names:
+                res = run(root.resolve(), name, src, work)
+                print(f"{root} {name}: peak RSS {res['peak_rss_mib']} MiB, "
+                      f"{res['seconds']} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,18 @@ Module 2 — Clean and normalize scraped GradCafe data.
 Purpose:
     • Read the merged scrape output (JSONL or JSON).
     • Normalize dates, numeric fields, terms (Fall/Spring/etc.).
-    • Map nationality labels to a small controlled set.
+    • Map status / degree / nationality / term labels through the shared
+      rule table in normalize.py (same values the scraper and loader use).
     • Optionally merge canonicalized fields from llm_extend_applicant_data.json.
-    • Write a tidy CSV (data/gradcafe_cleaned.csv) for Module 3 loading.
+    • Write a tidy CSV (data/gradcafe_cleaned.csv) for Module 3 loading,
+      plus a columnar snapshot (data/gradcafe_cleaned.snapshot/) that
+      analytics can memory-map instead of reparsing the CSV.
+    • Profile every raw field in the same pass (null rate, approx distinct,
+      top values, parse failures, normalize time) →
+      data/gradcafe_cleaned.profile.json.
 
 Notes:
-    • Only course-allowed libraries are used (stdlib).
+    • stdlib, plus NumPy for the batch numeric conversion (numeric.py).
     • If the LLM extension file is present, we copy its
       llm_generated_program / llm_generated_university columns in.
 """
@@ -26,8 +32,22 @@ import argparse
 import csv
 import json
 import math
+import time
 from datetime import datetime
 
+# Shared status/degree/nationality/term rule table (module_2/normalize.py).
+from normalize import norm_degree, norm_nat, norm_status, norm_term
+# Batch (NumPy) numeric conversion; to_float below stays the reference.
+from numeric import CHUNK_ROWS, convert_rows
+# Columnar .npy snapshot written next to the CSV.
+from snapshot import snapshot_path, write_snapshot
+# Single-pass data-quality profile written next to the CSV.
+from profiler import Profiler, profile_path
+# Dictionary-encoded column store for the in-memory cleaned rows.
+from columns import ColumnStore
+# Persisted line-offset index; JSONL lines are read through mmap.
+from lineindex import load_index
+
 # ---------------------------------------------------------------------------
 # Defaults (override via CLI if needed)
 # ---------------------------------------------------------------------------
@@ -52,6 +72,46 @@ DATE_FORMATS: tuple[str, ...] = (
     "%b %d, %Y",     # Long: Jan 31, 2025
 )
 
+# Fixed CSV schema expected by Module 3 loader.
+CSV_COLUMNS = [
+    "p_id",
+    "program",
+    "comments",
+    "date_added",
+    "url",
+    "status",
+    "term",
+    "us_or_international",
+    "gpa",
+    "gre",
+    "gre_v",
+    "gre_aw",
+    "degree",
+    "llm_generated_program",
+    "llm_generated_university",
+]
+
+# Repeated, low-cardinality columns held as dictionary codes in memory
+# (url is unique per row and date_added grows with every scrape day: both
+# stay plain lists).
+CATEGORICAL_COLUMNS: tuple[str, ...] = (
+    "program",
+    "status",
+    "term",
+    "us_or_international",
+    "degree",
+    "llm_generated_program",
+    "llm_generated_university",
+)
+
+# Output numeric column → source key(s) on the row being built.
+NUMERIC_FIELDS: Dict[str, tuple[str, ...]] = {
+    "gpa": ("gpa",),
+    "gre": ("gre",),
+    "gre_v": ("gre_v",),
+    "gre_aw": ("gre_aw",),
+}
+
 # ---------------------------------------------------------------------------
 # Helper functions (pure, testable)
 # ---------------------------------------------------------------------------
@@ -64,7 +124,7 @@ def to_float(x: Any) -> Optional[float]:
     Handles:
         • Empty / sentinel strings ("", NA, N/A, None, null).
         • Numbers with commas / currency symbols.
-        • Existing ints / floats (filters out NaN).
+        • Existing ints / floats, and "nan" text (filters out NaN).
 
     Args:
         x: Input value from a record.
@@ -85,9 +145,10 @@ def to_float(x: Any) -> Optional[float]:
         return None
     s = s.replace(",", "").replace("$", "")
     try:
-        return float(s)
+        v = float(s)
     except Exception:
         return None
+    return None if math.isnan(v) else v
 
 
 def to_date(x: Any) -> Optional[str]:
@@ -114,25 +175,9 @@ def to_date(x: Any) -> Optional[str]:
     return None
 
 
-def norm_term(s: Any) -> Optional[str]:
-    """
-    Normalize term to a canonical label in Title Case.
-
-    Canonical outputs:
-        "Fall", "Spring", "Summer", "Winter"
-    """
-    if not s:
-        return None
-    t = str(s).strip().lower()
-    if t in {"fall", "fa", "f"}:
-        return "Fall"
-    if t in {"spring", "sp", "spr"}:
-        return "Spring"
-    if t in {"summer", "su", "sum"}:
-        return "Summer"
-    if t in {"winter", "wi", "win"}:
-        return "Winter"
-    return t.title()
+def _identity(x: Any) -> Any:
+    """Pass-through used to profile fields the cleaner copies verbatim."""
+    return x
 
 
 def build_term(start_term: Any,
@@ -173,36 +218,15 @@ def build_term(start_term: Any,
     return None
 
 
-def norm_nat(v: Any) -> Optional[str]:
-    """
-    Map free-text nationality label to a small set.
-
-    Canonical outputs:
-        "American", "International", "Other", or None when unknown.
-    """
-    if not v:
-        return None
-    s = str(v).strip().lower()
-    if "american" in s or s in {"us", "usa", "u.s.", "u.s.a.", "american"}:
-        return "American"
-    if "intern" in s or s in {"int", "intl", "international"}:
-        return "International"
-    if "other" in s:
-        return "Other"
-    return None
-
-
 def load_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
     """
     Stream records from a JSON Lines file.
 
-    Yields one dict per line; skips blank lines.
+    Yields one dict per line; skips blank lines (via the line index).
     """
-    with path.open(encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                yield json.loads(line)
+    with load_index(path) as idx:
+        for _, _, raw in idx.iter_lines():
+            yield json.loads(raw)
 
 
 def load_json_array(path: Path) -> list[Dict[str, Any]]:
@@ -233,17 +257,37 @@ def iter_source_rows(src: Path) -> Iterable[Dict[str, Any]]:
 # ---------------------------------------------------------------------------
 
 
+def _convert_chunk(chunk: list[Dict[str, Any]],
+                   stats: Dict[str, int],
+                   prof: Optional[Profiler]) -> None:
+    """Batch-convert the numeric columns of a chunk (timed per column)."""
+    if prof is None:
+        convert_rows(chunk, NUMERIC_FIELDS, stats)
+        return
+    for col, keys in NUMERIC_FIELDS.items():
+        raws = [r.get(col) for r in chunk]
+        t0 = time.perf_counter()
+        convert_rows(chunk, {col: keys}, stats)
+        prof.observe_column(col, raws, [r.get(col) for r in chunk],
+                            time.perf_counter() - t0)
+
+
 def clean_data(src: Path = DEFAULT_SRC,
                out_csv: Path = DEFAULT_OUT,
-               llm_path: Optional[Path] = DEFAULT_LLM) -> int:
+               llm_path: Optional[Path] = DEFAULT_LLM,
+               snapshot: bool = True,
+               profile: bool = True) -> int:
     """
     Transform scraped rows into a clean CSV for Module 3.
 
     Behavior:
         • Normalizes date fields into one 'date_added' column.
         • Produces a single 'term' column (e.g., "Fall 2025").
-        • Converts GPA/GRE values to floats, or None when not present.
-        • Maps nationality labels to 'American'/'International'/'Other'.
+        • Converts GPA/GRE values to floats, or None when not present
+          (column-wise per chunk via numeric.convert_rows; out-of-range
+          values are counted and reported).
+        • Maps nationality labels to 'American'/'International'/'Other'
+          (anything else is kept, Title Cased).
         • Copies llm_* fields from llm_extend_applicant_data.json if present.
 
     Args:
@@ -251,6 +295,8 @@ def clean_data(src: Path = DEFAULT_SRC,
         out_csv: Destination CSV path.
         llm_path: Optional path to llm_extend_applicant_data.json. If present
                   and aligned (same order/length), llm columns are taken from it.
+        snapshot: Also write the columnar snapshot next to the CSV.
+        profile: Also write the data-quality profile next to the CSV.
 
     Returns:
         Number of rows written to CSV.
@@ -264,16 +310,33 @@ def clean_data(src: Path = DEFAULT_SRC,
             # If it is malformed, we silently ignore and fall back to raw fields.
             llm_rows = None
 
-    rows_out: list[Dict[str, Any]] = []
+    # Cleaned rows are held column-wise (shared string tables + codes) and
+    # only decoded back to dicts while writing the CSV.
+    store = ColumnStore(CSV_COLUMNS, categorical=CATEGORICAL_COLUMNS,
+                        numeric=NUMERIC_FIELDS, integer=("p_id",))
+    chunk: list[Dict[str, Any]] = []
+    numeric_stats: Dict[str, int] = {}
+
+    # Profiling is timed per field; without it, call the normalizer directly.
+    prof = Profiler() if profile else None
+    if prof is not None:
+        ap = prof.apply
+    else:
+        def ap(_name, fn, raw, valid=None):
+            return fn(raw)
 
     # Enumerate records for a stable synthetic primary key (p_id).
     for i, r in enumerate(iter_source_rows(src), start=1):
-        # Build a friendly term string from hints.
-        term = build_term(
+        # Build a friendly term string from hints (profiled on start_term).
+        term = ap(
+            "term",
+            lambda start_term: build_term(
+                start_term,
+                r.get("start_year"),
+                r.get("accept_date"),
+                r.get("reject_date"),
+            ),
             r.get("start_term"),
-            r.get("start_year"),
-            r.get("accept_date"),
-            r.get("reject_date"),
         )
 
         # Default llm_* values come from raw fields; override if LLM file exists.
@@ -286,58 +349,67 @@ def clean_data(src: Path = DEFAULT_SRC,
             llm_uni = lu or llm_uni
 
         # Build a single, normalized output row.
-        rows_out.append(
+        chunk.append(
             {
                 "p_id": i,  # Synthetic, stable id for this export.
-                "program": r.get("program"),
-                "comments": r.get("comments"),
-                "date_added": to_date(
+                "program": ap("program", _identity, r.get("program")),
+                "comments": ap("comments", _identity, r.get("comments")),
+                "date_added": ap(
+                    "date_added",
+                    to_date,
                     r.get("date_added")
                     or r.get("accept_date")
-                    or r.get("reject_date")
+                    or r.get("reject_date"),
                 ),
-                "url": r.get("entry_url"),
-                "status": r.get("status"),
+                "url": ap("url", _identity, r.get("entry_url")),
+                "status": ap("status", norm_status, r.get("status"),
+                             valid=norm_status.labels),
                 "term": term,
-                "us_or_international": norm_nat(r.get("intl_american")),
-                "gpa": to_float(r.get("gpa")),
-                "gre": to_float(r.get("gre_total")),
-                "gre_v": to_float(r.get("gre_verbal")),
-                "gre_aw": to_float(r.get("gre_aw")),
-                "degree": r.get("degree") or None,
+                "us_or_international": ap("us_or_international", norm_nat,
+                                          r.get("intl_american")),
+                # Raw numeric values; converted column-wise per chunk below.
+                "gpa": r.get("gpa"),
+                "gre": r.get("gre_total"),
+                "gre_v": r.get("gre_verbal"),
+                "gre_aw": r.get("gre_aw"),
+                "degree": ap("degree", norm_degree, r.get("degree"),
+                             valid=norm_degree.labels),
                 "llm_generated_program": llm_prog,
                 "llm_generated_university": llm_uni,
             }
         )
 
-    # Fixed CSV schema expected by Module 3 loader.
-    cols = [
-        "p_id",
-        "program",
-        "comments",
-        "date_added",
-        "url",
-        "status",
-        "term",
-        "us_or_international",
-        "gpa",
-        "gre",
-        "gre_v",
-        "gre_aw",
-        "degree",
-        "llm_generated_program",
-        "llm_generated_university",
-    ]
+        if len(chunk) >= CHUNK_ROWS:
+            _convert_chunk(chunk, numeric_stats, prof)
+            store.extend(chunk)
+            chunk.clear()
+
+    if chunk:
+        _convert_chunk(chunk, numeric_stats, prof)
+        store.extend(chunk)
+        chunk.clear()
 
     # Write CSV with header + all rows.
     out_csv.parent.mkdir(parents=True, exist_ok=True)
     with out_csv.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=cols)
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
         writer.writeheader()
-        writer.writerows(rows_out)
+        writer.writerows(store.iter_rows())
 
-    print(f"Wrote {len(rows_out)} rows → {out_csv.resolve()}")
-    return len(rows_out)
+    print(f"Wrote {len(store)} rows → {out_csv.resolve()}")
+
+    if snapshot:
+        snap_dir = write_snapshot(store, snapshot_path(out_csv), extra_int=("p_id",))
+        print(f"Wrote columnar snapshot → {snap_dir.resolve()}")
+
+    if prof is not None:
+        prof.rows = len(store)
+        report = prof.write(profile_path(out_csv))
+        print(f"Wrote data-quality profile → {report.resolve()}")
+    bad = {k: v for k, v in numeric_stats.items() if v}
+    if bad:
+        print(f"Out-of-range numeric values (kept): {bad}")
+    return len(store)
 
 # ---------------------------------------------------------------------------
 # CLI
@@ -372,13 +444,24 @@ def _parse_args() -> argparse.Namespace:
         default=DEFAULT_LLM,
         help="Optional path to llm_extend_applicant_data.json.",
     )
+    parser.add_argument(
+        "--no-snapshot",
+        action="store_true",
+        help="Skip the columnar .npy snapshot next to the CSV.",
+    )
+    parser.add_argument(
+        "--no-profile",
+        action="store_true",
+        help="Skip the data-quality profile JSON next to the CSV.",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     """Entry point for script usage."""
     args = _parse_args()
-    clean_data(src=args.src, out_csv=args.out, llm_path=args.llm)
+    clean_data(src=args.src, out_csv=args.out, llm_path=args.llm,
+               snapshot=not args.no_snapshot, profile=not args.no_profile)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,136 @@
+"""
+Module 2 — Dictionary-encoded in-memory column store for cleaned rows.
+
+Purpose:
+    • Hold cleaned rows column-wise instead of one dict per row.
+    • Low-cardinality text fields (status, degree, term, us_or_international,
+      program, university …) are stored as int32 codes into one shared
+      string table per column, so each distinct string exists once.
+      Near-unique fields (url, date_added) stay plain lists.
+    • Numeric fields live in float64 arrays (NaN = None); free text stays a
+      plain list.
+    • Rows are decoded back to dicts only when writing (CSV/JSONL).
+
+Usage:
+    store = ColumnStore(CSV_COLS, categorical=("status", "degree"), numeric=("gpa",))
+    store.extend(chunk_of_row_dicts)
+    csv.DictWriter(f, CSV_COLS).writerows(store.iter_rows())
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import math
+
+
+class StringTable:
+    """Interning table: string ↔ dense integer code (-1 = None/empty)."""
+
+    def __init__(self) -> None:
+        self.strings: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def encode(self, value: Optional[str]) -> int:
+        """Return the code for value, adding it on first sight."""
+        if value is None or value == "":
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def decode(self, code: int) -> Optional[str]:
+        """Return the string for a code (None for -1)."""
+        return self.strings[code] if code >= 0 else None
+
+
+class ColumnStore:
+    """
+    Append-only columnar table.
+
+    Args:
+        columns: All column names, in output order.
+        categorical: Columns stored as codes into a per-column StringTable.
+        numeric: Columns stored as float64 (None ↔ NaN).
+        integer: Columns stored as int64 (e.g. p_id; None not allowed).
+    Remaining columns are kept as plain Python lists.
+    """
+
+    def __init__(self,
+                 columns: Sequence[str],
+                 categorical: Iterable[str] = (),
+                 numeric: Iterable[str] = (),
+                 integer: Iterable[str] = ()) -> None:
+        self.columns = list(columns)
+        self.tables: Dict[str, StringTable] = {c: StringTable() for c in categorical}
+        self._data: Dict[str, Any] = {}
+        self._kind: Dict[str, str] = {}
+        for c in self.columns:
+            if c in self.tables:
+                self._data[c], self._kind[c] = array("i"), "cat"
+            elif c in numeric:
+                self._data[c], self._kind[c] = array("d"), "num"
+            elif c in integer:
+                self._data[c], self._kind[c] = array("q"), "int"
+            else:
+                self._data[c], self._kind[c] = [], "obj"
+        self._n = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def append(self, row: Dict[str, Any]) -> None:
+        """Encode and append one row dict (missing keys → None)."""
+        for c in self.columns:
+            v = row.get(c)
+            kind = self._kind[c]
+            if kind == "cat":
+                self._data[c].append(self.tables[c].encode(v))
+            elif kind == "num":
+                self._data[c].append(math.nan if v is None else v)
+            else:
+                self._data[c].append(v)
+        self._n += 1
+
+    def extend(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Append a chunk of row dicts."""
+        for r in rows:
+            self.append(r)
+
+    def codes(self, col: str) -> Tuple[array, List[str]]:
+        """Raw (codes, string table) for a categorical column."""
+        return self._data[col], self.tables[col].strings
+
+    def column(self, col: str) -> List[Any]:
+        """Decoded values of one column."""
+        kind = self._kind[col]
+        data = self._data[col]
+        if kind == "cat":
+            strings = self.tables[col].strings
+            return [strings[c] if c >= 0 else None for c in data]
+        if kind == "num":
+            return [None if v != v else v for v in data]
+        return list(data)
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """Decode rows one at a time (used at write time only)."""
+        cols = self.columns
+        data = [self._data[c] for c in cols]
+        kinds = [self._kind[c] for c in cols]
+        strings = [self.tables[c].strings if c in self.tables else None for c in cols]
+        for i in range(self._n):
+            row: Dict[str, Any] = {}
+            for c, d, k, s in zip(cols, data, kinds, strings):
+                v = d[i]
+                if k == "cat":
+                    row[c] = s[v] if v >= 0 else None
+                elif k == "num":
+                    row[c] = None if v != v else v
+                else:
+                    row[c] = v
+            yield row
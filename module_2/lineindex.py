@@ -0,0 +1,259 @@
+"""
+Module 2 — Persisted line-offset index for large JSONL files.
+
+Purpose:
+    • Record the byte offset of every non-blank line of a JSONL file in an
+      array('Q') (uint64), saved next to it as <file>.idx.
+    • Keep the index current incrementally: an append-only file only has
+      its new tail scanned; a rewritten file is re-indexed from scratch.
+      A rewrite is a different inode, a shorter file, a changed mtime
+      without growth, an older mtime, or a changed tail checksum.
+    • Read lines through mmap, so callers can:
+        - count rows instantly                 len(idx)
+        - seek straight to row N               idx.record(n)
+        - split into equal-row parallel chunks idx.split(parts)
+
+Row numbers match validate.iter_jsonl: blank lines are skipped. Standard
+library only, so the scraper can use it too.
+
+Usage:
+    with load_index("applicant_data.jsonl") as idx:
+        print(len(idx), idx.record(0))
+        for row, offset, raw in idx.iter_lines(1000, 2000):
+            ...
+"""
+
+from __future__ import annotations
+
+from array import array
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Tuple, Union
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+PathLike = Union[str, Path]
+
+INDEX_VERSION = 2
+
+# magic, version, indexed bytes (up to and incl. the last newline), tail
+# digest, and the file's st_mtime_ns / st_ino when it was indexed
+HEADER = struct.Struct("<4sIQ16sqQ")
+MAGIC = b"LIDX"
+
+# Bytes before the indexed end that must be unchanged for an append.
+TAIL_BYTES = 4096
+
+# Bytes scanned per step while indexing.
+SCAN_BYTES = 16 << 20
+
+
+def index_path(path: PathLike) -> Path:
+    """Sidecar index file for a JSONL file: <file>.idx."""
+    return Path(str(path) + ".idx")
+
+
+def _tail_digest(mm: Optional[mmap.mmap], end: int) -> bytes:
+    """Checksum of the TAIL_BYTES before `end` (detects rewrites)."""
+    data = mm[max(0, end - TAIL_BYTES):end] if mm is not None and end else b""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _scan(mm: mmap.mmap, start: int, end: int, offsets: array) -> int:
+    """
+    Append offsets of non-blank, newline-terminated lines in [start, end).
+
+    Returns:
+        Byte position just past the last newline seen (start if none).
+    """
+    line_start = start
+    pos = start
+    while pos < end:
+        stop = min(pos + SCAN_BYTES, end)
+        cut = mm.rfind(b"\n", pos, stop)
+        pos = stop
+        if cut < 0:
+            continue  # one long line spans this window
+        at = line_start
+        for piece in mm[line_start:cut].split(b"\n"):
+            if piece.strip():
+                offsets.append(at)
+            at += len(piece) + 1
+        line_start = cut + 1
+    return line_start
+
+
+class LineIndex:
+    """Row → byte offset table over a memory-mapped JSONL file."""
+
+    def __init__(self, path: PathLike, offsets: array, size: int) -> None:
+        self.path = Path(path)
+        self.offsets = offsets
+        self.size = size
+        self._file = None
+        self._mm: Optional[mmap.mmap] = None
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __enter__(self) -> "LineIndex":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _map(self) -> mmap.mmap:
+        if self._mm is None:
+            self._file = open(self.path, "rb")
+            self._mm = mmap.mmap(self._file.fileno(), self.size, access=mmap.ACCESS_READ)
+        return self._mm
+
+    def close(self) -> None:
+        """Release the mapping (the index itself stays usable)."""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def span(self, row: int) -> Tuple[int, int]:
+        """Byte range of a row (may include trailing blank lines)."""
+        start = self.offsets[row]
+        end = self.offsets[row + 1] if row + 1 < len(self.offsets) else self.size
+        return start, end
+
+    def line(self, row: int) -> bytes:
+        """Raw bytes of one row."""
+        start, end = self.span(row)
+        return self._map()[start:end]
+
+    def record(self, row: int) -> Any:
+        """Decoded JSON object of one row."""
+        return json.loads(self.line(row))
+
+    def iter_lines(self,
+                   start: int = 0,
+                   stop: Optional[int] = None) -> Iterator[Tuple[int, int, bytes]]:
+        """Yield (row, byte_offset, raw_line) for rows [start, stop)."""
+        if not self.offsets:
+            return
+        stop = len(self.offsets) if stop is None else min(stop, len(self.offsets))
+        mm = self._map()
+        offs = self.offsets
+        for row in range(start, stop):
+            a = offs[row]
+            b = offs[row + 1] if row + 1 < len(offs) else self.size
+            yield row, a, mm[a:b]
+
+    def iter_records(self) -> Iterator[Any]:
+        """Yield each row decoded as JSON (bad lines are skipped)."""
+        for _, _, raw in self.iter_lines():
+            try:
+                yield json.loads(raw)
+            except ValueError:
+                continue
+
+    def split(self, parts: int) -> List[Tuple[int, int]]:
+        """
+        Cut the file into up to `parts` contiguous byte ranges holding about
+        the same number of rows; ranges cover the whole file.
+        """
+        n = len(self.offsets)
+        if not self.size:
+            return []
+        cuts = [0]
+        for k in range(1, parts):
+            i = n * k // parts
+            if 0 < i < n and self.offsets[i] > cuts[-1]:
+                cuts.append(self.offsets[i])
+        cuts.append(self.size)
+        return list(zip(cuts[:-1], cuts[1:]))
+
+
+def _read_index(path: Path) -> Tuple[array, int, bytes, Tuple[int, int]]:
+    """
+    Stored (offsets, indexed_size, tail_digest, (mtime_ns, inode)), or empty
+    if unusable.
+    """
+    try:
+        data = path.read_bytes()
+        magic, version, indexed, digest, mtime_ns, inode = HEADER.unpack_from(data)
+    except (OSError, struct.error):
+        return array("Q"), 0, b"", (0, 0)
+    if magic != MAGIC or version != INDEX_VERSION:
+        return array("Q"), 0, b"", (0, 0)
+    offsets = array("Q")
+    offsets.frombytes(data[HEADER.size:])
+    return offsets, indexed, digest, (mtime_ns, inode)
+
+
+def _write_index(path: Path,
+                 offsets: array,
+                 indexed: int,
+                 digest: bytes,
+                 st: os.stat_result) -> None:
+    """Atomically replace the sidecar (skipped if the directory is read-only)."""
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, INDEX_VERSION, indexed, digest,
+                                st.st_mtime_ns, st.st_ino))
+            offsets.tofile(f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _rewritten(st: os.stat_result,
+               indexed: int,
+               stamp: Tuple[int, int],
+               digest: bytes,
+               mm: mmap.mmap) -> bool:
+    """
+    True when the file is no longer the one indexed plus appended bytes.
+
+    An append keeps the inode, grows the file and moves the mtime forward;
+    anything else (a replaced file, a same-size edit, a restored older copy)
+    means the stored offsets cannot be trusted. The tail checksum then
+    catches in-place edits just before the indexed end.
+    """
+    mtime_ns, inode = stamp
+    if st.st_ino != inode or indexed > st.st_size or st.st_mtime_ns < mtime_ns:
+        return True
+    if st.st_mtime_ns != mtime_ns and st.st_size == indexed:
+        return True
+    return digest != _tail_digest(mm, indexed)
+
+
+def load_index(path: PathLike, persist: bool = True) -> LineIndex:
+    """
+    Open (building or extending as needed) the line index of a JSONL file.
+
+    Args:
+        path: JSONL file.
+        persist: Save new offsets back to <file>.idx.
+
+    Returns:
+        LineIndex covering the whole file, including an unterminated last
+        line (which is not persisted until its newline is written).
+    """
+    path = Path(path)
+    st = path.stat()
+    size = st.st_size
+    if size == 0:
+        return LineIndex(path, array("Q"), 0)
+
+    ipath = index_path(path)
+    offsets, indexed, digest, stamp = _read_index(ipath)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+        if _rewritten(st, indexed, stamp, digest, mm):
+            offsets, indexed = array("Q"), 0  # rewritten → rebuild
+        end = _scan(mm, indexed, size, offsets)
+        if persist and (end != indexed or stamp != (st.st_mtime_ns, st.st_ino)):
+            _write_index(ipath, offsets, end, _tail_digest(mm, end), st)
+        if end < size and mm[end:size].strip():
+            offsets.append(end)  # unterminated last line (in memory only)
+    return LineIndex(path, offsets, size)
@@ -0,0 +1,191 @@
+"""
+Module 2 — Shared rule table for categorical field normalization.
+
+Purpose:
+    • One place that defines how status, degree, nationality and term
+      labels are normalized, so the scraper, both cleaners and the Module 3
+      loader all agree on the same values.
+    • Rules are compiled once at import: an exact-match dictionary first,
+      then an ordered list of precompiled substring patterns.
+    • Results are cached per raw string, so repeated values (the common case
+      on GradCafe) cost a single dict lookup.
+
+Usage:
+    from normalize import norm_status, norm_degree, norm_nat, norm_term
+    norm_status("accepted via e-mail")      # -> "Accepted"
+    normalize_column("status", ["Rejected", "wait listed"])
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
+import re
+
+# ---------------------------------------------------------------------------
+# Rule table
+# ---------------------------------------------------------------------------
+
+# Each field has:
+#   exact    → lowercased raw string → canonical label (checked first)
+#   patterns → ordered (regex, canonical) pairs; first hit wins
+#   fallback → "title" (Title Case the input) or None (unknown → None)
+RULES: Dict[str, Dict[str, Any]] = {
+    "status": {
+        "exact": {
+            "accepted": "Accepted",
+            "rejected": "Rejected",
+            "waitlisted": "Waitlisted",
+            "wait listed": "Waitlisted",
+            "interview": "Interview",
+            "offer": "Accepted",
+        },
+        "patterns": [
+            (r"accept|offer", "Accepted"),
+            (r"reject|denied", "Rejected"),
+            (r"wait", "Waitlisted"),
+            (r"interview", "Interview"),
+        ],
+        "fallback": "title",
+    },
+    "degree": {
+        "exact": {
+            "phd": "PhD",
+            "ph.d": "PhD",
+            "ph.d.": "PhD",
+            "psyd": "PsyD",
+            "ms": "Masters",
+            "m.s.": "Masters",
+            "m.sc": "Masters",
+            "msc": "Masters",
+            "masters": "Masters",
+            "master": "Masters",
+        },
+        "patterns": [
+            (r"ph", "PhD"),
+            (r"psy", "PsyD"),
+        ],
+        "fallback": "title",
+    },
+    "nationality": {
+        "exact": {
+            "american": "American",
+            "us": "American",
+            "usa": "American",
+            "u.s.": "American",
+            "u.s.a.": "American",
+            "us citizen": "American",
+            "domestic": "American",
+            "international": "International",
+            "int": "International",
+            "intl": "International",
+            "other": "Other",
+        },
+        "patterns": [
+            (r"inter", "International"),
+            (r"amer|domestic|\bus\b|\bu\.s\.", "American"),
+            (r"other", "Other"),
+        ],
+        "fallback": "title",
+    },
+    "term": {
+        "exact": {
+            "fall": "Fall", "fa": "Fall", "f": "Fall",
+            "spring": "Spring", "sp": "Spring", "spr": "Spring",
+            "summer": "Summer", "su": "Summer", "sum": "Summer",
+            "winter": "Winter", "wi": "Winter", "win": "Winter",
+        },
+        "patterns": [],
+        "fallback": "title",
+    },
+}
+
+# Upper bound on cached raw strings per field (keeps memory bounded on junk).
+CACHE_MAX = 50_000
+
+
+class FieldNormalizer:
+    """
+    Compiled normalizer for one field of the rule table.
+
+    Lookup order:
+        1) cache of previously seen raw strings
+        2) exact dictionary on the stripped, lowercased value
+        3) ordered precompiled patterns
+        4) fallback (Title Case or None)
+    """
+
+    def __init__(self, field: str, spec: Dict[str, Any]) -> None:
+        self.field = field
+        self.exact: Dict[str, str] = dict(spec.get("exact", {}))
+        self.patterns: List[Tuple[Pattern[str], str]] = [
+            (re.compile(p), label) for p, label in spec.get("patterns", [])
+        ]
+        self.fallback: Optional[str] = spec.get("fallback")
+        # Canonical outputs (anything else came from the Title Case fallback).
+        self.labels = frozenset(self.exact.values()) | {
+            label for _, label in self.patterns
+        }
+        self._cache: Dict[str, Optional[str]] = {}
+
+    def _resolve(self, raw: str) -> Optional[str]:
+        """Apply exact → pattern → fallback rules to one raw string."""
+        s = raw.strip().lower()
+        if not s:
+            return None
+        hit = self.exact.get(s)
+        if hit is not None:
+            return hit
+        for rx, label in self.patterns:
+            if rx.search(s):
+                return label
+        if self.fallback == "title":
+            return s.title()
+        return None
+
+    def __call__(self, value: Any) -> Optional[str]:
+        """Normalize one value (None/empty → None)."""
+        if not value:
+            return None
+        raw = value if isinstance(value, str) else str(value)
+        try:
+            return self._cache[raw]
+        except KeyError:
+            pass
+        out = self._resolve(raw)
+        if len(self._cache) >= CACHE_MAX:
+            self._cache.clear()
+        self._cache[raw] = out
+        return out
+
+    def column(self, values: Iterable[Any]) -> List[Optional[str]]:
+        """Normalize a whole column, resolving each distinct value once."""
+        return [self(v) for v in values]
+
+
+# Compiled once at import; shared by every caller in the process.
+NORMALIZERS: Dict[str, FieldNormalizer] = {
+    field: FieldNormalizer(field, spec) for field, spec in RULES.items()
+}
+
+norm_status = NORMALIZERS["status"]
+norm_degree = NORMALIZERS["degree"]
+norm_nat = NORMALIZERS["nationality"]
+norm_term = NORMALIZERS["term"]
+
+
+def normalize_column(field: str, values: Iterable[Any]) -> List[Optional[str]]:
+    """
+    Bulk-normalize a column of raw values for one field.
+
+    Args:
+        field: One of RULES' keys ("status", "degree", "nationality", "term").
+        values: Raw values (strings, None, or anything str()-able).
+
+    Returns:
+        List of canonical labels (or None) in input order.
+    """
+    try:
+        normalizer = NORMALIZERS[field]
+    except KeyError:
+        raise ValueError(f"Unknown normalization field: {field}") from None
+    return normalizer.column(values)
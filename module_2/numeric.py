@@ -0,0 +1,132 @@
+"""
+Module 2 — Vectorized numeric column conversion (NumPy).
+
+Purpose:
+    • Convert the GPA / GRE / GRE-V / GRE-AW columns of a chunk of rows in one
+      NumPy pass instead of one try/except float() per value.
+    • Map sentinels ("", NA, N/A, None, null) to NaN.
+    • Range-check each column at the same time and count out-of-range values.
+
+The scalar helpers stay the reference implementation:
+    • clean.to_float                 (strip_symbols=True: drops "," and "$")
+    • module_2_new/clean._num        (strip_symbols=False)
+    • module_3_new/load_data.parse_num (strip_symbols=False)
+NaN in the arrays corresponds to None from the scalar helpers, which also
+return None for "nan" text; "inf" parses to inf on both paths.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+import math
+
+import numpy as np
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+# Values treated as "missing" (same set clean.to_float checks).
+SENTINELS: Tuple[str, ...] = ("", "NA", "N/A", "None", "null", "Null")
+
+# Plausible inclusive ranges per output column. Values outside are kept but
+# counted, so the caller can report them (the DB view applies its own filter).
+RANGES: Dict[str, Tuple[float, float]] = {
+    "gpa": (0.0, 4.99),      # 4.x scales (4.0, 4.3, 4.33)
+    "gre": (260.0, 340.0),   # current total scale
+    "gre_v": (130.0, 170.0),
+    "gre_aw": (0.0, 6.0),
+}
+
+# Rows per conversion chunk used by the cleaners and loader.
+CHUNK_ROWS = 5000
+
+# ---------------------------------------------------------------------------
+# Conversion
+# ---------------------------------------------------------------------------
+
+
+def _scalar(s: str) -> float:
+    """Per-element fallback for chunks that contain unparseable text."""
+    try:
+        return float(s)
+    except ValueError:
+        return math.nan
+
+
+def to_float_array(values: Sequence[Any], strip_symbols: bool = True) -> np.ndarray:
+    """
+    Convert a column of raw values to a float64 array (NaN = missing/bad).
+
+    Args:
+        values: Raw values (str, int, float or None).
+        strip_symbols: Drop "," and "$" before parsing (clean.to_float rules).
+
+    Returns:
+        float64 array with one entry per input value.
+    """
+    if len(values) == 0:
+        return np.empty(0, dtype=np.float64)
+
+    s = np.char.strip(np.asarray(values, dtype=str))
+    missing = np.isin(s, SENTINELS)
+    if strip_symbols:
+        s = np.char.replace(np.char.replace(s, ",", ""), "$", "")
+    s = np.where(missing, "nan", s)
+
+    try:
+        # Fast path: the whole chunk parses in C.
+        return s.astype(np.float64)
+    except ValueError:
+        # Some junk text in this chunk; parse element-wise.
+        return np.fromiter((_scalar(x) for x in s), dtype=np.float64, count=len(s))
+
+
+def out_of_range(name: str, arr: np.ndarray) -> int:
+    """Count non-NaN values of column `name` outside RANGES[name]."""
+    bounds = RANGES.get(name)
+    if bounds is None:
+        return 0
+    lo, hi = bounds
+    present = ~np.isnan(arr)
+    return int(np.count_nonzero(present & ((arr < lo) | (arr > hi))))
+
+
+def convert_rows(rows: List[Dict[str, Any]],
+                 fields: Mapping[str, Iterable[str]],
+                 stats: Optional[Dict[str, int]] = None,
+                 strip_symbols: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Convert numeric fields of a chunk of row dicts in place.
+
+    Args:
+        rows: Row dicts; each output column is overwritten with float or None.
+        fields: Output column → source keys tried in order (first truthy wins),
+                e.g. {"gre": ("gre_total", "gre")}.
+        stats: Optional counter dict; "<col>_out_of_range" keys are incremented.
+        strip_symbols: Passed to to_float_array.
+
+    Returns:
+        Output column → float64 array for the chunk.
+    """
+    arrays: Dict[str, np.ndarray] = {}
+    for col, keys in fields.items():
+        keys = tuple(keys)
+        raw = []
+        for r in rows:
+            v = None
+            for k in keys:
+                v = r.get(k)
+                if v:
+                    break
+            raw.append(v)
+        arr = to_float_array(raw, strip_symbols=strip_symbols)
+        arrays[col] = arr
+
+        if stats is not None:
+            key = f"{col}_out_of_range"
+            stats[key] = stats.get(key, 0) + out_of_range(col, arr)
+
+        for r, v in zip(rows, arr.tolist()):
+            r[col] = None if v != v else v  # NaN → None for CSV/DB writers
+    return arrays
@@ -0,0 +1,197 @@
+"""
+Module 2 — Streaming data-quality profiler for the cleaner.
+
+Purpose:
+    • Observe every raw field of every row in a single pass.
+    • Per field, track:
+        - null rate
+        - approximate distinct count (HyperLogLog, fixed 4 KiB of registers)
+        - top-K raw values (Space-Saving, fixed number of counters)
+        - parse / normalization failures
+        - time spent normalizing the field
+    • Write a JSON report next to the cleaned CSV.
+
+Memory is bounded per field regardless of input size, so the profiler can
+stay on for every full run.
+
+Usage:
+    prof = Profiler()
+    iso = prof.apply("date_added", to_date, raw)      # times + records
+    prof.write(Path("data/gradcafe_cleaned.profile.json"))
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Container, Dict, List, Optional, Sequence
+import hashlib
+import json
+import math
+import time
+
+# ---------------------------------------------------------------------------
+# Sketches
+# ---------------------------------------------------------------------------
+
+# Longest raw value kept in the top-K table (longer values are truncated).
+MAX_VALUE_CHARS = 80
+
+
+class HyperLogLog:
+    """Approximate distinct counter (2**p one-byte registers, ~1.6% error at p=12)."""
+
+    def __init__(self, p: int = 12) -> None:
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+        self._alpha = 0.7213 / (1 + 1.079 / self.m)
+
+    def add(self, value: str) -> None:
+        """Add one value (hashed with 64-bit BLAKE2b for run-to-run stability)."""
+        h = int.from_bytes(
+            hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        bits = 64 - self.p
+        idx = h >> bits
+        rank = bits - (h & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def count(self) -> int:
+        """Current cardinality estimate (small-range corrected)."""
+        z = sum(2.0 ** -r for r in self.registers)
+        est = self._alpha * self.m * self.m / z
+        zeros = self.registers.count(0)
+        if est <= 2.5 * self.m and zeros:
+            est = self.m * math.log(self.m / zeros)
+        return int(round(est))
+
+
+class SpaceSaving:
+    """Top-K heavy hitters with a fixed number of counters."""
+
+    def __init__(self, capacity: int = 32) -> None:
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+
+    def add(self, value: str) -> None:
+        """Count one value; evict the current minimum when full."""
+        if value in self.counts:
+            self.counts[value] += 1
+        elif len(self.counts) < self.capacity:
+            self.counts[value] = 1
+        else:
+            victim = min(self.counts, key=self.counts.__getitem__)
+            self.counts[value] = self.counts.pop(victim) + 1
+
+    def top(self, k: int) -> List[List[Any]]:
+        """Return up to k [value, approx_count] pairs, most frequent first."""
+        items = sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)
+        return [[v, c] for v, c in items[:k]]
+
+
+# ---------------------------------------------------------------------------
+# Profiler
+# ---------------------------------------------------------------------------
+
+
+class FieldProfile:
+    """Bounded-memory statistics for one field."""
+
+    def __init__(self, top_k: int) -> None:
+        self.top_k = top_k
+        self.count = 0
+        self.nulls = 0
+        self.parse_failures = 0
+        self.seconds = 0.0
+        self.hll = HyperLogLog()
+        self.top = SpaceSaving(capacity=top_k * 4)
+
+    def observe(self, raw: Any, failed: bool = False) -> None:
+        """Record one raw value (None/blank counts as null)."""
+        self.count += 1
+        if raw is None or (isinstance(raw, str) and not raw.strip()):
+            self.nulls += 1
+            return
+        s = str(raw)[:MAX_VALUE_CHARS]
+        self.hll.add(s)
+        self.top.add(s)
+        if failed:
+            self.parse_failures += 1
+
+    def report(self) -> Dict[str, Any]:
+        """JSON-ready summary."""
+        return {
+            "count": self.count,
+            "nulls": self.nulls,
+            "null_rate": round(self.nulls / self.count, 4) if self.count else 0.0,
+            "distinct_approx": self.hll.count(),
+            "top": self.top.top(self.top_k),
+            "parse_failures": self.parse_failures,
+            "normalize_seconds": round(self.seconds, 6),
+        }
+
+
+class Profiler:
+    """Single-pass profiler keyed by field name."""
+
+    def __init__(self, top_k: int = 10) -> None:
+        self.top_k = top_k
+        self.rows = 0
+        self.fields: Dict[str, FieldProfile] = {}
+
+    def field(self, name: str) -> FieldProfile:
+        """Get (or create) the profile for a field."""
+        fp = self.fields.get(name)
+        if fp is None:
+            fp = self.fields[name] = FieldProfile(self.top_k)
+        return fp
+
+    def apply(self,
+              name: str,
+              fn: Callable[[Any], Any],
+              raw: Any,
+              valid: Optional[Container[Any]] = None) -> Any:
+        """
+        Run fn(raw), time it, and record the raw value.
+
+        A non-null raw value counts as a parse failure when fn returns None,
+        or (if `valid` is given) when the result is not in `valid`.
+        """
+        t0 = time.perf_counter()
+        out = fn(raw)
+        fp = self.field(name)
+        fp.seconds += time.perf_counter() - t0
+        failed = out is None or (valid is not None and out not in valid)
+        fp.observe(raw, failed=failed)
+        return out
+
+    def observe_column(self,
+                       name: str,
+                       raws: Sequence[Any],
+                       values: Sequence[Any],
+                       seconds: float) -> None:
+        """Record a batch-converted column (failure = raw present, value None)."""
+        fp = self.field(name)
+        fp.seconds += seconds
+        for raw, val in zip(raws, values):
+            fp.observe(raw, failed=val is None)
+
+    def report(self) -> Dict[str, Any]:
+        """Full JSON-ready report."""
+        return {
+            "rows": self.rows,
+            "fields": {name: fp.report() for name, fp in self.fields.items()},
+        }
+
+    def write(self, path: Path) -> Path:
+        """Write the report as pretty JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), ensure_ascii=False, indent=2),
+                        encoding="utf-8")
+        return path
+
+
+def profile_path(out_csv: Path) -> Path:
+    """Default report path for a CSV: <stem>.profile.json next to it."""
+    return out_csv.with_name(out_csv.stem + ".profile.json")
@@ -0,0 +1,248 @@
+"""
+Module 2 — Declarative validation rules for validate.py.
+
+Purpose:
+    • Describe row checks as plain data (dicts / JSON), not code:
+        - range     → numeric field within [min, max] (unparseable = violation)
+        - vocab     → value in an allowed set, or (with "labels") the
+                      normalize.py normalizer maps it to one of its labels
+        - date      → value parses with one of the given strptime formats
+        - pattern   → value matches a regular expression
+        - blacklist → value (stripped, case-folded) is not a known junk string
+    • Compile each spec once into a small closure (precompiled regex,
+      frozenset vocabularies, cached date parses) so the validator can run
+      every rule over every row in a single pass.
+    • Time each rule, so slow rules show up in the report.
+
+New kinds are added with the @rule_kind decorator.
+
+Usage:
+    rules = RuleSet(DEFAULT_RULES)              # or RuleSet(load_rules(path))
+    seconds = {}
+    rules.evaluate({"gpa": "5.7"}, seconds)     # -> ["range:gpa"]
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import json
+import re
+import time
+
+# Shared label sets (module_2/normalize.py), numeric ranges (numeric.py) and
+# the date formats the snapshot also parses (snapshot.py).
+from normalize import NORMALIZERS
+from numeric import RANGES, SENTINELS
+from snapshot import DATE_FORMATS
+
+# A compiled check returns True when the record violates the rule.
+Check = Callable[[Dict[str, Any]], bool]
+
+# Upper bound on cached date parses per rule (same policy as normalize.py).
+CACHE_MAX = 50_000
+
+# ---------------------------------------------------------------------------
+# Default rule set (raw scraper field names)
+# ---------------------------------------------------------------------------
+
+DEFAULT_RULES: List[Dict[str, Any]] = [
+    {"name": "range:gpa", "kind": "range", "field": "gpa", "range": "gpa"},
+    {"name": "range:gre_total", "kind": "range", "field": "gre_total", "range": "gre"},
+    {"name": "range:gre_verbal", "kind": "range", "field": "gre_verbal", "range": "gre_v"},
+    {"name": "range:gre_aw", "kind": "range", "field": "gre_aw", "range": "gre_aw"},
+    {"name": "vocab:status", "kind": "vocab", "field": "status", "labels": "status"},
+    {"name": "vocab:degree", "kind": "vocab", "field": "degree", "labels": "degree"},
+    {
+        "name": "date:date_added",
+        "kind": "date",
+        "field": "date_added",
+        "formats": ["%Y-%m-%d", *DATE_FORMATS],
+    },
+    {
+        "name": "pattern:entry_url",
+        "kind": "pattern",
+        "field": "entry_url",
+        "regex": r"https?://(www\.)?thegradcafe\.com/\S*",
+    },
+    {
+        "name": "junk:program",
+        "kind": "blacklist",
+        "field": "program",
+        "values": ["n/a", "na", "none", "null", "nan", "undefined", "-", "--", "?", "test"],
+    },
+    {
+        "name": "junk:university",
+        "kind": "blacklist",
+        "field": "university",
+        "values": ["n/a", "na", "none", "null", "nan", "undefined", "-", "--", "?", "test"],
+    },
+]
+
+# ---------------------------------------------------------------------------
+# Rule kinds
+# ---------------------------------------------------------------------------
+
+KINDS: Dict[str, Callable[[Dict[str, Any]], Check]] = {}
+
+
+def rule_kind(name: str) -> Callable[[Callable[[Dict[str, Any]], Check]],
+                                     Callable[[Dict[str, Any]], Check]]:
+    """Register a compiler for a rule kind (spec dict → Check)."""
+    def register(fn: Callable[[Dict[str, Any]], Check]) -> Callable[[Dict[str, Any]], Check]:
+        KINDS[name] = fn
+        return fn
+    return register
+
+
+def _present(v: Any) -> bool:
+    """Missing values are the missing-key check's concern, not a rule's."""
+    return v is not None and not (isinstance(v, str) and v.strip() in SENTINELS)
+
+
+@rule_kind("range")
+def _compile_range(spec: Dict[str, Any]) -> Check:
+    field = spec["field"]
+    if "range" in spec:
+        lo, hi = RANGES[spec["range"]]
+    else:
+        lo, hi = float(spec["min"]), float(spec["max"])
+
+    def check(rec: Dict[str, Any]) -> bool:
+        v = rec.get(field)
+        if not _present(v):
+            return False
+        try:
+            x = float(v)
+        except (TypeError, ValueError):
+            return True
+        return not lo <= x <= hi
+    return check
+
+
+@rule_kind("vocab")
+def _compile_vocab(spec: Dict[str, Any]) -> Check:
+    field = spec["field"]
+    if "labels" in spec:
+        # Raw values are checked as the cleaners will see them: a value is
+        # only bad when its normalizer cannot map it (None or Title Case).
+        norm = NORMALIZERS[spec["labels"]]
+        allowed = norm.labels
+    else:
+        norm = None
+        allowed = frozenset(spec["allowed"])
+
+    def check(rec: Dict[str, Any]) -> bool:
+        v = rec.get(field)
+        if not _present(v):
+            return False
+        return (norm(v) if norm is not None else v) not in allowed
+    return check
+
+
+@rule_kind("date")
+def _compile_date(spec: Dict[str, Any]) -> Check:
+    field = spec["field"]
+    formats = tuple(spec["formats"])
+    cache: Dict[str, bool] = {}
+
+    def parses(s: str) -> bool:
+        for fmt in formats:
+            try:
+                datetime.strptime(s, fmt)
+                return True
+            except ValueError:
+                continue
+        return False
+
+    def check(rec: Dict[str, Any]) -> bool:
+        v = rec.get(field)
+        if not _present(v):
+            return False
+        s = str(v).strip()
+        ok = cache.get(s)
+        if ok is None:
+            if len(cache) >= CACHE_MAX:
+                cache.clear()
+            ok = cache[s] = parses(s)
+        return not ok
+    return check
+
+
+@rule_kind("pattern")
+def _compile_pattern(spec: Dict[str, Any]) -> Check:
+    field = spec["field"]
+    rx = re.compile(spec["regex"])
+
+    def check(rec: Dict[str, Any]) -> bool:
+        v = rec.get(field)
+        return _present(v) and rx.fullmatch(str(v).strip()) is None
+    return check
+
+
+@rule_kind("blacklist")
+def _compile_blacklist(spec: Dict[str, Any]) -> Check:
+    field = spec["field"]
+    junk = frozenset(s.casefold() for s in spec["values"])
+
+    def check(rec: Dict[str, Any]) -> bool:
+        v = rec.get(field)
+        return isinstance(v, str) and v.strip().casefold() in junk
+    return check
+
+
+# ---------------------------------------------------------------------------
+# Rule set
+# ---------------------------------------------------------------------------
+
+
+class RuleSet:
+    """Compiled rules evaluated together, one record at a time."""
+
+    def __init__(self, specs: Iterable[Dict[str, Any]]) -> None:
+        self.specs = list(specs)
+        self.names: List[str] = []
+        self.checks: List[Check] = []
+        for spec in self.specs:
+            kind = spec.get("kind")
+            if kind not in KINDS:
+                raise ValueError(f"Unknown rule kind: {kind!r}")
+            self.names.append(spec.get("name") or f"{kind}:{spec['field']}")
+            self.checks.append(KINDS[kind](spec))
+
+    def __len__(self) -> int:
+        return len(self.checks)
+
+    def evaluate(self,
+                 rec: Dict[str, Any],
+                 seconds: Optional[Dict[str, float]] = None) -> List[str]:
+        """
+        Run every rule on one record.
+
+        Args:
+            rec: Decoded row dict.
+            seconds: If given, per-rule elapsed time is added to it.
+
+        Returns:
+            Names of the violated rules.
+        """
+        hits: List[str] = []
+        clock = time.perf_counter
+        for name, check in zip(self.names, self.checks):
+            t0 = clock()
+            bad = check(rec)
+            if seconds is not None:
+                seconds[name] = seconds.get(name, 0.0) + (clock() - t0)
+            if bad:
+                hits.append(name)
+        return hits
+
+
+def load_rules(path: Path) -> List[Dict[str, Any]]:
+    """Read a JSON list of rule specs (same shape as DEFAULT_RULES)."""
+    specs = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(specs, list):
+        raise ValueError(f"{path}: expected a JSON list of rules")
+    return specs
+
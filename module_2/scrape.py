@@ -12,6 +12,10 @@ What this does:
   3) Stream results to JSONL (resumable) and also write a merged JSON array.
   4) Simple de-dup across runs keyed by (entry_url, program, university).
   5) Show a running total of rows appended to the JSONL stream.
+  6) Status / degree / nationality labels come from the shared rule table
+     in normalize.py (same values the cleaners and loader produce).
+  7) Resume reads the JSONL through its persisted line index (lineindex.py),
+     so the running total is instant and only appended lines get scanned.
 """
 
 from __future__ import annotations
@@ -27,6 +31,9 @@ import urllib3
 from bs4 import BeautifulSoup
 from urllib3.util.retry import Retry
 
+from lineindex import load_index
+from normalize import norm_degree, norm_nat, norm_status
+
 # Optional TLS bundle (helps on some macOS venv setups).
 try:
     import certifi  # not a scraping helper; just a CA bundle
@@ -69,48 +76,6 @@ def _first(rx: re.Pattern, s: str) -> Optional[str]:
     return m.group(1) if m else None
 
 
-def _norm_status(s: Optional[str]) -> Optional[str]:
-    """Normalize status strings to a small set."""
-    if not s:
-        return None
-    s = s.lower()
-    if "accept" in s or "offer" in s:
-        return "Accepted"
-    if "reject" in s or "denied" in s:
-        return "Rejected"
-    if "wait" in s:
-        return "Waitlisted"
-    if "interview" in s:
-        return "Interview"
-    return s.title()
-
-
-def _norm_degree(s: Optional[str]) -> Optional[str]:
-    """Normalize degree labels (PhD / Masters / PsyD)."""
-    if not s:
-        return None
-    s = s.lower()
-    if "ph" in s:
-        return "PhD"
-    if "psy" in s:
-        return "PsyD"
-    if s in {"ms", "m.s.", "m.sc", "msc", "masters", "master"}:
-        return "Masters"
-    return s.title()
-
-
-def _norm_intl(s: Optional[str]) -> Optional[str]:
-    """Map variations to 'International' or 'American' when possible."""
-    if not s:
-        return None
-    s = s.lower()
-    if "inter" in s:
-        return "International"
-    if "amer" in s or "domestic" in s or "us" in s:
-        return "American"
-    return s.title()
-
-
 def _blank(url: str) -> Dict[str, Optional[str]]:
     """Return a dict containing required keys with default None values."""
     return {
@@ -133,11 +98,7 @@ def _count_jsonl_lines(path: str) -> int:
     """Fast count of records already in the JSONL stream (running total)."""
     if not os.path.exists(path):
         return 0
-    n = 0
-    with open(path, "r", encoding="utf-8") as f:
-        for _ in f:
-            n += 1
-    return n
+    return len(load_index(path))
 
 
 # ----------------------------- table parsing -------------------------------
@@ -201,12 +162,12 @@ def _rows_from_table(table, idx_map, page_url: str) -> List[Dict[str, Optional[s
         row["university"] = uni or None
         row["program"] = prog or None
         row["date_added"] = dat or _first(RX_DATE, " ".join([uni, prog, com, sta]))
-        row["status"] = _norm_status(sta) or _norm_status(_first(RX_STATUS, sta))
+        row["status"] = norm_status(sta) or norm_status(_first(RX_STATUS, sta))
         row["comments"] = com or None
-        row["degree"] = _norm_degree(_first(RX_DEGREE, " ".join([prog, com])))
+        row["degree"] = norm_degree(_first(RX_DEGREE, " ".join([prog, com])))
         row["start_term"] = _first(RX_TERM, com)
         row["start_year"] = _first(RX_YEAR, " ".join([dat, com]))
-        row["intl_american"] = _norm_intl(_first(RX_INTL, com))
+        row["intl_american"] = norm_nat(_first(RX_INTL, com))
         row["gpa"] = _first(RX_GPA, com)
         row["gre_total"] = _first(RX_GRE_T, com)
         row["gre_verbal"] = _first(RX_GRE_V, com)
@@ -256,7 +217,7 @@ def _rows_from_cards(soup: BeautifulSoup, page_url: str) -> List[Dict[str, Optio
         row["program"] = _txt(prog_el) or None
         row["comments"] = _txt(comm_el) or None
         row["date_added"] = _txt(date_el) or _first(RX_DATE, blob)
-        row["status"] = _norm_status(_txt(stat_el)) or _norm_status(
+        row["status"] = norm_status(_txt(stat_el)) or norm_status(
             _first(RX_STATUS, blob)
         )
 
@@ -270,9 +231,9 @@ def _rows_from_cards(soup: BeautifulSoup, page_url: str) -> List[Dict[str, Optio
         row["gre_aw"] = _first(RX_GRE_AW, blob)
         row["start_term"] = _first(RX_TERM, blob)
         row["start_year"] = _first(RX_YEAR, blob)
-        row["intl_american"] = _norm_intl(_first(RX_INTL, blob))
+        row["intl_american"] = norm_nat(_first(RX_INTL, blob))
         if not row["degree"]:
-            row["degree"] = _norm_degree(_first(RX_DEGREE, blob) or row["program"])
+            row["degree"] = norm_degree(_first(RX_DEGREE, blob) or row["program"])
 
         for k, v in list(row.items()):
             if isinstance(v, str):
@@ -360,14 +321,10 @@ if __name__ == "__main__":
 
     # Seed de-dup from existing JSONL (safe resume).
     if os.path.exists(args.out):
-        with open(args.out, "r", encoding="utf-8") as f:
-            for line in f:
-                try:
-                    r = json.loads(line)
-                    key = (r.get("entry_url"), r.get("program"), r.get("university"))
-                    seen.add(key)
-                except Exception:
-                    pass
+        with load_index(args.out) as idx:
+            for r in idx.iter_records():
+                if isinstance(r, dict):
+                    seen.add((r.get("entry_url"), r.get("program"), r.get("university")))
 
     # Running total starts with whatever is already in the JSONL stream.
     running_total = _count_jsonl_lines(args.out)
@@ -397,12 +354,8 @@ if __name__ == "__main__":
     # Merge JSONL → JSON array for cleaner/validator.
     merged = []
     if os.path.exists(args.out):
-        with open(args.out, "r", encoding="utf-8") as f:
-            for line in f:
-                try:
-                    merged.append(json.loads(line))
-                except Exception:
-                    pass
+        with load_index(args.out) as idx:
+            merged.extend(idx.iter_records())
 
     save_data(merged, args.final)
     print(f"wrote {len(merged)} rows to {args.final} (added {added} new this run)")
\ No newline at end of file
@@ -0,0 +1,265 @@
+"""
+Module 2 — Columnar binary snapshot of the cleaned dataset.
+
+Purpose:
+    • Next to gradcafe_cleaned.csv, write a directory of NumPy arrays so
+      analytics and benchmarks can memory-map the data instead of
+      reparsing CSV text.
+    • Numeric columns   → <col>.npy (float64, NaN = missing)
+    • Date columns      → <col>.npy (datetime64[D], NaT = missing); ISO or
+                          one of DATE_FORMATS (e.g. the raw "Added on …"
+                          text module_2_new passes through). A column with
+                          any other text is kept as a categorical instead.
+    • Categorical cols  → <col>.codes.npy (int32, -1 = missing)
+                          + <col>.strings.json (code → string table)
+    • manifest.json records the row count and which column is which.
+
+Free-text columns (comments, url) stay CSV-only.
+
+Usage:
+    snap = load_snapshot(Path("data/gradcafe_cleaned.snapshot"))
+    snap["gpa"]                     # float64 memmap
+    snap.categorical("status")      # (codes memmap, ["Accepted", ...])
+    snap.decode("status")           # list[str | None]
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import json
+import shutil
+
+import numpy as np
+
+SNAPSHOT_VERSION = 1
+
+# Default column roles for the cleaned CSV schema. "program_norm" and
+# "university_norm" in the DB come from the llm_generated_* columns here.
+NUMERIC_COLUMNS: Tuple[str, ...] = ("gpa", "gre", "gre_v", "gre_aw")
+DATE_COLUMNS: Tuple[str, ...] = ("date_added",)
+# Non-ISO date text accepted in date columns, tried in order (also the
+# date:date_added rule's formats in rules.py, after ISO).
+DATE_FORMATS: Tuple[str, ...] = (
+    "Added on %B %d, %Y",  # raw GradCafe: Added on March 31, 2024
+    "%B %d, %Y",
+    "%b %d, %Y",
+    "%m/%d/%Y",
+    "%d-%m-%Y",
+)
+CATEGORICAL_COLUMNS: Tuple[str, ...] = (
+    "status",
+    "degree",
+    "term",
+    "us_or_international",
+    "program",
+    "llm_generated_program",
+    "llm_generated_university",
+)
+
+# ---------------------------------------------------------------------------
+# Encoding helpers
+# ---------------------------------------------------------------------------
+
+
+def encode_column(values: Iterable[Optional[str]]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Dictionary-encode a column of strings.
+
+    Returns:
+        (codes, table) where codes[i] indexes table, or -1 for None/empty.
+    """
+    lookup: Dict[str, int] = {}
+    table: List[str] = []
+    codes: List[int] = []
+    for v in values:
+        if v is None or v == "":
+            codes.append(-1)
+            continue
+        code = lookup.get(v)
+        if code is None:
+            code = lookup[v] = len(table)
+            table.append(v)
+        codes.append(code)
+    return np.asarray(codes, dtype=np.int32), table
+
+
+def _values(rows: Any, col: str) -> List[Any]:
+    """Column values from a list of row dicts or a columns.ColumnStore."""
+    if hasattr(rows, "column"):
+        return rows.column(col)
+    return [r.get(col) for r in rows]
+
+
+def _float_column(rows: Any, col: str) -> np.ndarray:
+    """Collect a numeric column (None → NaN)."""
+    return np.asarray(
+        [np.nan if v is None else v for v in _values(rows, col)],
+        dtype=np.float64,
+    )
+
+
+def _categorical_column(rows: Any, col: str) -> Tuple[np.ndarray, List[str]]:
+    """Codes + table, reusing a ColumnStore's existing encoding if present."""
+    if hasattr(rows, "tables") and col in rows.tables:
+        codes, table = rows.codes(col)
+        return np.frombuffer(codes, dtype=np.int32).copy(), list(table)
+    return encode_column(_values(rows, col))
+
+
+def _parse_date(text: str) -> Optional[np.datetime64]:
+    """ISO or DATE_FORMATS text → datetime64[D], else None."""
+    try:
+        return np.datetime64(text, "D")
+    except ValueError:
+        pass
+    for fmt in DATE_FORMATS:
+        try:
+            return np.datetime64(datetime.strptime(text, fmt).date(), "D")
+        except ValueError:
+            continue
+    return None
+
+
+def _date_column(rows: Any, col: str) -> Optional[np.ndarray]:
+    """
+    Collect a date column (None → NaT).
+
+    Returns None when a value is not a date in any accepted format, so the
+    caller can keep the column as text instead of losing it to NaT.
+    """
+    raw = [str(v).strip() if v else "NaT" for v in _values(rows, col)]
+    try:
+        return np.array(raw, dtype="datetime64[D]")
+    except ValueError:
+        # Non-ISO text; convert element-wise.
+        out = np.full(len(raw), np.datetime64("NaT"), dtype="datetime64[D]")
+        for i, v in enumerate(raw):
+            if v == "NaT":
+                continue
+            day = _parse_date(v)
+            if day is None:
+                return None
+            out[i] = day
+        return out
+
+
+# ---------------------------------------------------------------------------
+# Write / load
+# ---------------------------------------------------------------------------
+
+
+def write_snapshot(rows: Any,
+                   out_dir: Path,
+                   numeric: Sequence[str] = NUMERIC_COLUMNS,
+                   dates: Sequence[str] = DATE_COLUMNS,
+                   categorical: Sequence[str] = CATEGORICAL_COLUMNS,
+                   extra_int: Sequence[str] = ()) -> Path:
+    """
+    Write cleaned rows as a columnar snapshot directory.
+
+    The snapshot is written to a temporary sibling directory and swapped in
+    at the end, so readers never see a half-written snapshot.
+
+    Args:
+        rows: Cleaned row dicts (same shape as the CSV rows) or a
+              columns.ColumnStore (its dictionary codes are reused).
+        out_dir: Destination directory (replaced if it exists).
+        numeric / dates / categorical: Column roles (a date column whose
+                                       text does not parse is written as
+                                       categorical).
+        extra_int: Integer columns stored as int64 (e.g. "p_id").
+
+    Returns:
+        The snapshot directory path.
+    """
+    tmp = out_dir.with_name(out_dir.name + ".tmp")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir(parents=True)
+
+    dates, categorical = list(dates), list(categorical)
+    for col in numeric:
+        np.save(tmp / f"{col}.npy", _float_column(rows, col))
+    for col in list(dates):
+        arr = _date_column(rows, col)
+        if arr is None:
+            dates.remove(col)
+            categorical.append(col)
+            continue
+        np.save(tmp / f"{col}.npy", arr)
+    for col in extra_int:
+        np.save(tmp / f"{col}.npy",
+                np.asarray([v or 0 for v in _values(rows, col)], dtype=np.int64))
+    for col in categorical:
+        codes, table = _categorical_column(rows, col)
+        np.save(tmp / f"{col}.codes.npy", codes)
+        (tmp / f"{col}.strings.json").write_text(
+            json.dumps(table, ensure_ascii=False), encoding="utf-8"
+        )
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "rows": len(rows),
+        "numeric": list(numeric) + list(extra_int),
+        "dates": dates,
+        "categorical": categorical,
+    }
+    (tmp / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    tmp.rename(out_dir)
+    return out_dir
+
+
+class Snapshot:
+    """Read-only view over a snapshot directory (arrays are memory-mapped)."""
+
+    def __init__(self, path: Path, mmap: bool = True) -> None:
+        self.path = path
+        self.manifest = json.loads((path / "manifest.json").read_text(encoding="utf-8"))
+        if self.manifest.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version in {path}")
+        self._mode = "r" if mmap else None
+        self._tables: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return int(self.manifest["rows"])
+
+    def __getitem__(self, col: str) -> np.ndarray:
+        """Numeric/date column array, or categorical codes."""
+        if col in self.manifest["categorical"]:
+            return self.categorical(col)[0]
+        if col not in self.manifest["numeric"] and col not in self.manifest["dates"]:
+            raise KeyError(col)
+        return np.load(self.path / f"{col}.npy", mmap_mode=self._mode)
+
+    def categorical(self, col: str) -> Tuple[np.ndarray, List[str]]:
+        """Return (codes, string table) for a categorical column."""
+        if col not in self.manifest["categorical"]:
+            raise KeyError(col)
+        table = self._tables.get(col)
+        if table is None:
+            table = json.loads(
+                (self.path / f"{col}.strings.json").read_text(encoding="utf-8")
+            )
+            self._tables[col] = table
+        codes = np.load(self.path / f"{col}.codes.npy", mmap_mode=self._mode)
+        return codes, table
+
+    def decode(self, col: str) -> List[Optional[str]]:
+        """Materialize a categorical column back to strings (None = missing)."""
+        codes, table = self.categorical(col)
+        return [table[c] if c >= 0 else None for c in codes.tolist()]
+
+
+def load_snapshot(path: Path, mmap: bool = True) -> Snapshot:
+    """Open a snapshot directory written by write_snapshot()."""
+    return Snapshot(Path(path), mmap=mmap)
+
+
+def snapshot_path(out_csv: Path) -> Path:
+    """Default snapshot directory for a CSV: <stem>.snapshot next to it."""
+    return out_csv.with_name(out_csv.stem + ".snapshot")
@@ -3,18 +3,52 @@ Module 2 — Data Validator
 
 This script validates scraped and cleaned GradCafe data.
 
-Checks performed:
+Every row is checked, with bounded memory:
+  • JSON arrays are decoded incrementally (one object at a time), JSONL is
+    read line by line — the file is never loaded whole.
   • Row count (expect ≥30,000 for the final dataset, but smaller is fine during dev).
-  • Presence of all required keys (sampled on first 1000 rows).
-  • Detection of any lingering HTML fragments in text fields
-    (scanned on first 2000 rows).
+  • Presence of all required keys (or an alias the cleaners accept, e.g.
+    url for entry_url), per key, on every row.
+  • Detection of any lingering HTML fragments in text fields, on every row.
+  • Declarative rules from rules.py (gpa/GRE ranges, status/degree vocabulary,
+    date parseability, entry URL pattern, junk strings), each timed.
+
+The report gives exact counts plus the first few sample locations (row
+index and file offset) for each violation.
+
+JSONL files are also validated through a chunk cache: the file is cut into
+fixed-size, newline-aligned chunks, each chunk is hashed (BLAKE2b) and its
+statistics are stored in <file>.valcache.json. Later runs only validate
+chunks whose hash changed (for an append-only file: just the new tail) and
+reuse the stored statistics for the rest. --no-cache turns this off.
+
+With --workers N, a JSONL file is split at line boundaries into N byte
+ranges that are validated in a process pool; each worker returns a
+mergeable ValidationStats and the parent combines them into one report.
+
+--fail-on NAME=LIMIT (LIMIT a count or a percentage of rows; NAME may use
+shell wildcards) makes the process exit non-zero when a violation exceeds
+its limit, so the validator can gate the load stage of a pipeline:
+
+    python module_2/validate.py data.json --fail-on invalid_json=0 --fail-on 'range:*=5%'
 """
 
 from __future__ import annotations
 
+import argparse
+import fnmatch
+import hashlib
 import json
 import os
-from typing import Any
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Declarative per-row rules (module_2/rules.py).
+from rules import DEFAULT_RULES, RuleSet, load_rules
+# Persisted line-offset index used for equal-row shard splits.
+from lineindex import load_index
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -40,64 +74,608 @@ REQUIRED = {
     "gpa",
 }
 
+# Bit i of a row's key-presence mask is set when REQUIRED_ORDER[i] is present.
+REQUIRED_ORDER = tuple(sorted(REQUIRED))
+
+# Alternate raw key names the cleaners also accept (module_2_new/clean.py);
+# a required key counts as present when it or one of its aliases is.
+KEY_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "entry_url": ("url",),
+    "start_term": ("term",),
+    "intl_american": ("us_or_international",),
+    "gre_total": ("gre",),
+    "gre_verbal": ("gre_v",),
+}
+_REQUIRED_NAMES = tuple((key,) + KEY_ALIASES.get(key, ()) for key in REQUIRED_ORDER)
+
+# Text fields scanned for "<...>" fragments.
+HTML_FIELDS = ("program", "university", "comments")
+
+# Sample locations kept per violation type.
+MAX_SAMPLES = 5
+
+# Read size for the incremental JSON array decoder (and chunk hashing).
+READ_CHUNK = 1 << 16
+
+# A JSON array element still undecodable after this many reads is corrupt.
+MAX_ROW_CHUNKS = 16
+
+# Separator before the next object in the array (rows are flat objects, so
+# "," followed by "{" only occurs between elements); used to resume after a
+# corrupt element.
+_NEXT_ELEMENT = re.compile(r",\s*(?=\{)")
+# Chars kept / margin at the buffer edge when matching across reads.
+_BOUNDARY_TAIL = 64
+
+# Target bytes per cached validation chunk (cut at the next newline).
+CACHE_CHUNK = 4 << 20
+
+# Bump when the checks change in a way that invalidates stored chunk stats.
+CACHE_VERSION = 2
+
+# ---------------------------------------------------------------------------
+# Incremental readers
+# ---------------------------------------------------------------------------
+
+
+def iter_jsonl(path: str,
+               start: int = 0,
+               end: Optional[int] = None) -> Iterator[Tuple[int, int, Any]]:
+    """
+    Yield (row_index, byte_offset, obj) for each non-blank JSONL line.
+
+    With start/end, only lines beginning in [start, end) are read (start must
+    be a line boundary); row_index then counts from 0 within that range.
+    Lines that fail to decode are yielded with obj = ValueError(...).
+    """
+    row = 0
+    offset = start
+    with open(path, "rb") as f:
+        f.seek(start)
+        for line in f:
+            if end is not None and offset >= end:
+                break
+            line_start = offset
+            offset += len(line)
+            if not line.strip():
+                continue
+            try:
+                obj = json.loads(line)
+            except ValueError as exc:
+                obj = ValueError(f"bad JSON line: {exc}")
+            yield row, line_start, obj
+            row += 1
+
+
+def iter_json_array(path: str) -> Iterator[Tuple[int, int, Any]]:
+    """
+    Yield (row_index, char_offset, obj) from a top-level JSON array.
+
+    Objects are decoded one at a time with JSONDecoder.raw_decode over a
+    sliding text buffer, so memory stays proportional to the largest row.
+    An element that cannot be decoded is yielded with obj = ValueError(...)
+    and reading resumes at the next ", {" boundary; an element still
+    undecodable after MAX_ROW_CHUNKS * READ_CHUNK chars counts as corrupt.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    base = 0          # file char offset of buf[0]
+    pos = 0
+    row = 0
+    started = False
+    skipping = False  # inside a corrupt element, looking for the next one
+    eof = False
+    with open(path, "r", encoding="utf-8") as f:
+        while True:
+            if skipping:
+                m = _NEXT_ELEMENT.search(buf, pos)
+                if m:
+                    pos = m.end()
+                    skipping = False
+                elif eof:
+                    # The corrupt element was the last one.
+                    if buf[pos:].rstrip().endswith("]"):
+                        return
+                    raise ValueError(f"{path}: truncated JSON array")
+                else:
+                    # Keep a tail so a boundary split across reads still matches.
+                    keep = max(pos, len(buf) - _BOUNDARY_TAIL)
+                    chunk = f.read(READ_CHUNK)
+                    if not chunk:
+                        eof = True
+                    buf, base, pos = buf[keep:] + chunk, base + keep, 0
+                    continue
+
+            # Skip whitespace / separators; refill when we run out of text.
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n,":
+                    pos += 1
+                if pos < len(buf) or eof:
+                    break
+                chunk = f.read(READ_CHUNK)
+                if not chunk:
+                    eof = True
+                buf, base, pos = buf[pos:] + chunk, base + pos, 0
+
+            if pos >= len(buf):
+                if not started:
+                    raise ValueError(f"{path}: empty file, expected a JSON array")
+                raise ValueError(f"{path}: truncated JSON array")
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError(f"{path}: expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+                # A scalar that ends exactly at the buffer edge may be cut off.
+                complete = end < len(buf) or eof
+            except json.JSONDecodeError as exc:
+                if eof or _is_corrupt(exc, len(buf) - pos):
+                    yield row, base + pos, ValueError(f"bad JSON element: {exc}")
+                    row += 1
+                    skipping = True
+                    continue
+                complete = False
+            if not complete:
+                chunk = f.read(READ_CHUNK)
+                if not chunk:
+                    eof = True
+                buf, base, pos = buf[pos:] + chunk, base + pos, 0
+                continue
+            yield row, base + pos, obj
+            row += 1
+            pos = end
+
+
+def _is_corrupt(exc: json.JSONDecodeError, buffered: int) -> bool:
+    """
+    True when a failed decode cannot be fixed by reading more text.
+
+    The error points at a char well inside the buffer (more data would not
+    change it), unless the string it names merely runs off the end; or the
+    element already spans MAX_ROW_CHUNKS reads without decoding.
+    """
+    if buffered > MAX_ROW_CHUNKS * READ_CHUNK:
+        return True
+    inside = exc.pos < len(exc.doc) - _BOUNDARY_TAIL
+    return inside and not exc.msg.startswith("Unterminated string")
+
+
+def iter_records(path: str) -> Iterator[Tuple[int, int, Any]]:
+    """Pick the JSONL or JSON-array reader by extension (.jsonl → lines)."""
+    if path.lower().endswith(".jsonl"):
+        return iter_jsonl(path)
+    return iter_json_array(path)
+
+
+def split_jsonl(path: str, parts: int) -> List[Tuple[int, int]]:
+    """
+    Split a JSONL file into about `parts` byte ranges on line boundaries.
+
+    Cuts come from the persisted line index (lineindex.py), so every range
+    holds about the same number of rows and every line belongs to exactly
+    one range.
+    """
+    with load_index(path) as idx:
+        return idx.split(parts)
+
+
+# ---------------------------------------------------------------------------
+# Statistics
+# ---------------------------------------------------------------------------
+
+
+class ValidationStats:
+    """Exact violation counts with a few sample locations per violation."""
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.counts: Dict[str, int] = {}
+        self.samples: Dict[str, List[Dict[str, int]]] = {}
+        # Key-presence bitmap (see REQUIRED_ORDER) → number of rows.
+        self.presence: Dict[int, int] = {}
+        # Rule name → total seconds spent evaluating it.
+        self.rule_seconds: Dict[str, float] = {}
+
+    def flag(self, violation: str, row: int, offset: int) -> None:
+        """Count one violation and keep its location if samples remain."""
+        self.counts[violation] = self.counts.get(violation, 0) + 1
+        kept = self.samples.setdefault(violation, [])
+        if len(kept) < MAX_SAMPLES:
+            kept.append({"row": row, "offset": offset})
+
+    def observe(self,
+                row: int,
+                offset: int,
+                rec: Any,
+                rules: Optional[RuleSet] = None) -> None:
+        """Validate one decoded record (plus the compiled rules, if given)."""
+        self.rows += 1
+        if isinstance(rec, ValueError):
+            self.flag("invalid_json", row, offset)
+            return
+        if not isinstance(rec, dict):
+            self.flag("not_an_object", row, offset)
+            return
+        mask = 0
+        for i, names in enumerate(_REQUIRED_NAMES):
+            if any(name in rec for name in names):
+                mask |= 1 << i
+            else:
+                self.flag(f"missing:{names[0]}", row, offset)
+        self.presence[mask] = self.presence.get(mask, 0) + 1
+        for key in HTML_FIELDS:
+            v = rec.get(key)
+            if isinstance(v, str) and "<" in v and ">" in v:
+                self.flag(f"html:{key}", row, offset)
+        if rules is not None:
+            for name in rules.evaluate(rec, self.rule_seconds):
+                self.flag(name, row, offset)
+
+    def merge(self, other: "ValidationStats", row_base: int = 0) -> "ValidationStats":
+        """
+        Fold another shard's stats into this one.
+
+        row_base is added to the other shard's sample row indices (the number
+        of rows in all earlier shards). Shards must be merged in file order
+        so the kept samples stay the earliest ones.
+        """
+        self.rows += other.rows
+        for k, n in other.counts.items():
+            self.counts[k] = self.counts.get(k, 0) + n
+        for k, kept in other.samples.items():
+            mine = self.samples.setdefault(k, [])
+            for smp in kept[:MAX_SAMPLES - len(mine)]:
+                mine.append({"row": smp["row"] + row_base, "offset": smp["offset"]})
+        for mask, n in other.presence.items():
+            self.presence[mask] = self.presence.get(mask, 0) + n
+        for k, t in other.rule_seconds.items():
+            self.rule_seconds[k] = self.rule_seconds.get(k, 0.0) + t
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable counts (timings are per-run and not stored)."""
+        return {
+            "rows": self.rows,
+            "counts": self.counts,
+            "samples": self.samples,
+            "presence": {str(m): n for m, n in self.presence.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "ValidationStats":
+        """Inverse of to_dict()."""
+        stats = cls()
+        stats.rows = d["rows"]
+        stats.counts = dict(d["counts"])
+        stats.samples = {k: list(v) for k, v in d["samples"].items()}
+        stats.presence = {int(m): n for m, n in d["presence"].items()}
+        return stats
+
+    def key_presence(self) -> Dict[str, int]:
+        """Rows containing each required key, derived from the bitmaps."""
+        out = {k: 0 for k in REQUIRED_ORDER}
+        for mask, n in self.presence.items():
+            for i, key in enumerate(REQUIRED_ORDER):
+                if mask >> i & 1:
+                    out[key] += n
+        return out
+
+    def report(self) -> Dict[str, Any]:
+        """JSON-ready report."""
+        return {
+            "rows": self.rows,
+            "key_presence": self.key_presence(),
+            "violations": {
+                k: {"count": self.counts[k], "samples": self.samples.get(k, [])}
+                for k in sorted(self.counts)
+            },
+            "rule_seconds": {k: round(t, 6) for k, t in self.rule_seconds.items()},
+        }
+
+
 # ---------------------------------------------------------------------------
 # Core validation function
 # ---------------------------------------------------------------------------
 
-def check(path: str) -> None:
+def _validate_shard(path: str,
+                    start: int,
+                    end: int,
+                    specs: Optional[Sequence[Dict[str, Any]]] = None) -> ValidationStats:
+    """Worker: validate the JSONL lines in [start, end) (rules compiled here)."""
+    rules = RuleSet(specs) if specs else None
+    stats = ValidationStats()
+    for row, offset, rec in iter_jsonl(path, start, end):
+        stats.observe(row, offset, rec, rules)
+    return stats
+
+
+def _run_shards(path: str,
+                shards: Sequence[Tuple[int, int]],
+                workers: int,
+                specs: Optional[Sequence[Dict[str, Any]]] = None) -> List[ValidationStats]:
+    """Validate JSONL byte ranges, in a process pool when workers > 1."""
+    if workers <= 1 or len(shards) <= 1:
+        return [_validate_shard(path, a, b, specs) for a, b in shards]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_validate_shard, path, a, b, specs) for a, b in shards]
+        return [fut.result() for fut in futures]
+
+
+def _merge_in_order(parts: Sequence[ValidationStats]) -> ValidationStats:
+    """Merge shard stats in file order, rebasing sample row indices."""
+    merged = ValidationStats()
+    for part in parts:
+        merged.merge(part, row_base=merged.rows)
+    return merged
+
+
+def validate_parallel(path: str,
+                      workers: int,
+                      specs: Optional[Sequence[Dict[str, Any]]] = None) -> ValidationStats:
+    """Validate a JSONL file in `workers` processes and merge the shards."""
+    return _merge_in_order(_run_shards(path, split_jsonl(path, workers), workers, specs))
+
+
+# ---------------------------------------------------------------------------
+# Chunk cache
+# ---------------------------------------------------------------------------
+
+
+def cache_path(path: str) -> str:
+    """Sidecar file holding per-chunk statistics for a JSONL file."""
+    return path + ".valcache.json"
+
+
+def chunk_ranges(path: str, chunk_bytes: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Cut a JSONL file into ~chunk_bytes ranges, each ending after a newline.
+
+    Each boundary depends only on the bytes before it, so appending to the
+    file leaves every earlier chunk (except the old tail) unchanged.
+    """
+    chunk_bytes = chunk_bytes or CACHE_CHUNK
+    size = os.path.getsize(path)
+    ranges = []
+    start = 0
+    with open(path, "rb") as f:
+        while start < size:
+            f.seek(min(start + chunk_bytes, size) - 1)
+            if f.read(1) != b"\n":
+                f.readline()
+            end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _hash_range(f, start: int, end: int) -> str:
+    """BLAKE2b digest of bytes [start, end) of an open binary file."""
+    h = hashlib.blake2b(digest_size=16)
+    f.seek(start)
+    left = end - start
+    while left > 0:
+        block = f.read(min(READ_CHUNK, left))
+        if not block:
+            break
+        h.update(block)
+        left -= len(block)
+    return h.hexdigest()
+
+
+def _cache_key(specs: Optional[Sequence[Dict[str, Any]]]) -> str:
+    """Fingerprint of everything that decides a chunk's statistics."""
+    blob = json.dumps(
+        [CACHE_VERSION, REQUIRED_ORDER, KEY_ALIASES, HTML_FIELDS, MAX_SAMPLES, specs or []],
+        sort_keys=True,
+    )
+    return hashlib.blake2b(blob.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def validate_cached(path: str,
+                    workers: int = 1,
+                    specs: Optional[Sequence[Dict[str, Any]]] = None) -> Tuple[ValidationStats, int, int]:
+    """
+    Validate a JSONL file, reusing stored stats for unchanged chunks.
+
+    Returns:
+        (stats, chunks, reused) — merged stats plus how many of the file's
+        chunks were taken from the cache.
     """
-    Validate a JSON file of applicant rows.
+    key = _cache_key(specs)
+    stored: Dict[Tuple[int, str], Dict[str, Any]] = {}
+    try:
+        with open(cache_path(path), "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("key") == key and cached.get("chunk_bytes") == CACHE_CHUNK:
+            stored = {(c["start"], c["hash"]): c["stats"] for c in cached["chunks"]}
+    except (OSError, ValueError, KeyError):
+        pass
+
+    ranges = chunk_ranges(path)
+    with open(path, "rb") as f:
+        hashes = [_hash_range(f, a, b) for a, b in ranges]
+    todo = [i for i, (a, _) in enumerate(ranges) if (a, hashes[i]) not in stored]
+    fresh = dict(zip(todo, _run_shards(path, [ranges[i] for i in todo], workers, specs)))
+
+    parts = []
+    for i, (a, _) in enumerate(ranges):
+        parts.append(fresh[i] if i in fresh
+                     else ValidationStats.from_dict(stored[(a, hashes[i])]))
+
+    out = {
+        "key": key,
+        "chunk_bytes": CACHE_CHUNK,
+        "chunks": [
+            {"start": a, "end": b, "hash": h, "stats": part.to_dict()}
+            for (a, b), h, part in zip(ranges, hashes, parts)
+        ],
+    }
+    tmp = cache_path(path) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(out, f)
+    os.replace(tmp, cache_path(path))
+
+    return _merge_in_order(parts), len(ranges), len(ranges) - len(todo)
+
+
+def check(path: str,
+          workers: int = 1,
+          specs: Optional[Sequence[Dict[str, Any]]] = DEFAULT_RULES,
+          cache: bool = False) -> Dict[str, Any] | None:
+    """
+    Validate a JSON array or JSONL file of applicant rows.
 
     Args:
-        path: Path to JSON file to validate (expects a list of dicts).
+        path: Path to a .json (list of dicts) or .jsonl file.
+        workers: Processes for JSONL files (JSON arrays are always read
+                 sequentially, since they cannot be split on lines).
+        specs: Rule specs for rules.RuleSet (None or empty → no rules).
+        cache: For JSONL, reuse per-chunk stats from <path>.valcache.json.
 
     Prints:
         - Row count.
-        - Missing keys across a 1000-row sample.
-        - Count of rows with potential HTML fragments
-          across a 2000-row sample.
+        - Exact count (and sample locations) of rows missing each key.
+        - Exact count of rows with potential HTML fragments, per field.
+        - Exact count of rows violating each rule, and time per rule.
+
+    Returns:
+        The report dict, or None if the file does not exist or is not a
+        readable JSON array.
     """
-    # Ensure the file exists before attempting to load.
+    # Ensure the file exists before attempting to read.
     if not os.path.exists(path):
         print(f"[!] {path} not found")
+        return None
+
+    cache_info = None
+    is_jsonl = path.lower().endswith(".jsonl")
+    if cache and is_jsonl:
+        stats, chunks, reused = validate_cached(path, workers, specs)
+        cache_info = {"chunks": chunks, "reused": reused}
+    elif workers > 1 and is_jsonl:
+        stats = validate_parallel(path, workers, specs)
+    else:
+        rules = RuleSet(specs) if specs else None
+        stats = ValidationStats()
+        try:
+            for row, offset, rec in iter_records(path):
+                stats.observe(row, offset, rec, rules)
+        except ValueError as exc:  # not a JSON array, or cut off
+            print(f"[!] {exc}")
+            return None
+    report = stats.report()
+    if cache_info is not None:
+        report["cache"] = cache_info
+    print_report(path, report)
+    return report
+
+
+def print_report(path: str, report: Dict[str, Any]) -> None:
+    """Human-readable summary of a report."""
+    print(f"[{path}] rows: {report['rows']}")
+    if "cache" in report:
+        c = report["cache"]
+        print(f"  cache: reused {c['reused']}/{c['chunks']} chunks")
+    timing = report.get("rule_seconds")
+    if timing:
+        print("  rule time: " + ", ".join(f"{k} {t:.3f}s" for k, t in timing.items()))
+    violations = report["violations"]
+    if not violations:
+        print("  no violations")
         return
+    unit = "byte" if path.lower().endswith(".jsonl") else "char"
+    for name, v in violations.items():
+        where = ", ".join(f"row {s['row']} @{unit} {s['offset']}" for s in v["samples"])
+        print(f"  {name}: {v['count']}  (e.g. {where})")
 
-    # Load the data from JSON into memory.
-    with open(path, "r", encoding="utf-8") as f:
-        data: list[dict[str, Any]] = json.load(f)
-
-    # Report the number of rows.
-    print(f"[{path}] rows: {len(data)}")
-
-    # -----------------------------------------------------------------------
-    # Check for missing keys in a sample of rows.
-    # -----------------------------------------------------------------------
-    missing: set[str] = set()
-    for r in data[:1000]:
-        missing |= (REQUIRED - set(r))
-    if missing:
-        print("Missing keys in sample:", sorted(missing))
-
-    # -----------------------------------------------------------------------
-    # Scan for potential HTML fragments in text fields.
-    # -----------------------------------------------------------------------
-    htmly = 0
-    for r in data[:2000]:
-        for k in ("program", "university", "comments"):
-            v = r.get(k)
-            if isinstance(v, str) and "<" in v and ">" in v:
-                htmly += 1
-                break
-    print("Potential HTML fragments (first 2000 rows):", htmly)
+
+# ---------------------------------------------------------------------------
+# Thresholds
+# ---------------------------------------------------------------------------
+
+
+def parse_threshold(text: str) -> Tuple[str, float, bool]:
+    """
+    Parse "NAME=LIMIT" into (name_pattern, limit, is_percent).
+
+    "invalid_json=0" fails on any invalid line; "range:*=5%" fails when any
+    range rule flags more than 5% of rows.
+    """
+    name, sep, limit = text.partition("=")
+    if not sep or not name:
+        raise ValueError(f"bad --fail-on {text!r}, expected NAME=LIMIT")
+    pct = limit.endswith("%")
+    return name, float(limit.rstrip("%")), pct
+
+
+def threshold_failures(report: Dict[str, Any],
+                       thresholds: Sequence[Tuple[str, float, bool]]) -> List[str]:
+    """Messages for every violation count above its threshold."""
+    rows = report["rows"] or 1
+    failures = []
+    for pattern, limit, pct in thresholds:
+        for name, v in report["violations"].items():
+            if not fnmatch.fnmatchcase(name, pattern):
+                continue
+            value = 100.0 * v["count"] / rows if pct else v["count"]
+            if value > limit:
+                unit = "%" if pct else ""
+                failures.append(f"{name}: {value:g}{unit} > {limit:g}{unit}")
+    return failures
 
 
 # ---------------------------------------------------------------------------
 # CLI entry point
 # ---------------------------------------------------------------------------
 
-if __name__ == "__main__":
-    # Validate raw scraped data.
-    check("applicant_data.json")
+def main() -> None:
+    """Validate the given files (defaults: raw + canonicalized JSON)."""
+    ap = argparse.ArgumentParser(description="Validate scraped GradCafe data.")
+    ap.add_argument(
+        "paths",
+        nargs="*",
+        default=["applicant_data.json", "llm_extend_applicant_data.json"],
+        help="JSON array or JSONL files to validate.",
+    )
+    ap.add_argument("--json", action="store_true",
+                    help="Print the full report as JSON.")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="Validate JSONL shards in this many processes.")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="Revalidate every JSONL chunk (ignore <file>.valcache.json).")
+    ap.add_argument("--rules", default=None,
+                    help="JSON file of rule specs (default: rules.DEFAULT_RULES).")
+    ap.add_argument("--no-rules", action="store_true",
+                    help="Only run the built-in key/HTML checks.")
+    ap.add_argument("--fail-on", action="append", default=[], metavar="NAME=LIMIT",
+                    help="Exit 1 if a violation exceeds LIMIT (count or N%%).")
+    args = ap.parse_args()
+
+    specs = None if args.no_rules else (load_rules(args.rules) if args.rules else DEFAULT_RULES)
+    thresholds = [parse_threshold(t) for t in args.fail_on]
+    failures = []
+    for path in args.paths:
+        report = check(path, workers=max(1, args.workers), specs=specs,
+                       cache=not args.no_cache)
+        if report is None:
+            if thresholds:
+                failures.append(f"{path}: not found or unreadable")
+            continue
+        if args.json:
+            print(json.dumps(report, indent=2))
+        failures += [f"{path}: {msg}" for msg in threshold_failures(report, thresholds)]
 
-    # Validate canonicalized version (if present).
-    check("llm_extend_applicant_data.json")
\ No newline at end of file
+    for msg in failures:
+        print(f"[FAIL] {msg}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
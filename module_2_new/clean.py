@@ -9,6 +9,10 @@ This script accepts either:
 It emits:
 - data/gradcafe_cleaned.csv : canonical CSV for Module 3
 - data/clean_for_llm.jsonl  : minimal JSONL the LLM normalizer will read
+- data/gradcafe_cleaned.snapshot/ : columnar .npy snapshot of the CSV
+  (see module_2/snapshot.py; skip with --no-snapshot)
+- data/gradcafe_cleaned.profile.json : per-field data-quality profile
+  (see module_2/profiler.py; skip with --no-profile)
 
 Field policy (matches the professor’s table for Module 3):
     p_id (added later in SQL), program, comments, date_added, url,
@@ -19,7 +23,12 @@ Field policy (matches the professor’s table for Module 3):
 Design choices:
 - Be tolerant of slightly different raw keys (e.g., url vs entry_url).
 - Strip HTML-ish whitespace; empty strings become None.
+- Status / degree / nationality / term go through module_2/normalize.py so
+  this cleaner agrees with the scraper, the Module 2 cleaner and the loader.
 - No LLM here—this just prepares clean CSV and the LLM input file.
+- Single pass over the source: LLM-prep lines are written as rows stream
+  in, and CSV rows are held in a dictionary-encoded ColumnStore
+  (module_2/columns.py) until the CSV is written.
 """
 
 from __future__ import annotations
@@ -27,9 +36,20 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+import sys
+import time
 from pathlib import Path
 from typing import Dict, Iterable, Iterator, List, Optional
 
+# Shared normalization rule table lives with the Module 2 scraper/cleaner.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "module_2"))
+from normalize import norm_degree, norm_nat, norm_status, norm_term  # noqa: E402
+from numeric import CHUNK_ROWS, convert_rows  # noqa: E402
+from snapshot import snapshot_path, write_snapshot  # noqa: E402
+from columns import ColumnStore  # noqa: E402
+from lineindex import load_index  # noqa: E402
+from profiler import Profiler, profile_path  # noqa: E402
+
 
 # --------- utilities --------- #
 
@@ -42,24 +62,22 @@ def _clean(s: Optional[str]) -> Optional[str]:
 
 
 def _num(s: Optional[str]) -> Optional[float]:
-    """Parse a number if possible, else None."""
+    """Parse a number if possible, else None (NaN and "nan" included)."""
     if s is None:
         return None
     try:
-        return float(str(s).strip())
+        v = float(str(s).strip())
     except Exception:
         return None
+    return None if v != v else v
 
 
 def _read_json_or_jsonl(path: Path) -> Iterator[Dict]:
     """Yield dict rows from JSON array (.json) or JSONL (.jsonl)."""
     if path.suffix.lower() == ".jsonl":
-        with path.open("r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                obj = json.loads(line)
+        with load_index(path) as idx:
+            for _, _, raw in idx.iter_lines():
+                obj = json.loads(raw)
                 if isinstance(obj, dict):
                     yield obj
     else:
@@ -91,8 +109,50 @@ CSV_HEADERS = [
 ]
 
 
-def to_csv_row(raw: Dict) -> Dict[str, Optional[str]]:
-    """Map a raw dict into the canonical CSV schema."""
+NUMERIC_COLUMNS = {"gpa": ("gpa",), "gre": ("gre",), "gre_v": ("gre_v",), "gre_aw": ("gre_aw",)}
+
+# Repeated, low-cardinality columns stored as codes into shared string tables
+# (url is unique per row and date_added grows with every scrape day: both
+# stay plain lists).
+CATEGORICAL_COLUMNS = (
+    "program", "status", "term", "us_or_international", "degree",
+)
+
+
+def _apply(_name: str, fn, raw, valid=None):
+    """Profiler.apply stand-in when profiling is off: just fn(raw)."""
+    return fn(raw)
+
+
+# _clean, then the shared normalizer (named so the profiler times both).
+def _status(s: Optional[str]) -> Optional[str]:
+    return norm_status(_clean(s))
+
+
+def _term(s: Optional[str]) -> Optional[str]:
+    return norm_term(_clean(s))
+
+
+def _nat(s: Optional[str]) -> Optional[str]:
+    return norm_nat(_clean(s))
+
+
+def _degree(s: Optional[str]) -> Optional[str]:
+    return norm_degree(_clean(s))
+
+
+def to_csv_row(raw: Dict,
+               parse_numbers: bool = True,
+               prof: Optional[Profiler] = None) -> Dict[str, Optional[str]]:
+    """Map a raw dict into the canonical CSV schema.
+
+    With parse_numbers=False the numeric columns keep their raw values so
+    to_column_store can convert them column-wise (``_num`` is the reference).
+    With prof, each text field's raw value and normalization time are
+    recorded.
+    """
+    num = _num if parse_numbers else (lambda v: v)
+    ap = prof.apply if prof is not None else _apply
     # tolerate both url/entry_url; term/start_term; etc.
     url = raw.get("entry_url") or raw.get("url")
     term = raw.get("start_term") or raw.get("term")
@@ -100,24 +160,68 @@ def to_csv_row(raw: Dict) -> Dict[str, Optional[str]]:
     us_intl = raw.get("us_or_international") or raw.get("intl_american")
 
     row = {
-        "program": _clean(raw.get("program")),
-        "comments": _clean(raw.get("comments")),
-        "date_added": _clean(raw.get("date_added")),
-        "url": _clean(url),
-        "status": _clean(raw.get("status")),
-        "term": _clean(term),
-        "us_or_international": _clean(us_intl),
-        "gpa": _num(raw.get("gpa")),
-        "gre": _num(raw.get("gre_total") or raw.get("gre")),
-        "gre_v": _num(raw.get("gre_verbal") or raw.get("gre_v")),
-        "gre_aw": _num(raw.get("gre_aw")),
-        "degree": _clean(raw.get("degree")),
+        "program": ap("program", _clean, raw.get("program")),
+        "comments": ap("comments", _clean, raw.get("comments")),
+        "date_added": ap("date_added", _clean, raw.get("date_added")),
+        "url": ap("url", _clean, url),
+        "status": ap("status", _status, raw.get("status"), valid=norm_status.labels),
+        "term": ap("term", _term, term),
+        "us_or_international": ap("us_or_international", _nat, us_intl),
+        "gpa": num(raw.get("gpa")),
+        "gre": num(raw.get("gre_total") or raw.get("gre")),
+        "gre_v": num(raw.get("gre_verbal") or raw.get("gre_v")),
+        "gre_aw": num(raw.get("gre_aw")),
+        "degree": ap("degree", _degree, raw.get("degree"), valid=norm_degree.labels),
         "llm_generated_program": None,
         "llm_generated_university": None,
     }
     return row
 
 
+def _convert_chunk(chunk: List[Dict],
+                   stats: Optional[Dict[str, int]],
+                   prof: Optional[Profiler]) -> None:
+    """Batch-convert the numeric columns of a chunk (timed per column)."""
+    if prof is None:
+        convert_rows(chunk, NUMERIC_COLUMNS, stats, strip_symbols=False)
+        return
+    for col, keys in NUMERIC_COLUMNS.items():
+        raws = [r.get(col) for r in chunk]
+        t0 = time.perf_counter()
+        convert_rows(chunk, {col: keys}, stats, strip_symbols=False)
+        prof.observe_column(col, raws, [r.get(col) for r in chunk],
+                            time.perf_counter() - t0)
+
+
+def to_column_store(raws: Iterable[Dict],
+                    stats: Optional[Dict[str, int]] = None,
+                    llm_sink=None,
+                    prof: Optional[Profiler] = None) -> ColumnStore:
+    """Stream raw dicts into a ColumnStore, converting numbers per NumPy chunk.
+
+    If llm_sink (a text file) is given, the LLM-prep line for each raw row is
+    written as it streams by, so the raw rows are never held in memory.
+    If prof is given, every field is profiled in the same pass.
+    """
+    store = ColumnStore(CSV_HEADERS, categorical=CATEGORICAL_COLUMNS,
+                        numeric=NUMERIC_COLUMNS)
+    chunk: List[Dict] = []
+    for r in raws:
+        if llm_sink is not None:
+            llm_sink.write(json.dumps(to_llm_minimal(r), ensure_ascii=False) + "\n")
+        chunk.append(to_csv_row(r, parse_numbers=False, prof=prof))
+        if len(chunk) >= CHUNK_ROWS:
+            _convert_chunk(chunk, stats, prof)
+            store.extend(chunk)
+            chunk.clear()
+    if chunk:
+        _convert_chunk(chunk, stats, prof)
+        store.extend(chunk)
+    if prof is not None:
+        prof.rows = len(store)
+    return store
+
+
 def to_llm_minimal(raw: Dict) -> Dict[str, Optional[str]]:
     """Minimal record the local LLM needs to standardize program/university."""
     return {
@@ -138,13 +242,6 @@ def write_csv(out_csv: Path, rows: Iterable[Dict]) -> None:
         w.writerows(rows)
 
 
-def write_jsonl(out_jsonl: Path, rows: Iterable[Dict]) -> None:
-    out_jsonl.parent.mkdir(parents=True, exist_ok=True)
-    with out_jsonl.open("w", encoding="utf-8") as f:
-        for r in rows:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
-
-
 def main() -> None:
     ap = argparse.ArgumentParser(
         description="Normalize scraped GradCafe JSON/JSONL → CSV + LLM-prep JSONL."
@@ -164,25 +261,44 @@ def main() -> None:
         default="data/clean_for_llm.jsonl",
         help="Minimal JSONL for the LLM normalizer (default: data/clean_for_llm.jsonl)",
     )
+    ap.add_argument(
+        "--no-snapshot",
+        action="store_true",
+        help="Skip the columnar .npy snapshot next to the CSV.",
+    )
+    ap.add_argument(
+        "--no-profile",
+        action="store_true",
+        help="Skip the data-quality profile JSON next to the CSV.",
+    )
     args = ap.parse_args()
 
     src = Path(args.src)
     out_csv = Path(args.out)
     out_llm = Path(args.llm_prep)
 
-    raw_iter = list(_read_json_or_jsonl(src))
+    numeric_stats: Dict[str, int] = {}
+    prof = None if args.no_profile else Profiler()
 
-    csv_rows = [to_csv_row(r) for r in raw_iter]
-    write_csv(out_csv, csv_rows)
+    # One pass: LLM input (program/university only) is written while the
+    # CSV rows are dictionary-encoded into the store.
+    out_llm.parent.mkdir(parents=True, exist_ok=True)
+    with out_llm.open("w", encoding="utf-8") as llm_sink:
+        store = to_column_store(_read_json_or_jsonl(src), numeric_stats, llm_sink, prof)
 
-    # Reuse the same raw to create the LLM input (program/university only)
-    llm_rows = [to_llm_minimal(r) for r in raw_iter]
-    write_jsonl(out_llm, llm_rows)
+    write_csv(out_csv, store.iter_rows())
+    if not args.no_snapshot:
+        write_snapshot(store, snapshot_path(out_csv))
 
     print(
-        f"cleaned rows: {len(csv_rows)} → {out_csv}\n"
-        f"llm-prep rows: {len(llm_rows)} → {out_llm}"
+        f"cleaned rows: {len(store)} → {out_csv}\n"
+        f"llm-prep rows: {len(store)} → {out_llm}"
     )
+    if prof is not None:
+        print(f"data-quality profile → {prof.write(profile_path(out_csv))}")
+    bad = {k: v for k, v in numeric_stats.items() if v}
+    if bad:
+        print(f"out-of-range numeric values (kept): {bad}")
 
 
 if __name__ == "__main__":
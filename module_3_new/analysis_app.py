@@ -25,6 +25,17 @@ from flask import Flask, redirect, render_template, url_for
 DSN = os.getenv("DSN", "postgresql://localhost/gradcafe")
 YEAR = 2025  # assignment requires Fall 2025
 
+# module_2/validate.py --fail-on thresholds the raw scrape must meet before
+# a pull goes on to clean, normalize and load it.
+PULL_GATE: Tuple[str, ...] = (
+    "invalid_json=0",
+    "not_an_object=0",
+    "missing:*=0",
+    "range:*=5%",
+    "vocab:*=5%",
+    "date:*=5%",
+)
+
 
 app = Flask(__name__)
 
@@ -281,6 +292,12 @@ def _pull_pipeline() -> None:
             "python module_2_new/scrape.py --q 'computer science' "
             "--pages 1 --out module_2_new/applicant_data.json"
         )
+        # Gate the rest on the raw scrape: stop before cleaning / the LLM step
+        # if it is malformed or mostly out of spec.
+        _run(
+            "python module_2/validate.py module_2_new/applicant_data.json "
+            + " ".join(f"--fail-on {shlex.quote(t)}" for t in PULL_GATE)
+        )
         _run(
             "python module_2_new/clean.py "
             "--src module_2_new/applicant_data.json "
@@ -1,18 +1,50 @@
 # -*- coding: utf-8 -*-
-"""Flask + tiny local LLM standardizer with incremental JSONL CLI output."""
+"""Flask + tiny local LLM standardizer with incremental JSONL CLI output.
+
+Each input is answered by the first path that can decide it:
+  rules → exact canonical hits, ABBREV_UNI, COMMON_*_FIXES, confident fuzzy
+  cache → persistent sqlite cache of earlier model answers (response_cache.py),
+          keyed by the normalized input plus the model and prompt version
+  llm   → llama.cpp chat completion
+Every output row records the path in "llm-source".
+"""
 
 from __future__ import annotations
 
+import functools
+import itertools
 import json
 import os
 import re
 import sys
-import difflib
-from typing import Any, Dict, List, Tuple
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set, Tuple
+
+from flask import Flask, Response, jsonify, request
+
+try:
+    from llama_cpp import Llama, LlamaGrammar  # CPU-only by default if N_GPU_LAYERS=0
+except ImportError:  # rules/cache paths, tests and stub benchmarks still work
+    Llama = None
+    LlamaGrammar = None
+try:
+    from llama_cpp import llama_perf_context
+except ImportError:  # older llama-cpp-python: no prompt-eval / generation split
+    llama_perf_context = None
+try:
+    from huggingface_hub import hf_hub_download
+except ImportError:  # not needed with MODEL_PATH
+    hf_hub_download = None
 
-from flask import Flask, jsonify, request
-from huggingface_hub import hf_hub_download
-from llama_cpp import Llama  # CPU-only by default if N_GPU_LAYERS=0
+from canon_index import open_index
+from fuzzy import FuzzyIndex
+from jobs import JobQueue
+from metrics import Metrics
+from response_cache import ResponseCache, fingerprint, normalize_key_text
+from scheduler import Scheduler
 
 app = Flask(__name__)
 
@@ -26,34 +58,90 @@ MODEL_FILE = os.getenv(
     "tinyllama-1.1b-chat-v1.0.Q4_K_M.gguf",
 )
 
+# Local GGUF file: memory-mapped, no hub call (works offline). When unset,
+# MODEL_FILE is downloaded from MODEL_REPO into ./models on first load.
+MODEL_PATH = os.getenv("MODEL_PATH", "")
+
 N_THREADS = int(os.getenv("N_THREADS", str(os.cpu_count() or 2)))
 N_CTX = int(os.getenv("N_CTX", "2048"))
 N_GPU_LAYERS = int(os.getenv("N_GPU_LAYERS", "0"))  # 0 → CPU-only
 
-CANON_UNIS_PATH = os.getenv("CANON_UNIS_PATH", "canon_universities.txt")
-CANON_PROGS_PATH = os.getenv("CANON_PROGS_PATH", "canon_programs.txt")
+# Response cache ("" disables it).
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3")
+LLM_CACHE_MAX = int(os.getenv("LLM_CACHE_MAX", "200000"))
+
+# Snapshot the llama.cpp state after the shared system + few-shot prefix
+# and restore it before each row ("0" disables).
+PREFIX_REUSE = os.getenv("PREFIX_REUSE", "1") != "0"
+
+# Inputs packed into one completion when several rows miss the cache
+# (1 = one completion per row).
+LLM_BATCH_SIZE = max(1, int(os.getenv("LLM_BATCH_SIZE", "1")))
+# Constrain generation to the answer JSON with a llama.cpp grammar and a
+# max_tokens computed from the input ("0" = free text, as before).
+CONSTRAINED_DECODING = os.getenv("CONSTRAINED_DECODING", "1") != "0"
+# Free-text completion budget per input of a batched request.
+BATCH_TOKENS_PER_ROW = 64
+# Constrained budget per input: the JSON skeleton + the input's own tokens +
+# this slack (abbreviations expand, e.g. "UBC" → "University of British Columbia").
+ANSWER_SLACK_TOKENS = 16
+# How long the scheduler waits for a batch to fill once an input is queued.
+BATCH_WINDOW_MS = float(os.getenv("BATCH_WINDOW_MS", "5"))
+
+# Load the model and answer WARMUP_TEXT when the server starts ("0" = lazy).
+WARMUP = os.getenv("WARMUP", "1") != "0"
+WARMUP_TEXT = "Information Studies, McGill University"
+
+# Minimum difflib ratio for the pre-inference resolver to trust a fuzzy hit.
+RULES_FUZZY_CUTOFF = float(os.getenv("RULES_FUZZY_CUTOFF", "0.92"))
+# Write one JSON line per inference batch (timings, tokens) to stderr.
+METRICS_LOG = os.getenv("METRICS_LOG", "0") != "0"
+
+# Canonical lists default to the copies next to this file, so the CLI works
+# from any working directory (the /pull pipeline runs from the repo root).
+_HERE = os.path.dirname(os.path.abspath(__file__))
+CANON_UNIS_PATH = os.getenv("CANON_UNIS_PATH", os.path.join(_HERE, "canon_universities.txt"))
+CANON_PROGS_PATH = os.getenv("CANON_PROGS_PATH", os.path.join(_HERE, "canon_programs.txt"))
+# Compiled indexes of both lists (canon_index.py); "" builds them in memory.
+CANON_INDEX_PATH = os.getenv("CANON_INDEX_PATH", os.path.join(_HERE, "canon_index.bin"))
 
 # Precompiled, non-greedy JSON object matcher to tolerate chatter around JSON
 JSON_OBJ_RE = re.compile(r"\{.*?\}", re.DOTALL)
+# Outermost JSON array in a batched answer.
+JSON_ARR_RE = re.compile(r"\[.*\]", re.DOTALL)
 
-# ---------------- Canonical lists + abbrev maps ----------------
-def _read_lines(path: str) -> List[str]:
-    """Read non-empty, stripped lines from a file (UTF-8)."""
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return [ln.strip() for ln in f if ln.strip()]
-    except FileNotFoundError:
-        return []
+# GBNF for one answer object: both keys, in order, non-empty one-line strings.
+ANSWER_GBNF = r"""
+item ::= "{" ws "\"standardized_program\"" ws ":" ws str ws "," ws "\"standardized_university\"" ws ":" ws str ws "}"
+str  ::= "\"" [^"\\\x00-\x1f]+ "\""
+ws   ::= " "?
+"""
+ANSWER_SKELETON = json.dumps({"standardized_program": "", "standardized_university": ""})
 
+# ---------------- Canonical lists + abbrev maps ----------------
+# Exact-hit hash sets + q-gram postings for fuzzy lookups, mapped from
+# CANON_INDEX_PATH (rebuilt there first when the text files changed).
+_CANON = open_index({"universities": CANON_UNIS_PATH, "programs": CANON_PROGS_PATH},
+                    CANON_INDEX_PATH)
+CANON_UNIS_INDEX: FuzzyIndex = _CANON["universities"]
+CANON_PROGS_INDEX: FuzzyIndex = _CANON["programs"]
+CANON_UNIS = CANON_UNIS_INDEX.names
+CANON_PROGS = CANON_PROGS_INDEX.names
+# Case-folded name → canonical spelling, for exact hits in the resolver.
+CANON_UNIS_BY_KEY = {u.casefold(): u for u in CANON_UNIS}
+CANON_PROGS_BY_KEY = {p.casefold(): p for p in CANON_PROGS}
 
-CANON_UNIS = _read_lines(CANON_UNIS_PATH)
-CANON_PROGS = _read_lines(CANON_PROGS_PATH)
+# Degree words the cleaners leave on program names ("Computer Science PhD").
+DEGREE_SUFFIX_RE = re.compile(
+    r"(?i)\s+(?:masters?|ph\.?\s?d\.?|m\.?sc?\.?|m\.?a\.?|mfa|mba|m\.?eng|psyd|ed\.?d)$"
+)
 
 ABBREV_UNI: Dict[str, str] = {
     r"(?i)^mcg(\.|ill)?$": "McGill University",
     r"(?i)^(ubc|u\.?b\.?c\.?)$": "University of British Columbia",
     r"(?i)^uoft$": "University of Toronto",
 }
+ABBREV_UNI_RES = [(re.compile(pat), full) for pat, full in ABBREV_UNI.items()]
 
 COMMON_UNI_FIXES: Dict[str, str] = {
     "McGiill University": "McGill University",
@@ -110,37 +198,309 @@ FEW_SHOTS: List[Tuple[Dict[str, str], Dict[str, str]]] = [
     ),
 ]
 
+# Batched requests: {"programs": [...]} in, one JSON array out.
+BATCH_SYSTEM_PROMPT = SYSTEM_PROMPT + (
+    "\nIf the input instead has key `programs` (a list of such strings), "
+    "return a JSON array ONLY, with one object per string, in the same order.\n"
+)
+
+BATCH_FEW_SHOTS: List[Tuple[Any, Any]] = [
+    (
+        {"programs": [x_in["program"] for x_in, _ in FEW_SHOTS]},
+        [x_out for _, x_out in FEW_SHOTS],
+    ),
+]
+
+# Changes whenever anything that shapes an answer changes: the single and
+# batched prompts and few-shots, and the grammar (or free text) decoding
+# runs under. Part of the cache key.
+PROMPT_VERSION = fingerprint(
+    SYSTEM_PROMPT,
+    json.dumps(FEW_SHOTS, sort_keys=True),
+    BATCH_SYSTEM_PROMPT,
+    json.dumps(BATCH_FEW_SHOTS, sort_keys=True),
+    ANSWER_GBNF if CONSTRAINED_DECODING else "free text",
+)
+
+
+def _build_prefix(system_prompt: str, shots: List[Tuple[Any, Any]]) -> List[Dict[str, str]]:
+    """System prompt + few-shot turns shared by every request."""
+    messages = [{"role": "system", "content": system_prompt}]
+    for x_in, x_out in shots:
+        messages.append(
+            {"role": "user", "content": json.dumps(x_in, ensure_ascii=False)}
+        )
+        messages.append(
+            {
+                "role": "assistant",
+                "content": json.dumps(x_out, ensure_ascii=False),
+            }
+        )
+    return messages
+
+
+# Built once at import; only the last user message changes per request.
+PREFIX_MESSAGES = _build_prefix(SYSTEM_PROMPT, FEW_SHOTS)
+BATCH_PREFIX_MESSAGES = _build_prefix(BATCH_SYSTEM_PROMPT, BATCH_FEW_SHOTS)
+
+
+def _messages_for(program_text: str) -> List[Dict[str, str]]:
+    """Chat messages for one input: the shared prefix + one user turn."""
+    return PREFIX_MESSAGES + [
+        {
+            "role": "user",
+            "content": json.dumps({"program": program_text}, ensure_ascii=False),
+        }
+    ]
+
+
+def _batch_messages_for(texts: List[str]) -> List[Dict[str, str]]:
+    """Chat messages for several inputs answered in one completion."""
+    return BATCH_PREFIX_MESSAGES + [
+        {
+            "role": "user",
+            "content": json.dumps({"programs": texts}, ensure_ascii=False),
+        }
+    ]
+
+
 _LLM: Llama | None = None
+_CACHE: ResponseCache | None = None
+_SCHEDULER: Scheduler | None = None
+# Guards the lazy creation of _CACHE and _SCHEDULER (request threads and the
+# warm-up thread can get there first at the same time).
+_INIT_LOCK = threading.Lock()
+# Model file, load/warm-up timings and GGUF metadata, served by /ready.
+_MODEL_INFO: Dict[str, Any] = {"ready": False}
+# "row" / "batch" → (prefix tokens, llama state holding them), set by _install_llm.
+_PREFIXES: Dict[str, Tuple[List[int], Any]] = {}
+
+# Prompt tokens sent vs. actually evaluated (the rest came from the KV cache).
+LLM_TOKENS: Dict[str, int] = {"calls": 0, "prompt": 0, "evaluated": 0, "generated": 0}
+# Batched completions, inputs sent in them, and inputs re-asked one by one.
+LLM_BATCHES: Dict[str, int] = {"batches": 0, "rows": 0, "fallbacks": 0}
+# Latencies, row sources, cache lookups, parse fallbacks and fuzzy matches,
+# served by /metrics together with the two dicts above.
+METRICS = Metrics()
+METRICS_HELP: Dict[str, str] = {
+    "llm_row_seconds": "Per-row latency by phase (batched completions split evenly).",
+    "llm_rows_total": "Rows standardized, by answering path.",
+    "llm_input_rows_total": "Rows received by the batch entry points.",
+    "llm_input_distinct_total": "Distinct inputs among them, each standardized once.",
+    "llm_cache_lookups_total": "Response cache lookups by result.",
+    "llm_answers_total": "Model answers parsed, single-row or batched.",
+    "llm_parse_fallbacks_total": "Single-row answers that were not JSON (split fallback used).",
+    "llm_fuzzy_lookups_total": "Fuzzy lookups against a canonical list.",
+    "llm_fuzzy_hits_total": "Fuzzy lookups that found a match above the cutoff.",
+    "llm_tokens_total": "Prompt tokens sent / evaluated, and tokens generated.",
+    "llm_completions_total": "Chat completions run.",
+    "llm_batches_total": "Batched completions, their inputs, and inputs re-asked alone.",
+    "llm_tokens_per_second": "Prompt-eval and generation throughput.",
+    "llm_cache_hit_ratio": "Cache hits among cache lookups.",
+    "llm_parse_fallback_ratio": "Single-row answers that fell back to the split parser.",
+    "llm_batch_fallback_ratio": "Batched inputs re-asked one by one.",
+    "llm_input_distinct_ratio": "Distinct inputs per row received (1.0 = no duplicates).",
+    "llm_fuzzy_hit_ratio": "Fuzzy hits among fuzzy lookups.",
+}
 
 
-def _load_llm() -> Llama:
-    """Download (or reuse) the GGUF file and initialize llama.cpp."""
+def _kv_tokens(llm: Any) -> List[int]:
+    """Tokens currently in the KV cache (input_ids is an n_ctx-long buffer)."""
+    return list(llm.input_ids[: llm.n_tokens])
+
+
+def _common_prefix(a: Any, b: Any) -> int:
+    """Length of the shared leading run of two token sequences."""
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+def _warm_prefix(
+    llm: Any, make_messages: Callable[[str], List[Dict[str, str]]]
+) -> Tuple[List[int], Any]:
+    """Evaluate the shared prefix once and snapshot the llama.cpp state.
+
+    Two probe inputs are run; the tokens their prompts share are exactly the
+    templated prefix, whatever the chat format adds around each turn.
+    """
+    seen = []
+    for probe in ("a", "b"):
+        llm.create_chat_completion(
+            messages=make_messages(probe), temperature=0.0, max_tokens=1
+        )
+        seen.append(_kv_tokens(llm))
+    tokens = seen[1][: _common_prefix(seen[0], seen[1])]
+    return tokens, llm.save_state()
+
+
+def _install_llm(llm: Any) -> Any:
+    """Use `llm` for inference (warming its prompt prefixes if enabled)."""
     global _LLM
+    _LLM = llm
+    _PREFIXES.clear()
+    if PREFIX_REUSE:
+        _PREFIXES["row"] = _warm_prefix(llm, _messages_for)
+        if LLM_BATCH_SIZE > 1:
+            _PREFIXES["batch"] = _warm_prefix(llm, lambda t: _batch_messages_for([t]))
+    return llm
+
+
+def _perf_ms(llm: Any) -> Tuple[float, float] | None:
+    """Cumulative (prompt eval, generation) ms from llama.cpp's perf timers."""
+    if hasattr(llm, "perf_ms"):  # stub_llm.StubLlama
+        return llm.perf_ms()
+    if llama_perf_context is None:
+        return None
+    try:
+        data = llama_perf_context(llm._ctx.ctx)
+    except Exception:
+        return None
+    return data.t_p_eval_ms, data.t_eval_ms
+
+
+def _observe_row_seconds(phase: str, seconds: float, rows: int) -> None:
+    """Add `seconds` spent on `rows` rows to the per-row latency of a phase."""
+    METRICS.inc("llm_row_seconds_sum", seconds, phase=phase)
+    METRICS.inc("llm_row_seconds_count", rows, phase=phase)
+
+
+def _model_id() -> str:
+    """Model name for /ready: the local file name or repo/file."""
+    return os.path.basename(MODEL_PATH) if MODEL_PATH else f"{MODEL_REPO}/{MODEL_FILE}"
+
+
+def _model_key() -> str:
+    """Model identity for cache keys: _model_id plus a local file's size and mtime.
+
+    The name alone would let two GGUFs called the same, or a file
+    re-quantized in place, serve each other's cached answers.
+    """
+    if not MODEL_PATH:
+        return _model_id()
+    try:
+        st = os.stat(MODEL_PATH)
+    except OSError:
+        return _model_id()
+    return f"{_model_id()}:{st.st_size}:{st.st_mtime_ns}"
+
+
+def _load_llm() -> Llama:
+    """Open MODEL_PATH (or download the GGUF file) and initialize llama.cpp.
+
+    Only called from the scheduler thread (via _complete).
+    """
     if _LLM is not None:
         return _LLM
+    if Llama is None:
+        raise RuntimeError("llama-cpp-python is required for inference")
 
-    model_path = hf_hub_download(
-        repo_id=MODEL_REPO,
-        filename=MODEL_FILE,
-        local_dir="models",
-        local_dir_use_symlinks=False,
-        force_filename=MODEL_FILE,
-    )
+    t0 = time.perf_counter()
+    if MODEL_PATH:
+        model_path = MODEL_PATH
+    elif hf_hub_download is None:
+        raise RuntimeError("huggingface_hub is required to download a model; set MODEL_PATH")
+    else:
+        model_path = hf_hub_download(
+            repo_id=MODEL_REPO,
+            filename=MODEL_FILE,
+            local_dir="models",
+            local_dir_use_symlinks=False,
+            force_filename=MODEL_FILE,
+        )
 
-    _LLM = Llama(
+    llm = Llama(
         model_path=model_path,
         n_ctx=N_CTX,
         n_threads=N_THREADS,
         n_gpu_layers=N_GPU_LAYERS,
+        use_mmap=True,
         verbose=False,
     )
-    return _LLM
+    _install_llm(llm)
+
+    meta = getattr(llm, "metadata", None) or {}
+    _MODEL_INFO.update(
+        {
+            "model": _model_id(),
+            "path": os.path.abspath(model_path),
+            "size_bytes": os.path.getsize(model_path),
+            "source": "local" if MODEL_PATH else "hub",
+            "load_seconds": round(time.perf_counter() - t0, 3),
+            "n_ctx": N_CTX,
+            "n_threads": N_THREADS,
+            "n_gpu_layers": N_GPU_LAYERS,
+            "gguf": {
+                k: meta[k]
+                for k in (
+                    "general.name",
+                    "general.architecture",
+                    "general.file_type",
+                    "general.quantization_version",
+                )
+                if k in meta
+            },
+        }
+    )
+    _MODEL_INFO.pop("error", None)
+    # Ready as soon as the model can serve; a running warm-up flips it when done.
+    _MODEL_INFO["ready"] = not _MODEL_INFO.get("warming", False)
+    return llm
+
+
+def _warm_up() -> None:
+    """Load the model and answer one input, recording timings for /ready.
+
+    Only an optimization: if it fails, the error is reported and the model
+    still loads on the first request, which then makes /ready answer 200.
+    """
+    _MODEL_INFO["warming"] = True
+    t0 = time.perf_counter()
+    try:
+        _get_scheduler().submit([WARMUP_TEXT])
+    except Exception as e:
+        _MODEL_INFO["error"] = f"{type(e).__name__}: {e}"
+    else:
+        total = time.perf_counter() - t0
+        _MODEL_INFO["warmup_seconds"] = round(total - _MODEL_INFO.get("load_seconds", 0.0), 3)
+    finally:
+        _MODEL_INFO["warming"] = False
+        _MODEL_INFO["ready"] = _LLM is not None
+
+
+def _start_warm_up() -> threading.Thread:
+    """Warm up in the background; /ready answers 503 until it is done."""
+    _MODEL_INFO["warming"] = True  # before any request can load the model first
+    t = threading.Thread(target=_warm_up, name="llm-warmup", daemon=True)
+    t.start()
+    return t
+
+
+def _get_cache() -> ResponseCache | None:
+    """Open the response cache on first use (None when disabled)."""
+    global _CACHE
+    if _CACHE is None and LLM_CACHE_PATH:
+        with _INIT_LOCK:
+            if _CACHE is None:
+                _CACHE = ResponseCache(
+                    LLM_CACHE_PATH,
+                    namespace=f"{_model_key()}|{PROMPT_VERSION}",
+                    max_entries=LLM_CACHE_MAX,
+                )
+    return _CACHE
+
+
+def _split_parts(text: str) -> List[str]:
+    """Split "Program, University" style input into trimmed parts."""
+    s = re.sub(r"\s+", " ", (text or "")).strip().strip(",")
+    return [p.strip() for p in re.split(r",| at | @ ", s) if p.strip()]
 
 
 def _split_fallback(text: str) -> Tuple[str, str]:
     """Simple, rules-first parser if the model returns non-JSON."""
-    s = re.sub(r"\s+", " ", (text or "")).strip().strip(",")
-    parts = [p.strip() for p in re.split(r",| at | @ ", s) if p.strip()]
+    parts = _split_parts(text)
     prog = parts[0] if parts else ""
     uni = parts[1] if len(parts) > 1 else ""
 
@@ -162,12 +522,21 @@ def _split_fallback(text: str) -> Tuple[str, str]:
     return prog, uni
 
 
-def _best_match(name: str, candidates: List[str], cutoff: float = 0.86) -> str | None:
-    """Fuzzy match via difflib (lightweight, Replit-friendly)."""
-    if not name or not candidates:
+def _best_match(
+    name: str, index: FuzzyIndex, cutoff: float = 0.86, stage: str = "llm"
+) -> str | None:
+    """Fuzzy match, same result as difflib.get_close_matches(n=1) (see fuzzy.py).
+
+    Counted per canonical list and `stage` ("rules" or "llm" post-normalization).
+    """
+    if not name or not len(index):
         return None
-    matches = difflib.get_close_matches(name, candidates, n=1, cutoff=cutoff)
-    return matches[0] if matches else None
+    match = index.best(name, cutoff)
+    labels = {"list": "programs" if index is CANON_PROGS_INDEX else "universities", "stage": stage}
+    METRICS.inc("llm_fuzzy_lookups_total", **labels)
+    if match is not None:
+        METRICS.inc("llm_fuzzy_hits_total", **labels)
+    return match
 
 
 def _post_normalize_program(prog: str) -> str:
@@ -175,9 +544,9 @@ def _post_normalize_program(prog: str) -> str:
     p = (prog or "").strip()
     p = COMMON_PROG_FIXES.get(p, p)
     p = p.title()
-    if p in CANON_PROGS:
+    if p in CANON_PROGS_INDEX:
         return p
-    match = _best_match(p, CANON_PROGS, cutoff=0.84)
+    match = _best_match(p, CANON_PROGS_INDEX, cutoff=0.84)
     return match or p
 
 
@@ -186,8 +555,8 @@ def _post_normalize_university(uni: str) -> str:
     u = (uni or "").strip()
 
     # Abbreviations
-    for pat, full in ABBREV_UNI.items():
-        if re.fullmatch(pat, u):
+    for pat, full in ABBREV_UNI_RES:
+        if pat.fullmatch(u):
             u = full
             break
 
@@ -199,56 +568,453 @@ def _post_normalize_university(uni: str) -> str:
         u = re.sub(r"\bOf\b", "of", u.title())
 
     # Canonical or fuzzy map
-    if u in CANON_UNIS:
+    if u in CANON_UNIS_INDEX:
         return u
-    match = _best_match(u, CANON_UNIS, cutoff=0.86)
+    match = _best_match(u, CANON_UNIS_INDEX, cutoff=0.86)
     return match or u or "Unknown"
 
 
-def _call_llm(program_text: str) -> Dict[str, str]:
-    """Query the tiny LLM and return standardized fields."""
-    llm = _load_llm()
+@functools.lru_cache(maxsize=64)
+def _grammar(n: int) -> Any:
+    """Grammar for one answer object (n = 0) or an array of exactly n objects."""
+    if n == 0:
+        root = "root ::= item"
+    else:
+        root = 'root ::= "[" ws item' + ' "," ws item' * (n - 1) + ' ws "]"'
+    text = root + ANSWER_GBNF
+    # Without llama_cpp (stub model) the GBNF text itself is passed through.
+    return LlamaGrammar.from_string(text, verbose=False) if LlamaGrammar is not None else text
 
-    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-    for x_in, x_out in FEW_SHOTS:
-        messages.append(
-            {"role": "user", "content": json.dumps(x_in, ensure_ascii=False)}
-        )
-        messages.append(
-            {
-                "role": "assistant",
-                "content": json.dumps(x_out, ensure_ascii=False),
-            }
-        )
-    messages.append(
-        {
-            "role": "user",
-            "content": json.dumps({"program": program_text}, ensure_ascii=False),
-        }
+
+def _answer_budget(llm: Any, texts: List[str]) -> int:
+    """max_tokens that fits the answer JSON for these inputs, and no more."""
+    skeleton = len(llm.tokenize(ANSWER_SKELETON.encode("utf-8"), add_bos=False))
+    budget = sum(
+        skeleton + len(llm.tokenize(t.encode("utf-8"), add_bos=False)) + ANSWER_SLACK_TOKENS
+        for t in texts
     )
+    return budget + (len(texts) + 1 if len(texts) > 1 else 0)  # brackets, commas
 
+
+def _complete(
+    messages: List[Dict[str, str]], prefix: str, texts: List[str], batched: bool
+) -> str:
+    """Run one chat completion for `texts` and return its text.
+
+    llama.cpp re-evaluates only the tokens after the longest prefix shared
+    with its current KV cache, so the `prefix` snapshot is put back first
+    if another prompt replaced it. With CONSTRAINED_DECODING the output is
+    held to the answer grammar and a computed token budget.
+    """
+    llm = _load_llm()
+    if CONSTRAINED_DECODING:
+        limits: Dict[str, Any] = {
+            "grammar": _grammar(len(texts) if batched else 0),
+            "max_tokens": _answer_budget(llm, texts),
+            "stop": ["</s>"],
+        }
+    elif batched:
+        limits = {"max_tokens": BATCH_TOKENS_PER_ROW * len(texts) + 8}
+    else:
+        limits = {"max_tokens": 128}
+
+    cached = _kv_tokens(llm)
+    if prefix in _PREFIXES:
+        tokens, state = _PREFIXES[prefix]
+        if _common_prefix(cached, tokens) < len(tokens):
+            llm.load_state(state)
+            cached = _kv_tokens(llm)
+
+    perf = _perf_ms(llm)
+    t0 = time.perf_counter()
     out = llm.create_chat_completion(
         messages=messages,
         temperature=0.0,
-        max_tokens=128,
         top_p=1.0,
+        **limits,
     )
+    _observe_row_seconds("completion", time.perf_counter() - t0, len(texts))
+    after = _perf_ms(llm) if perf is not None else None
+    if perf is not None and after is not None:
+        _observe_row_seconds("prompt_eval", (after[0] - perf[0]) / 1000.0, len(texts))
+        _observe_row_seconds("generation", (after[1] - perf[1]) / 1000.0, len(texts))
+
+    n_prompt = int((out.get("usage") or {}).get("prompt_tokens") or 0)
+    reused = min(_common_prefix(cached, llm.input_ids[:n_prompt]), max(n_prompt - 1, 0))
+    LLM_TOKENS["calls"] += 1
+    LLM_TOKENS["prompt"] += n_prompt
+    LLM_TOKENS["evaluated"] += n_prompt - reused
+    LLM_TOKENS["generated"] += int((out.get("usage") or {}).get("completion_tokens") or 0)
+    return (out["choices"][0]["message"]["content"] or "").strip()
 
-    text = (out["choices"][0]["message"]["content"] or "").strip()
+
+def _ask_llm(program_text: str) -> Tuple[str, str]:
+    """Query the tiny LLM and return its (program, university) answer."""
+    text = _complete(_messages_for(program_text), "row", [program_text], batched=False)
+    METRICS.inc("llm_answers_total", mode="row")
     try:
         match = JSON_OBJ_RE.search(text)
         obj = json.loads(match.group(0) if match else text)
         std_prog = str(obj.get("standardized_program", "")).strip()
         std_uni = str(obj.get("standardized_university", "")).strip()
     except Exception:
+        METRICS.inc("llm_parse_fallbacks_total")
         std_prog, std_uni = _split_fallback(program_text)
+    return std_prog, std_uni
+
+
+def _parse_item(obj: Any) -> Tuple[str, str] | None:
+    """(program, university) from one batched answer object, None if malformed."""
+    if not isinstance(obj, dict):
+        return None
+    prog = obj.get("standardized_program")
+    uni = obj.get("standardized_university")
+    if not isinstance(prog, str) or not isinstance(uni, str) or not prog.strip():
+        return None
+    return prog.strip(), uni.strip()
+
+
+def _ask_llm_batch(texts: List[str]) -> List[Tuple[str, str] | None]:
+    """Answer several inputs with one completion (a JSON array, in order).
+
+    Entries that are missing or malformed come back as None; an array of
+    the wrong length cannot be aligned, so then every entry is None.
+    """
+    LLM_BATCHES["batches"] += 1
+    LLM_BATCHES["rows"] += len(texts)
+    text = _complete(_batch_messages_for(texts), "batch", texts, batched=True)
+    METRICS.inc("llm_answers_total", len(texts), mode="batch")
+    match = JSON_ARR_RE.search(text)
+    try:
+        items = json.loads(match.group(0) if match else text)
+    except ValueError:
+        return [None] * len(texts)
+    if not isinstance(items, list) or len(items) != len(texts):
+        return [None] * len(texts)
+    return [_parse_item(x) for x in items]
+
+
+# ---------------- Rules-first resolver ----------------
+def _rules_program(prog: str) -> str | None:
+    """Canonical program via fixes + exact hit + confident fuzzy, else None."""
+    p = COMMON_PROG_FIXES.get(prog, prog)
+    bare = DEGREE_SUFFIX_RE.sub("", p)
+    for cand in (p, bare):
+        hit = CANON_PROGS_BY_KEY.get(cand.casefold())
+        if hit:
+            return hit
+    return _best_match(bare.title(), CANON_PROGS_INDEX, cutoff=RULES_FUZZY_CUTOFF, stage="rules")
+
 
-    std_prog = _post_normalize_program(std_prog)
-    std_uni = _post_normalize_university(std_uni)
+def _rules_university(uni: str) -> str | None:
+    """Canonical university via abbreviations, fixes, exact hit, confident fuzzy."""
+    u = uni
+    for pat, full in ABBREV_UNI_RES:
+        if pat.fullmatch(u):
+            u = full
+            break
+    u = COMMON_UNI_FIXES.get(u, u)
+    hit = CANON_UNIS_BY_KEY.get(u.casefold())
+    if hit:
+        return hit
+    u = re.sub(r"\bOf\b", "of", u.title())
+    return _best_match(u, CANON_UNIS_INDEX, cutoff=RULES_FUZZY_CUTOFF, stage="rules")
+
+
+def _resolve_rules(program_text: str, university_hint: str = "") -> Dict[str, str] | None:
+    """Answer without inference when the input is unambiguous.
+
+    Decides "Program, University" inputs whose two parts both resolve. A
+    lone program uses the row's own university field as the university
+    part (or "Unknown" when the row has none). Anything else returns None
+    and goes to the cache / LLM.
+    """
+    parts = _split_parts(program_text)
+    if len(parts) == 2:
+        prog_raw, uni_raw = parts
+    elif len(parts) == 1:
+        prog_raw, uni_raw = parts[0], " ".join((university_hint or "").split())
+    else:
+        return None
+
+    prog = _rules_program(prog_raw)
+    uni = _rules_university(uni_raw) if uni_raw else "Unknown"
+    if not prog or not uni:
+        return None
     return {
-        "standardized_program": std_prog,
-        "standardized_university": std_uni,
+        "standardized_program": prog,
+        "standardized_university": uni,
+        "source": "rules",
+    }
+
+
+def _infer(texts: List[str]) -> List[Tuple[str, str]]:
+    """Model answers for one scheduler batch (runs on the scheduler thread).
+
+    An input whose batched answer is malformed is asked again on its own.
+    With METRICS_LOG, a JSON line with the batch's timings goes to stderr.
+    """
+    if METRICS_LOG:
+        before = (METRICS.snapshot(), dict(LLM_TOKENS), dict(LLM_BATCHES))
+    got: List[Tuple[str, str] | None] = [None]
+    if len(texts) > 1:
+        got = _ask_llm_batch(texts)
+    answers = []
+    for text, answer in zip(texts, got):
+        if answer is None:
+            if len(texts) > 1:
+                LLM_BATCHES["fallbacks"] += 1
+            answer = _ask_llm(text)
+        answers.append(answer)
+    if METRICS_LOG:
+        _log_batch(len(texts), *before)
+    return answers
+
+
+def _log_batch(rows: int, metrics: Dict[Any, float],
+               tokens: Dict[str, int], batches: Dict[str, int]) -> None:
+    """One JSON line on stderr describing the batch just run."""
+    delta = METRICS.diff(metrics)
+    ms = {
+        phase: round(1000.0 * delta.get(("llm_row_seconds_sum", (("phase", phase),)), 0.0), 3)
+        for phase in ("completion", "prompt_eval", "generation")
+    }
+    record = {
+        "ts": round(time.time(), 3),
+        "rows": rows,
+        "completions": LLM_TOKENS["calls"] - tokens["calls"],
+        "prompt_tokens": LLM_TOKENS["prompt"] - tokens["prompt"],
+        "evaluated_tokens": LLM_TOKENS["evaluated"] - tokens["evaluated"],
+        "generated_tokens": LLM_TOKENS["generated"] - tokens["generated"],
+        "completion_ms": ms["completion"],
+        "prompt_eval_ms": ms["prompt_eval"],
+        "generation_ms": ms["generation"],
+        "reasked": LLM_BATCHES["fallbacks"] - batches["fallbacks"],
+        "parse_fallbacks": int(delta.get(("llm_parse_fallbacks_total", ()), 0)),
     }
+    print(json.dumps(record), file=sys.stderr, flush=True)
+
+
+def _get_scheduler() -> Scheduler:
+    """The scheduler that serializes all inference (started on first use)."""
+    global _SCHEDULER
+    if _SCHEDULER is None:
+        with _INIT_LOCK:
+            if _SCHEDULER is None:
+                _SCHEDULER = Scheduler(_infer, window=BATCH_WINDOW_MS / 1000.0)
+    _SCHEDULER.max_batch = LLM_BATCH_SIZE
+    return _SCHEDULER
+
+
+def _call_llm_many(texts: List[str]) -> List[Dict[str, str]]:
+    """Standardize inputs via the response cache, else the tiny LLM.
+
+    Cache misses go through the scheduler, which batches them (up to
+    LLM_BATCH_SIZE) with misses from concurrent requests. Each returned
+    dict's "source" is "cache" or "llm".
+    """
+    cache = _get_cache()
+    answers: List[Tuple[str, str] | None] = [
+        cache.get(t) if cache is not None else None for t in texts
+    ]
+    sources = ["cache" if a is not None else "llm" for a in answers]
+    if cache is not None:
+        METRICS.inc("llm_cache_lookups_total", sources.count("cache"), result="hit")
+        METRICS.inc("llm_cache_lookups_total", sources.count("llm"), result="miss")
+
+    todo = [i for i, a in enumerate(answers) if a is None]
+    if todo:
+        got = _get_scheduler().submit([texts[i] for i in todo])
+        for i, answer in zip(todo, got):
+            answers[i] = answer
+            if cache is not None:
+                cache.put(texts[i], *answer)
+
+    t0 = time.perf_counter()
+    out = []
+    for answer, source in zip(answers, sources):
+        assert answer is not None  # for type-checkers
+        out.append(
+            {
+                "standardized_program": _post_normalize_program(answer[0]),
+                "standardized_university": _post_normalize_university(answer[1]),
+                "source": source,
+            }
+        )
+    if out:
+        _observe_row_seconds("post_normalize", time.perf_counter() - t0, len(out))
+    return out
+
+
+def _call_llm(program_text: str) -> Dict[str, str]:
+    """Standardize one input via the response cache, else the tiny LLM."""
+    return _call_llm_many([program_text])[0]
+
+
+def _llm_text(program_text: str, university_hint: str = "") -> str:
+    """The input the cache / LLM see for a row.
+
+    A lone program gets the row's university appended ("Program,
+    University"), so the model has the same hint _resolve_rules used.
+    """
+    hint = " ".join((university_hint or "").split())
+    if hint and len(_split_parts(program_text)) == 1:
+        return f"{program_text.strip()}, {hint}"
+    return program_text
+
+
+def _standardize(program_text: str, university_hint: str = "") -> Dict[str, str]:
+    """Rules first; the cache / LLM only when the rules cannot decide."""
+    return _resolve_rules(program_text, university_hint) or _call_llm(
+        _llm_text(program_text, university_hint)
+    )
+
+
+def _input_key(row: Dict[str, Any]) -> Tuple[str, str]:
+    """Normalized input of a row; rows with equal keys standardize alike.
+
+    The university field only matters for a lone program (see _resolve_rules).
+    """
+    program = row.get("program") or ""
+    hint = (row.get("university") or "") if len(_split_parts(program)) == 1 else ""
+    return normalize_key_text(program), normalize_key_text(hint)
+
+
+def _distinct_rows(rows: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """First row of each distinct input, and each row's index into that list."""
+    firsts: List[Dict[str, Any]] = []
+    index: List[int] = []
+    seen: Dict[Tuple[str, str], int] = {}
+    for row in rows:
+        row = row or {}
+        key = _input_key(row)
+        i = seen.get(key)
+        if i is None:
+            i = seen[key] = len(firsts)
+            firsts.append(row)
+        index.append(i)
+    return firsts, index
+
+
+def _standardize_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """_standardize for many rows: once per distinct input, copied to each row."""
+    firsts, index = _distinct_rows(rows)
+    return _fan_out(_standardize_distinct(firsts), index)
+
+
+def _fan_out(results: List[Dict[str, str]], index: List[int]) -> List[Dict[str, str]]:
+    """One result per row, in row order (a copy each, so rows never share one)."""
+    out = [dict(results[i]) for i in index]
+    METRICS.inc("llm_input_rows_total", len(out))
+    for r in out:
+        METRICS.inc("llm_rows_total", source=r["source"])
+    return out
+
+
+def _standardize_distinct(rows: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """_standardize for distinct rows, batching the inputs the rules leave over."""
+    METRICS.inc("llm_input_distinct_total", len(rows))
+    results: List[Dict[str, str] | None] = []
+    pending: List[int] = []
+    for row in rows:
+        result = _resolve_rules(row.get("program") or "", row.get("university") or "")
+        if result is None:
+            pending.append(len(results))
+        results.append(result)
+
+    texts = [
+        _llm_text(rows[i].get("program") or "", rows[i].get("university") or "")
+        for i in pending
+    ]
+    for i, result in zip(pending, _call_llm_many(texts)):
+        results[i] = result
+    return [r for r in results if r is not None]
+
+
+def _annotate(row: Dict[str, Any], result: Dict[str, str]) -> None:
+    """Copy a standardization result onto its input row."""
+    row["llm-generated-program"] = result["standardized_program"]
+    row["llm-generated-university"] = result["standardized_university"]
+    row["llm-source"] = result["source"]
+
+
+def _source_summary(sources: List[str]) -> Dict[str, Any]:
+    """Rows answered per path, and the cache hit rate among non-rule rows."""
+    by_source = {k: sources.count(k) for k in ("rules", "cache", "llm")}
+    looked_up = by_source["cache"] + by_source["llm"]
+    summary: Dict[str, Any] = {
+        "rows": len(sources),
+        "sources": by_source,
+        "hits": by_source["cache"],
+        "hit_rate": round(by_source["cache"] / looked_up, 4) if looked_up else 0.0,
+    }
+    cache = _get_cache()
+    if cache is not None:
+        summary["cumulative"] = cache.stats()
+    return summary
+
+
+def _ratio(part: float, whole: float) -> float:
+    return round(part / whole, 4) if whole else 0.0
+
+
+def _metrics_summary() -> Dict[str, Any]:
+    """Rates derived from METRICS / LLM_TOKENS / LLM_BATCHES (ms, tokens/s, ratios)."""
+    m = METRICS
+    row_ms = {}
+    for phase in ("completion", "prompt_eval", "generation", "post_normalize"):
+        count = m.value("llm_row_seconds_count", phase=phase)
+        if count:
+            row_ms[phase] = round(1000.0 * m.value("llm_row_seconds_sum", phase=phase) / count, 3)
+
+    # Without llama.cpp's perf timers, the whole completion counts as generation.
+    prompt_s = m.value("llm_row_seconds_sum", phase="prompt_eval")
+    gen_s = m.value("llm_row_seconds_sum", phase="generation") or (
+        0.0 if prompt_s else m.value("llm_row_seconds_sum", phase="completion")
+    )
+    fuzzy = {}
+    for (name, labels), lookups in sorted(m.snapshot().items()):
+        if name == "llm_fuzzy_lookups_total" and lookups:
+            d = dict(labels)
+            key = f"{d['stage']}/{d['list']}"
+            fuzzy[key] = _ratio(m.value("llm_fuzzy_hits_total", **d), lookups)
+
+    hits = m.value("llm_cache_lookups_total", result="hit")
+    return {
+        "distinct_ratio": _ratio(m.value("llm_input_distinct_total"),
+                                 m.value("llm_input_rows_total")),
+        "row_ms": row_ms,
+        "prompt_tokens_s": round(LLM_TOKENS["evaluated"] / prompt_s, 1) if prompt_s else 0.0,
+        "generated_tokens_s": round(LLM_TOKENS["generated"] / gen_s, 1) if gen_s else 0.0,
+        "cache_hit_rate": _ratio(hits, hits + m.value("llm_cache_lookups_total", result="miss")),
+        "parse_fallback_rate": _ratio(m.value("llm_parse_fallbacks_total"),
+                                      m.value("llm_answers_total", mode="row")),
+        "batch_fallback_rate": _ratio(LLM_BATCHES["fallbacks"], LLM_BATCHES["rows"]),
+        "fuzzy_hit_rate": fuzzy,
+    }
+
+
+def _render_metrics() -> str:
+    """Prometheus text exposition of everything in _metrics_summary and its inputs."""
+    summary = _metrics_summary()
+    extra: List[Tuple[str, str, Dict[str, str], float]] = [
+        ("llm_completions_total", "counter", {}, LLM_TOKENS["calls"]),
+    ]
+    extra += [("llm_tokens_total", "counter", {"kind": k}, LLM_TOKENS[k])
+              for k in ("prompt", "evaluated", "generated")]
+    extra += [("llm_batches_total", "counter", {"kind": k}, v) for k, v in LLM_BATCHES.items()]
+    extra += [
+        ("llm_tokens_per_second", "gauge", {"phase": "prompt_eval"}, summary["prompt_tokens_s"]),
+        ("llm_tokens_per_second", "gauge", {"phase": "generation"}, summary["generated_tokens_s"]),
+        ("llm_cache_hit_ratio", "gauge", {}, summary["cache_hit_rate"]),
+        ("llm_input_distinct_ratio", "gauge", {}, summary["distinct_ratio"]),
+        ("llm_parse_fallback_ratio", "gauge", {}, summary["parse_fallback_rate"]),
+        ("llm_batch_fallback_ratio", "gauge", {}, summary["batch_fallback_rate"]),
+    ]
+    for key, rate in summary["fuzzy_hit_rate"].items():
+        stage, name = key.split("/")
+        extra.append(("llm_fuzzy_hit_ratio", "gauge", {"list": name, "stage": stage}, rate))
+    return METRICS.render(METRICS_HELP, extra)
 
 
 def _normalize_input(payload: Any) -> List[Dict[str, Any]]:
@@ -260,27 +1026,287 @@ def _normalize_input(payload: Any) -> List[Dict[str, Any]]:
     return []
 
 
+def _parse_ndjson(text: str) -> List[Dict[str, Any]]:
+    """Rows of an NDJSON body; ValueError names the first bad line (1-based)."""
+    rows = []
+    for n, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            raise ValueError(f"line {n}: {exc}") from None
+        if not isinstance(row, dict):
+            raise ValueError(f"line {n}: expected a JSON object")
+        rows.append(row)
+    return rows
+
+
 @app.get("/")
 def health() -> Any:
     """Simple liveness check."""
     return jsonify({"ok": True})
 
 
+@app.get("/ready")
+def ready() -> Any:
+    """Readiness: 200 once the model is loaded and warmed up, else 503."""
+    return jsonify(_MODEL_INFO), 200 if _MODEL_INFO["ready"] else 503
+
+
+@app.get("/metrics")
+def metrics() -> Any:
+    """Counters and derived rates in the Prometheus text format."""
+    return Response(_render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.post("/standardize")
 def standardize() -> Any:
     """Standardize rows from an HTTP request and return JSON."""
     payload = request.get_json(force=True, silent=True)
     rows = _normalize_input(payload)
 
+    firsts, index = _distinct_rows(rows)
     out: List[Dict[str, Any]] = []
-    for row in rows:
-        program_text = (row or {}).get("program") or ""
-        result = _call_llm(program_text)
-        row["llm-generated-program"] = result["standardized_program"]
-        row["llm-generated-university"] = result["standardized_university"]
+    sources: List[str] = []
+    for row, result in zip(rows, _fan_out(_standardize_distinct(firsts), index)):
+        _annotate(row, result)
+        sources.append(result["source"])
         out.append(row)
 
-    return jsonify({"rows": out})
+    inputs = {
+        "rows": len(rows),
+        "distinct": len(firsts),
+        "distinct_ratio": round(len(firsts) / len(rows), 4) if rows else 0.0,
+    }
+    return jsonify({"rows": out, "cache": _source_summary(sources), "inputs": inputs})
+
+
+def _annotate_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Standardize and annotate rows in place (the job worker's task)."""
+    for row, result in zip(rows, _standardize_rows(rows)):
+        _annotate(row, result)
+    return rows
+
+
+def _job_chunk_rows() -> int:
+    """Rows per job chunk, read as each job starts (follows --batch-size)."""
+    return max(16, 4 * LLM_BATCH_SIZE)
+
+
+# Bulk jobs: one background thread runs every job, one chunk at a time.
+_JOBS = JobQueue(_annotate_rows, chunk=_job_chunk_rows)
+
+
+@app.post("/jobs")
+def create_job() -> Any:
+    """Queue rows (JSON like /standardize, or NDJSON) and return the job id."""
+    if request.mimetype == "application/x-ndjson":
+        try:
+            rows = _normalize_input(_parse_ndjson(request.get_data(as_text=True)))
+        except ValueError as exc:
+            return jsonify({"error": f"bad NDJSON, {exc}"}), 400
+    else:
+        rows = _normalize_input(request.get_json(force=True, silent=True))
+    job = _JOBS.submit(rows)
+    return jsonify(job.progress()), 202
+
+
+@app.get("/jobs/<job_id>")
+def job_status(job_id: str) -> Any:
+    """Progress of a job: rows done, rows/s, ETA."""
+    job = _JOBS.get(job_id)
+    if job is None:
+        return jsonify({"error": "unknown job"}), 404
+    return jsonify(job.progress())
+
+
+@app.get("/jobs/<job_id>/results")
+def job_results(job_id: str) -> Any:
+    """Finished rows as NDJSON, in input order.
+
+    Streams until the job ends; ?follow=0 returns only the rows done so far,
+    and ?offset=N skips the first N rows (to pick up where a reader left off).
+    """
+    job = _JOBS.get(job_id)
+    if job is None:
+        return jsonify({"error": "unknown job"}), 404
+    start = request.args.get("offset", default=0, type=int)
+    follow = request.args.get("follow", default="1") != "0"
+
+    def lines() -> Iterator[str]:
+        for row in _JOBS.iter_results(job, start=start, follow=follow):
+            yield json.dumps(row, ensure_ascii=False) + "\n"
+
+    return Response(lines(), mimetype="application/x-ndjson")
+
+
+def _iter_input_rows(path: str) -> Iterator[Dict[str, Any]]:
+    """Rows of a JSON file (list or {'rows': [...]}) or, streamed, a JSONL file.
+
+    A file whose first line is not a complete JSON document (or is a
+    one-line {'rows': [...]}) is read whole as JSON; otherwise it is JSONL
+    and read one line at a time. Blank and undecodable lines are skipped.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(1)
+        while head and head.isspace():
+            head = f.read(1)
+        first = head + f.readline()
+        try:
+            obj = json.loads(first) if head != "[" else None
+        except ValueError:
+            obj = None
+        if obj is None or _normalize_input(obj):
+            f.seek(0)
+            yield from _normalize_input(json.load(f))
+            return
+
+        yield obj
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def _resume_state(out_path: str, key: str | None) -> Tuple[int, Set[str]]:
+    """Rows already written to out_path, for --append.
+
+    A torn last line (no trailing newline, e.g. after a crash) is cut off
+    first. Returns the number of complete rows, plus the set of their
+    `key` values when a key is given.
+    """
+    if not os.path.exists(out_path):
+        return 0, set()
+    with open(out_path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            f.truncate(end)
+    done = 0
+    seen: Set[str] = set()
+    for line in data[:end].splitlines():
+        if not line.strip():
+            continue
+        done += 1
+        if key:
+            try:
+                seen.add(str(json.loads(line).get(key)))
+            except (ValueError, AttributeError):
+                continue
+    return done, seen
+
+
+def _chunked(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Consecutive lists of up to `size` rows."""
+    it = iter(rows)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Results by _input_key for the current CLI run (per process), so an input
+# repeated anywhere in the file is standardized once; oldest evicted first.
+_CLI_RESULTS: "OrderedDict[Tuple[str, str], Dict[str, str]]" = OrderedDict()
+CLI_RESULTS_MAX = 100_000
+
+
+def _standardize_remembered(firsts: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """_standardize_distinct, reusing results of inputs seen earlier in the run."""
+    keys = [_input_key(row) for row in firsts]
+    todo = [i for i, k in enumerate(keys) if k not in _CLI_RESULTS]
+    for i, result in zip(todo, _standardize_distinct([firsts[i] for i in todo])):
+        _CLI_RESULTS[keys[i]] = result
+    results = [_CLI_RESULTS[k] for k in keys]
+    while len(_CLI_RESULTS) > CLI_RESULTS_MAX:
+        _CLI_RESULTS.popitem(last=False)
+    return results
+
+
+def _process_chunk(rows: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Annotate a group of rows; also returns the counter increments of this call."""
+    batches, tokens, metrics = dict(LLM_BATCHES), dict(LLM_TOKENS), METRICS.snapshot()
+    firsts, index = _distinct_rows(rows)
+    for row, result in zip(rows, _fan_out(_standardize_remembered(firsts), index)):
+        _annotate(row, result)
+    return rows, {
+        "batches": {k: LLM_BATCHES[k] - batches[k] for k in LLM_BATCHES},
+        "tokens": {k: LLM_TOKENS[k] - tokens[k] for k in LLM_TOKENS},
+        "metrics": METRICS.diff(metrics),
+    }
+
+
+def _merge_counts(counts: Dict[str, Any]) -> None:
+    """Add a worker's _process_chunk increments to this process's counters."""
+    for k, v in counts["batches"].items():
+        LLM_BATCHES[k] += v
+    for k, v in counts["tokens"].items():
+        LLM_TOKENS[k] += v
+    METRICS.merge(counts["metrics"])
+
+
+def _init_worker(threads: int, batch_size: int, llm: Any = None) -> None:
+    """Pool initializer: per-process thread budget and batch size.
+
+    The model loads lazily in each worker, unless `llm` (a picklable
+    stand-in such as stub_llm.StubLlama) is given. A forked worker must not
+    share the parent's sqlite connection or scheduler, so both are recreated.
+    """
+    global N_THREADS, LLM_BATCH_SIZE, _CACHE, _SCHEDULER, _INIT_LOCK
+    N_THREADS = threads
+    LLM_BATCH_SIZE = batch_size
+    _CACHE = None
+    _SCHEDULER = None  # its thread did not survive the fork
+    _INIT_LOCK = threading.Lock()  # may have been held by a parent thread at fork
+    _CLI_RESULTS.clear()
+    if llm is not None:
+        _install_llm(llm)
+
+
+def _iter_processed(
+    chunks: Iterable[List[Dict[str, Any]]],
+    workers: int,
+    mp_context: Any = None,
+    worker_llm: Any = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Annotated chunks, in input order, from `workers` processes.
+
+    Each worker runs its own model with N_THREADS // workers threads and
+    takes the next chunk when it finishes one, so the workers interleave
+    over the input. Finished chunks wait in their futures until every
+    earlier chunk has been yielded (a reorder buffer of 2 x workers chunks).
+    `mp_context` picks the start method (default: the platform's);
+    `worker_llm` is installed in each worker by _init_worker.
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield _process_chunk(chunk)[0]
+        return
+
+    threads = max(1, N_THREADS // workers)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp_context,
+        initializer=_init_worker,
+        initargs=(threads, LLM_BATCH_SIZE, worker_llm),
+    ) as pool:
+        window: deque = deque()
+
+        def drain(keep: int) -> Iterator[List[Dict[str, Any]]]:
+            while len(window) > keep:
+                rows, counts = window.popleft().result()
+                _merge_counts(counts)
+                yield rows
+
+        for chunk in chunks:
+            window.append(pool.submit(_process_chunk, chunk))
+            yield from drain(2 * workers - 1)
+        yield from drain(0)
 
 
 def _cli_process_file(
@@ -288,33 +1314,97 @@ def _cli_process_file(
     out_path: str | None,
     append: bool,
     to_stdout: bool,
+    workers: int = 1,
+    resume_key: str | None = None,
+    mp_context: Any = None,
+    worker_llm: Any = None,
 ) -> None:
-    """Process a JSON file and write JSONL incrementally."""
-    with open(in_path, "r", encoding="utf-8") as f:
-        rows = _normalize_input(json.load(f))
+    """Process a JSON/JSONL file and write JSONL incrementally, in input order.
+
+    With `append`, rows already in the output are skipped: the first N
+    input rows (N = complete output rows), or, with `resume_key`, the input
+    rows whose key value is already in the output. `mp_context` and
+    `worker_llm` go to _iter_processed.
+    """
+    rows: Iterable[Dict[str, Any]] = _iter_input_rows(in_path)
+    _CLI_RESULTS.clear()
 
     sink = sys.stdout if to_stdout else None
     if not to_stdout:
         out_path = out_path or (in_path + ".jsonl")
+        if append:
+            done, seen = _resume_state(out_path, resume_key)
+            if resume_key:
+                rows = (r for r in rows if str((r or {}).get(resume_key)) not in seen)
+            else:
+                rows = itertools.islice(rows, done, None)
+            if done:
+                print(f"[llm] resuming: {done} rows already in {out_path}", file=sys.stderr)
         mode = "a" if append else "w"
         sink = open(out_path, mode, encoding="utf-8")
 
     assert sink is not None  # for type-checkers
 
+    # Rows per write: several batches' worth, since the rules answer many
+    # rows; with workers, enough to make a pool task worth its overhead.
+    chunk = LLM_BATCH_SIZE * 4 if LLM_BATCH_SIZE > 1 else 1
+    if workers > 1:
+        chunk = max(chunk, 16)
+    chunks = _chunked(rows, chunk)
+    sources: List[str] = []
     try:
-        for row in rows:
-            program_text = (row or {}).get("program") or ""
-            result = _call_llm(program_text)
-            row["llm-generated-program"] = result["standardized_program"]
-            row["llm-generated-university"] = result["standardized_university"]
-
-            json.dump(row, sink, ensure_ascii=False)
-            sink.write("\n")
+        for group in _iter_processed(chunks, workers, mp_context, worker_llm):
+            for row in group:
+                sources.append(row["llm-source"])
+                json.dump(row, sink, ensure_ascii=False)
+                sink.write("\n")
             sink.flush()
     finally:
         if sink is not sys.stdout:
             sink.close()
 
+    # stderr, so --stdout output stays pure JSONL.
+    summary = _source_summary(sources)
+    by = summary["sources"]
+    print(
+        f"[llm] {summary['rows']} rows: rules {by['rules']}, cache {by['cache']}, "
+        f"llm {by['llm']} (cache hit rate {summary['hit_rate']:.1%})",
+        file=sys.stderr,
+    )
+    print(
+        f"[llm] {int(METRICS.value('llm_input_distinct_total'))} distinct inputs "
+        f"standardized for {int(METRICS.value('llm_input_rows_total'))} rows "
+        f"(distinct/total {_metrics_summary()['distinct_ratio']:.1%})",
+        file=sys.stderr,
+    )
+    if LLM_BATCHES["batches"]:
+        print(
+            f"[llm] {LLM_BATCHES['batches']} batches, {LLM_BATCHES['rows']} inputs, "
+            f"{LLM_BATCHES['fallbacks']} re-asked one by one",
+            file=sys.stderr,
+        )
+    _print_metrics_summary()
+
+
+def _print_metrics_summary() -> None:
+    """The /metrics latencies and rates, as a few stderr lines."""
+    m = _metrics_summary()
+    labels = {"prompt_eval": "prompt eval", "generation": "generation",
+              "completion": "completion", "post_normalize": "post-normalize"}
+    if m["row_ms"]:
+        phases = ", ".join(f"{labels[k]} {v:.2f} ms" for k, v in m["row_ms"].items())
+        print(f"[llm] per row: {phases}", file=sys.stderr)
+    if LLM_TOKENS["calls"]:
+        print(
+            f"[llm] tokens/s: prompt eval {m['prompt_tokens_s']:.1f}, "
+            f"generation {m['generated_tokens_s']:.1f}; "
+            f"parse fallbacks {m['parse_fallback_rate']:.1%}",
+            file=sys.stderr,
+        )
+    if m["fuzzy_hit_rate"]:
+        rates = ", ".join(f"{k} {v:.1%}" for k, v in m["fuzzy_hit_rate"].items())
+        print(f"[llm] fuzzy hit rate: {rates}", file=sys.stderr)
+
 
 if __name__ == "__main__":
     import argparse
@@ -324,7 +1414,7 @@ if __name__ == "__main__":
     )
     parser.add_argument(
         "--file",
-        help="Path to JSON input (list of rows or {'rows': [...]})",
+        help="Path to JSON input (list of rows or {'rows': [...]}) or JSONL (one row per line)",
         default=None,
     )
     parser.add_argument(
@@ -341,17 +1431,39 @@ if __name__ == "__main__":
     parser.add_argument(
         "--append",
         action="store_true",
-        help="Append to the output file instead of overwriting.",
+        help="Append to the output file, skipping input rows it already holds.",
+    )
+    parser.add_argument(
+        "--resume-key",
+        default=None,
+        help="With --append, skip input rows whose value of this field is "
+        "already in the output (default: skip as many rows as it holds).",
     )
     parser.add_argument(
         "--stdout",
         action="store_true",
         help="Write JSON Lines to stdout instead of a file.",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Inputs per LLM completion (default: LLM_BATCH_SIZE or 1).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes, each with its own model and N_THREADS/K threads.",
+    )
     args = parser.parse_args()
+    if args.batch_size:
+        LLM_BATCH_SIZE = max(1, args.batch_size)
 
     if args.serve or args.file is None:
         port = int(os.getenv("PORT", "8000"))
+        if WARMUP:
+            _start_warm_up()
         app.run(host="0.0.0.0", port=port, debug=False)
     else:
         _cli_process_file(
@@ -359,4 +1471,6 @@ if __name__ == "__main__":
             out_path=args.out,
             append=bool(args.append),
             to_stdout=bool(args.stdout),
+            workers=max(1, args.workers),
+            resume_key=args.resume_key,
         )
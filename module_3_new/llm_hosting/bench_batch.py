@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""Rows/s and error rate of batched inference, swept over batch size.
+
+Runs app._call_llm_many over synthetic "Program, University" inputs against
+StubLlama (stub_llm.py), with the response cache off. The stub charges
+--token-ms per evaluated token and --call-ms per completion, and answers
+--error-rate of the inputs with a malformed object (with --free-text; under
+the default grammar-constrained decoding such answers are schema-valid).
+"error rate" is the share of inputs that had to be re-asked one by one
+after their batched answer was malformed.
+
+Usage:
+    python bench_batch.py
+    python bench_batch.py --sizes 1 4 16 --rows 400 --error-rate 0.05 --free-text
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import app
+from bench_prefix import make_inputs
+from stub_llm import StubLlama
+
+
+def run(inputs: list, size: int, args: argparse.Namespace) -> dict:
+    """Time one batch size; returns rows/s, error rate and tokens per row."""
+    app.LLM_BATCH_SIZE = size
+    app._install_llm(StubLlama(token_seconds=args.token_ms / 1000.0,
+                               call_seconds=args.call_ms / 1000.0,
+                               error_rate=args.error_rate))
+    for stats in (app.LLM_TOKENS, app.LLM_BATCHES):
+        for k in stats:
+            stats[k] = 0
+
+    t0 = time.perf_counter()
+    app._call_llm_many(inputs)
+    seconds = time.perf_counter() - t0
+    n = len(inputs)
+    return {
+        "rows_s": n / seconds,
+        "errors": app.LLM_BATCHES["fallbacks"] / n,
+        "evaluated": app.LLM_TOKENS["evaluated"] / n,
+        "calls": app.LLM_TOKENS["calls"],
+    }
+
+
+def main() -> None:
+    """CLI entry point."""
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    ap.add_argument("--rows", type=int, default=200)
+    ap.add_argument("--token-ms", type=float, default=0.1,
+                    help="Simulated cost of evaluating one token (ms).")
+    ap.add_argument("--call-ms", type=float, default=5.0,
+                    help="Simulated fixed cost per completion (ms).")
+    ap.add_argument("--error-rate", type=float, default=0.02,
+                    help="Share of inputs the stub answers malformed.")
+    ap.add_argument("--free-text", action="store_true",
+                    help="Disable grammar-constrained decoding.")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    app.CONSTRAINED_DECODING = not args.free_text
+    app.LLM_CACHE_PATH = ""  # measure inference, not the response cache
+    inputs = make_inputs(args.rows, args.seed)
+    print(f"{'batch':>5} {'rows/s':>8} {'error rate':>10} {'evaluated tok/row':>18} {'calls':>6}")
+    for size in args.sizes:
+        r = run(inputs, size, args)
+        print(f"{size:>5} {r['rows_s']:>8.1f} {r['errors']:>10.1%} "
+              f"{r['evaluated']:>18.1f} {r['calls']:>6}")
+
+
+if __name__ == "__main__":
+    main()
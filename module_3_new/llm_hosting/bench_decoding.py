@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""Generated tokens per row with free-text vs grammar-constrained decoding.
+
+Runs app._ask_llm over synthetic "Program, University" inputs against
+StubLlama (stub_llm.py) with `chatter` on: unconstrained, it wraps the JSON
+answer in prose and a code fence, the way TinyLlama often does; given a
+grammar it emits the bare JSON object. The stub charges --token-ms per
+generated token. Reports the average max_tokens budget, the tokens
+actually generated, the share of answers that were not valid JSON, and
+rows/s.
+
+Usage:
+    python bench_decoding.py
+    python bench_decoding.py --rows 500 --token-ms 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, List
+
+import app
+from bench_prefix import make_inputs
+from stub_llm import StubLlama
+
+
+class BudgetStub(StubLlama):
+    """StubLlama that records each call's max_tokens and raw answer."""
+
+    def __init__(self, **kw: Any) -> None:
+        super().__init__(**kw)
+        self.budgets: List[int] = []
+        self.texts: List[str] = []
+
+    def create_chat_completion(self, messages: Any, max_tokens: int = 128, **kw: Any) -> Any:
+        out = super().create_chat_completion(messages, max_tokens=max_tokens, **kw)
+        self.budgets.append(max_tokens)
+        self.texts.append(out["choices"][0]["message"]["content"])
+        return out
+
+
+def run(inputs: list, constrained: bool, token_seconds: float) -> dict:
+    """Time _ask_llm over inputs with or without the answer grammar."""
+    app.CONSTRAINED_DECODING = constrained
+    llm = BudgetStub(token_seconds=token_seconds, chatter=True)
+    app._install_llm(llm)
+    llm.budgets.clear()
+    llm.texts.clear()
+    for k in app.LLM_TOKENS:
+        app.LLM_TOKENS[k] = 0
+
+    t0 = time.perf_counter()
+    for text in inputs:
+        app._ask_llm(text)
+    seconds = time.perf_counter() - t0
+
+    invalid = 0
+    for text in llm.texts:
+        try:
+            json.loads(text)
+        except ValueError:
+            invalid += 1
+    n = len(inputs)
+    return {
+        "budget": sum(llm.budgets) / n,
+        "generated": app.LLM_TOKENS["generated"] / n,
+        "invalid": invalid / n,
+        "rows_s": n / seconds,
+    }
+
+
+def main() -> None:
+    """CLI entry point."""
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=200)
+    ap.add_argument("--token-ms", type=float, default=1.0,
+                    help="Simulated cost of evaluating/generating one token (ms).")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    app.LLM_CACHE_PATH = ""  # measure inference, not the response cache
+    inputs = make_inputs(args.rows, args.seed)
+    print(f"{'decoding':>11} {'max_tokens':>10} {'generated tok/row':>18} "
+          f"{'not JSON':>9} {'rows/s':>7}")
+    for name, constrained in (("free text", False), ("grammar", True)):
+        r = run(inputs, constrained, args.token_ms / 1000.0)
+        print(f"{name:>11} {r['budget']:>10.1f} {r['generated']:>18.1f} "
+              f"{r['invalid']:>9.1%} {r['rows_s']:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""Per-lookup latency of FuzzyIndex vs difflib.get_close_matches.
+
+Grows the canonical university list with synthetic names built from the
+words of canon_universities.txt ("Institute of Northern Valley College"),
+queries it with typo'd members (0-4 random edits), and reports mean
+per-lookup latency for both matchers at app.py's cutoffs. Every answer is
+compared, so any mismatch with difflib is reported too.
+
+Usage:
+    python bench_fuzzy.py                       # sizes 1k, 5k, 10k, 20k
+    python bench_fuzzy.py --sizes 1000 50000 --queries 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import os
+import random
+import time
+from typing import List
+
+from fuzzy import FuzzyIndex
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CUTOFFS = (0.84, 0.86, 0.92)  # program fallback, university fallback, resolver
+
+
+def _typo(s: str, rnd: random.Random) -> str:
+    """Apply 0-4 random single-character edits."""
+    chars = list(s)
+    for _ in range(rnd.randint(0, 4)):
+        i = rnd.randrange(len(chars) + 1)
+        op = rnd.random()
+        if op < 0.3 and chars:
+            del chars[min(i, len(chars) - 1)]
+        elif op < 0.6:
+            chars.insert(i, rnd.choice("abcdefghijklmnopqrstuvwxyz "))
+        elif chars:
+            chars[min(i, len(chars) - 1)] = rnd.choice("abcdefghijklmnopqrstuvwxyz")
+    return "".join(chars)
+
+
+def make_names(size: int, rnd: random.Random) -> List[str]:
+    """Real canonical universities, padded with synthetic look-alikes."""
+    with open(os.path.join(HERE, "canon_universities.txt"), encoding="utf-8") as f:
+        names = [ln.strip() for ln in f if ln.strip()]
+    words = sorted({w for n in names for w in n.split() if len(w) > 3})
+    seen = set(names)
+    while len(names) < size:
+        n = (rnd.choice(["University of ", "", "Institute of "])
+             + " ".join(rnd.sample(words, rnd.randint(1, 3)))
+             + rnd.choice(["", " University", " College"]))
+        if n not in seen:
+            seen.add(n)
+            names.append(n)
+    return names[:size]
+
+
+def main() -> None:
+    """CLI entry point."""
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000, 20000])
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    print(f"{'names':>7} {'cutoff':>6} {'difflib us':>11} {'index us':>9} "
+          f"{'speedup':>8} {'mismatch':>8} {'build s':>8}")
+    for size in args.sizes:
+        rnd = random.Random(args.seed)
+        names = make_names(size, rnd)
+        t0 = time.perf_counter()
+        index = FuzzyIndex(names)
+        build = time.perf_counter() - t0
+        queries = [_typo(rnd.choice(names), rnd) for _ in range(args.queries)]
+        for cutoff in CUTOFFS:
+            t_lin = t_idx = 0.0
+            mismatch = 0
+            for q in queries:
+                t0 = time.perf_counter()
+                hits = difflib.get_close_matches(q, names, n=1, cutoff=cutoff)
+                t1 = time.perf_counter()
+                got = index._best(q, cutoff)  # uncached path
+                t2 = time.perf_counter()
+                t_lin += t1 - t0
+                t_idx += t2 - t1
+                mismatch += (hits[0] if hits else None) != got
+            lin_us = t_lin / len(queries) * 1e6
+            idx_us = t_idx / len(queries) * 1e6
+            print(f"{size:>7} {cutoff:>6} {lin_us:>11.0f} {idx_us:>9.0f} "
+                  f"{lin_us / idx_us:>7.1f}x {mismatch:>8} {build:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""Rows/s of each standardizer stage against the stub model, with a JSON baseline.
+
+Drives the pipeline over sample_data.json and llm_full.jsonl with StubLlama
+(stub_llm.py) in place of llama.cpp: deterministic answers, --token-ms per
+evaluated token and --call-ms per completion. The response cache is off
+and each stage starts from a fresh stub and cold fuzzy memos.
+
+  call_llm        app._call_llm for every row's program text
+  post_normalize  _post_normalize_program / _university over the stored
+                  llm-generated-* answers (the raw fields where there are none)
+  standardize     POST /standardize (Flask test client), --request-rows per request
+  cli             app._cli_process_file into a temporary JSONL file
+  best_match      mean time per _best_match call, per canonical list, over
+                  the lookups the post_normalize stage makes
+
+Each stage runs --repeat times and keeps its best time. --save writes the
+results as JSON; --baseline prints each stage's ratio to a saved run
+(rows/s: higher is better; best_match us: lower is better).
+
+Usage:
+    python bench_pipeline.py
+    python bench_pipeline.py --save bench_pipeline_baseline.json
+    python bench_pipeline.py --baseline bench_pipeline_baseline.json --token-ms 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+import app
+from stub_llm import StubLlama
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FILES = ("sample_data.json", "llm_full.jsonl")
+
+
+def load_rows(name: str) -> List[Dict[str, Any]]:
+    """Rows of one data file (JSON list / {rows} or JSONL)."""
+    return list(app._iter_input_rows(os.path.join(HERE, name)))
+
+
+def _fresh(args: argparse.Namespace) -> None:
+    """New stub model and empty per-run state, so stages do not help each other."""
+    app._install_llm(StubLlama(token_seconds=args.token_ms / 1000.0,
+                               call_seconds=args.call_ms / 1000.0))
+    app._CLI_RESULTS.clear()
+    app.CANON_PROGS_INDEX._memo.clear()
+    app.CANON_UNIS_INDEX._memo.clear()
+
+
+def _best_of(repeat: int, args: argparse.Namespace, fn: Callable[[], None]) -> float:
+    """Fastest of `repeat` timed runs of fn, each after _fresh."""
+    best = float("inf")
+    for _ in range(repeat):
+        _fresh(args)
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _post_normalize(rows: List[Dict[str, Any]]) -> None:
+    for r in rows:
+        app._post_normalize_program(r.get("llm-generated-program") or r.get("program") or "")
+        app._post_normalize_university(
+            r.get("llm-generated-university") or r.get("university") or "")
+
+
+def _standardize(rows: List[Dict[str, Any]], per_request: int) -> None:
+    client = app.app.test_client()
+    for i in range(0, len(rows), per_request):
+        client.post("/standardize", json=[dict(r) for r in rows[i: i + per_request]])
+
+
+def _cli(name: str) -> None:
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stderr(io.StringIO()):
+        app._cli_process_file(os.path.join(HERE, name), os.path.join(tmp, "out.jsonl"),
+                              append=False, to_stdout=False)
+
+
+def _best_match_us(rows: List[Dict[str, Any]], args: argparse.Namespace) -> Dict[str, float]:
+    """Mean microseconds per _best_match call made by the post-normalizers."""
+    spent: Dict[str, List[float]] = {"programs": [], "universities": []}
+    timed = app._best_match
+
+    def best_match(name: str, index: Any, cutoff: float = 0.86, stage: str = "llm") -> Any:
+        t0 = time.perf_counter()
+        out = timed(name, index, cutoff, stage)
+        key = "programs" if index is app.CANON_PROGS_INDEX else "universities"
+        spent[key].append(time.perf_counter() - t0)
+        return out
+
+    _fresh(args)
+    app._best_match = best_match
+    try:
+        _post_normalize(rows)
+    finally:
+        app._best_match = timed
+    return {k: round(sum(v) / len(v) * 1e6, 2) if v else 0.0 for k, v in spent.items()}
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """All stages over all files; returns the JSON-able results."""
+    stages: Dict[str, Dict[str, Any]] = {}
+    best_match: Dict[str, Dict[str, float]] = {}
+    for name in FILES:
+        rows = load_rows(name)
+        n = len(rows)
+        timings = {
+            "call_llm": lambda: [app._call_llm(r.get("program") or "") for r in rows],
+            "post_normalize": lambda: _post_normalize(rows),
+            "standardize": lambda: _standardize(rows, args.request_rows),
+            "cli": lambda: _cli(name),
+        }
+        for stage, fn in timings.items():
+            seconds = _best_of(args.repeat, args, fn)
+            stages[f"{stage}/{name}"] = {
+                "rows": n, "seconds": round(seconds, 4), "rows_s": round(n / seconds, 1)}
+        best_match[name] = _best_match_us(rows, args)
+    return {
+        "config": {
+            "token_ms": args.token_ms, "call_ms": args.call_ms, "batch_size": app.LLM_BATCH_SIZE,
+            "request_rows": args.request_rows, "repeat": args.repeat,
+            "python": platform.python_version(), "machine": platform.machine(),
+        },
+        "stages": stages,
+        "best_match_us": best_match,
+    }
+
+
+def _ratio(now: float, then: float) -> str:
+    return f"{now / then:.2f}x" if then else "-"
+
+
+def report(result: Dict[str, Any], baseline: Dict[str, Any] | None) -> None:
+    """Print results, with ratios to the baseline when one is given."""
+    old = (baseline or {}).get("stages", {})
+    print(f"{'stage':<32} {'rows':>5} {'rows/s':>10} {'vs baseline':>12}")
+    for key, r in result["stages"].items():
+        then = old.get(key, {}).get("rows_s", 0.0)
+        print(f"{key:<32} {r['rows']:>5} {r['rows_s']:>10.1f} "
+              f"{_ratio(r['rows_s'], then) if baseline else '':>12}")
+
+    old_us = (baseline or {}).get("best_match_us", {})
+    print(f"\n{'_best_match':<32} {'list':>12} {'us/call':>8} {'vs baseline':>12}")
+    for name, per_list in result["best_match_us"].items():
+        for lst, us in per_list.items():
+            then = old_us.get(name, {}).get(lst, 0.0)
+            print(f"{name:<32} {lst:>12} {us:>8.2f} "
+                  f"{_ratio(us, then) if baseline else '':>12}")
+
+
+def main() -> None:
+    """CLI entry point."""
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--token-ms", type=float, default=0.02,
+                    help="Simulated cost of evaluating one token (ms).")
+    ap.add_argument("--call-ms", type=float, default=1.0,
+                    help="Simulated fixed cost per completion (ms).")
+    ap.add_argument("--batch-size", type=int, default=1,
+                    help="LLM_BATCH_SIZE for the run.")
+    ap.add_argument("--request-rows", type=int, default=50,
+                    help="Rows per /standardize request.")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--save", default=None, help="Write the results to this JSON file.")
+    ap.add_argument("--baseline", default=None, help="Compare against this saved JSON file.")
+    args = ap.parse_args()
+
+    app.LLM_CACHE_PATH = ""  # measure the pipeline, not the response cache
+    app.LLM_BATCH_SIZE = max(1, args.batch_size)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    result = run(args)
+    report(result, baseline)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+        print(f"\nsaved {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""Prompt tokens evaluated per row, with and without prefix reuse.
+
+Runs app._ask_llm over synthetic "Program, University" inputs against the
+weightless StubLlama (stub_llm.py), which charges --token-ms per evaluated
+token, in three setups:
+
+  cold      no KV reuse at all: the whole prompt (system prompt + few-shots
+            + row) is evaluated for every row
+  prefix    app's snapshot of the warmed prefix (PREFIX_REUSE=1)
+  mixed     same, but another prompt runs between rows (as the warm-up,
+            batch prompts or a second client would), which evicts the
+            prefix from the KV cache unless the snapshot restores it
+
+Usage:
+    python bench_prefix.py
+    python bench_prefix.py --rows 500 --token-ms 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import app
+from stub_llm import StubLlama
+
+
+def make_inputs(rows: int, seed: int) -> list:
+    """Random canonical program/university pairs."""
+    rnd = random.Random(seed)
+    progs = app.CANON_PROGS or ["Computer Science"]
+    unis = app.CANON_UNIS or ["McGill University"]
+    return [f"{rnd.choice(progs)}, {rnd.choice(unis)}" for _ in range(rows)]
+
+
+def run(inputs: list, token_seconds: float, reuse: bool, mixed: bool) -> dict:
+    """Time _ask_llm over inputs; returns per-row token counts and rows/s."""
+    app.PREFIX_REUSE = reuse
+    llm = StubLlama(token_seconds=token_seconds, reuse_prefix=reuse)
+    app._install_llm(llm)
+    for k in app.LLM_TOKENS:
+        app.LLM_TOKENS[k] = 0
+
+    t0 = time.perf_counter()
+    for text in inputs:
+        app._ask_llm(text)
+        if mixed:
+            llm.create_chat_completion(
+                messages=[{"role": "user", "content": "unrelated"}], max_tokens=1
+            )
+    seconds = time.perf_counter() - t0
+    n = len(inputs)
+    return {
+        "prompt": app.LLM_TOKENS["prompt"] / n,
+        "evaluated": app.LLM_TOKENS["evaluated"] / n,
+        "rows_s": n / seconds,
+    }
+
+
+def main() -> None:
+    """CLI entry point."""
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=200)
+    ap.add_argument("--token-ms", type=float, default=0.1,
+                    help="Simulated cost of evaluating one token (ms).")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    app.LLM_CACHE_PATH = ""  # measure inference, not the response cache
+    inputs = make_inputs(args.rows, args.seed)
+    print(f"{'setup':>7} {'prompt tok/row':>15} {'evaluated tok/row':>18} {'rows/s':>8}")
+    for name, reuse, mixed in (("cold", False, False),
+                               ("prefix", True, False),
+                               ("mixed", True, True)):
+        r = run(inputs, args.token_ms / 1000.0, reuse, mixed)
+        print(f"{name:>7} {r['prompt']:>15.1f} {r['evaluated']:>18.1f} {r['rows_s']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""Canonical-list indexes compiled once into a versioned, memory-mapped file.
+
+Building a FuzzyIndex (q-gram counts and postings for every name) is the
+bulk of app.py's import-time work, and every process used to repeat it.
+The build step writes:
+
+    magic "CANONIDX" | u32 version | u32 header length | header JSON | pad |
+    postings: one native u32 array holding every gram's name ids
+
+The header holds the format version, q, the byte order, a blake2b digest
+of each source text file, each list's lines, and each gram's (offset, count)
+in the postings array. At startup the file is mmap'ed read-only. The
+postings stay in the mapping (shared by all processes, including forked
+CLI workers), and the exact-match sets / case-folded dicts are rebuilt
+from the stored lines. The file is rebuilt (atomically) when it is
+missing, from another version, or any source file's digest changed.
+
+Usage (e.g. in an image build; app.py also builds it on demand):
+    python canon_index.py [--out canon_index.bin]
+"""
+
+from __future__ import annotations
+
+import array
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+from fuzzy import FuzzyIndex
+
+MAGIC = b"CANONIDX"
+# Bump when the layout or the meaning of the stored postings changes.
+INDEX_VERSION = 1
+_PREAMBLE = struct.Struct("<8sII")
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOURCES = {
+    "universities": os.path.join(HERE, "canon_universities.txt"),
+    "programs": os.path.join(HERE, "canon_programs.txt"),
+}
+
+
+def read_lines(path: str) -> List[str]:
+    """Read non-empty, stripped lines from a file (UTF-8)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return [ln.strip() for ln in f if ln.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def source_digest(path: str) -> str:
+    """blake2b of a source file's bytes ("" when it does not exist)."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    except FileNotFoundError:
+        return ""
+
+
+def build_index(sources: Dict[str, str], out_path: str, q: int = 2) -> None:
+    """Compile the canonical lists named in `sources` into out_path."""
+    lists: Dict[str, Any] = {}
+    postings = array.array("I")
+    for name, path in sources.items():
+        lines = read_lines(path)
+        index = FuzzyIndex(lines, q=q)
+        grams = []
+        for gram, ids in index.postings.items():
+            grams.append([gram, len(postings), len(ids)])
+            postings.extend(ids)
+        lists[name] = {"lines": lines, "grams": grams}
+
+    header = json.dumps({
+        "version": INDEX_VERSION,
+        "q": q,
+        "byteorder": sys.byteorder,
+        "itemsize": postings.itemsize,
+        "sources": {name: source_digest(path) for name, path in sources.items()},
+        "lists": lists,
+    }, ensure_ascii=False).encode("utf-8")
+    pad = -(_PREAMBLE.size + len(header)) % postings.itemsize
+
+    fd, tmp = tempfile.mkstemp(prefix=".canon_index.", dir=os.path.dirname(out_path) or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_PREAMBLE.pack(MAGIC, INDEX_VERSION, len(header)))
+            f.write(header + b" " * pad)
+            f.write(postings.tobytes())
+        os.chmod(tmp, 0o644)  # mkstemp's 0600 would hide it from other users
+        os.replace(tmp, out_path)  # readers never see a half-written file
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _current_header(mm: mmap.mmap, sources: Dict[str, str]) -> Dict[str, Any] | None:
+    """The file's header if it matches this code and the sources, else None."""
+    if len(mm) < _PREAMBLE.size:
+        return None
+    magic, version, size = _PREAMBLE.unpack_from(mm, 0)
+    if magic != MAGIC or version != INDEX_VERSION:
+        return None
+    try:
+        header = json.loads(mm[_PREAMBLE.size: _PREAMBLE.size + size].decode("utf-8"))
+    except ValueError:
+        return None
+    if (
+        header.get("byteorder") != sys.byteorder
+        or header.get("itemsize") != array.array("I").itemsize
+        or set(header.get("lists", ())) != set(sources)
+        or any(header["sources"].get(n) != source_digest(p) for n, p in sources.items())
+    ):
+        return None
+    return header
+
+
+def load_index(sources: Dict[str, str], path: str) -> Dict[str, FuzzyIndex] | None:
+    """Indexes from the file at `path`, or None if it is missing or stale."""
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):  # missing, or empty (mmap of 0 bytes)
+        return None
+    header = _current_header(mm, sources)
+    if header is None:
+        mm.close()
+        return None
+
+    size = _PREAMBLE.unpack_from(mm, 0)[2]
+    start = _PREAMBLE.size + size
+    start += -start % header["itemsize"]
+    ids = memoryview(mm)[start:].cast("I")
+    out = {}
+    for name, data in header["lists"].items():
+        postings = {gram: ids[off: off + n] for gram, off, n in data["grams"]}
+        out[name] = FuzzyIndex.from_postings(data["lines"], postings, q=header["q"])
+    return out
+
+
+def open_index(sources: Dict[str, str], path: str) -> Dict[str, FuzzyIndex]:
+    """Load the index file, (re)building it first if it is missing or stale.
+
+    With no path, or a location that cannot be written, the indexes are
+    built in memory instead.
+    """
+    if path:
+        got = load_index(sources, path)
+        if got is not None:
+            return got
+        try:
+            build_index(sources, path)
+        except OSError:
+            pass
+        else:
+            got = load_index(sources, path)
+            if got is not None:
+                return got
+    return {name: FuzzyIndex(read_lines(p)) for name, p in sources.items()}
+
+
+def main() -> None:
+    """CLI entry point."""
+    import argparse
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--out", default=os.path.join(HERE, "canon_index.bin"))
+    ap.add_argument("--universities", default=DEFAULT_SOURCES["universities"])
+    ap.add_argument("--programs", default=DEFAULT_SOURCES["programs"])
+    args = ap.parse_args()
+    sources = {"universities": args.universities, "programs": args.programs}
+    build_index(sources, args.out)
+    sizes = {n: len(i) for n, i in (load_index(sources, args.out) or {}).items()}
+    print(f"wrote {args.out} ({os.path.getsize(args.out)} bytes): {sizes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""Indexed drop-in for difflib.get_close_matches(name, candidates, n=1, cutoff).
+
+A q-gram inverted index picks the few candidates that could possibly reach
+the cutoff; only those are scored with difflib's own SequenceMatcher, so the
+answer is identical to the linear scan.
+
+Why the pruning is exact: if ratio(a, b) >= c with M matching characters in
+k blocks and T = len(a) + len(b), then M >= c*T/2, and each block boundary
+leaves at least one unmatched character, so k - 1 <= T - 2M. A block of
+length L holds L - q + 1 shared q-grams, so the two strings share at least
+
+    (2q - 1) * M - (q - 1) * (T + 1)  >=  (2q - 1) * c * T / 2 - (q - 1) * (T + 1)
+
+q-grams. With bigrams (q = 2) this is positive for every cutoff above 2/3,
+which covers all cutoffs used by app.py (0.84 - 0.92). Candidates must also
+pass difflib's length bound (real_quick_ratio). When the bound gives no
+pruning (low cutoffs, very short names) the index falls back to a scan.
+"""
+
+from __future__ import annotations
+
+import difflib
+import math
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Sequence, Set, Tuple
+
+# Slack for float rounding in difflib's 2.0 * M / T >= cutoff comparison.
+_EPS = 1e-9
+
+# Upper bound on memoized lookups per index (cleared when full).
+CACHE_MAX = 50_000
+
+
+def qgrams(s: str, q: int) -> Counter:
+    """Multiset of the q-character substrings of s."""
+    return Counter(s[i:i + q] for i in range(len(s) - q + 1))
+
+
+class FuzzyIndex:
+    """Canonical names with exact-hit hashing and a q-gram inverted index."""
+
+    def __init__(self, candidates: Iterable[str], q: int = 2) -> None:
+        self.q = q
+        self.names: List[str] = list(dict.fromkeys(candidates))  # dedupe, keep order
+        self.exact: Set[str] = set(self.names)
+        self.lengths: List[int] = [len(x) for x in self.names]
+        counts = [qgrams(x, q) for x in self.names]
+        postings: Dict[str, List[int]] = {}
+        for i, grams in enumerate(counts):
+            for g in grams:
+                postings.setdefault(g, []).append(i)
+        # None entries (indexes loaded by from_postings) are filled by _grams().
+        self.grams: List[Counter | None] = list(counts)
+        self.postings: Mapping[str, Sequence[int]] = postings
+        self._memo: Dict[Tuple[str, float], str | None] = {}
+
+    @classmethod
+    def from_postings(
+        cls, candidates: Iterable[str], postings: Mapping[str, Sequence[int]], q: int = 2
+    ) -> "FuzzyIndex":
+        """Index over `candidates` with postings built earlier (see canon_index.py).
+
+        `postings` must come from an index over the same candidates and q.
+        Per-name q-gram counts are then computed on first use only.
+        """
+        self = cls.__new__(cls)
+        self.q = q
+        self.names = list(dict.fromkeys(candidates))
+        self.exact = set(self.names)
+        self.lengths = [len(x) for x in self.names]
+        self.grams = [None] * len(self.names)
+        self.postings = postings
+        self._memo = {}
+        return self
+
+    def _grams(self, i: int) -> Counter:
+        """q-gram counts of name i (computed lazily for loaded indexes)."""
+        grams = self.grams[i]
+        if grams is None:
+            grams = self.grams[i] = qgrams(self.names[i], self.q)
+        return grams
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.exact
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _need(self, total: int, cutoff: float) -> int:
+        """Minimum shared q-grams for a pair of total length `total`."""
+        q = self.q
+        bound = (2 * q - 1) * (cutoff - _EPS) * total / 2 - (q - 1) * (total + 1)
+        return math.ceil(bound)
+
+    def _length_range(self, la: int, cutoff: float) -> Tuple[int, int]:
+        """Candidate lengths allowed by difflib's real_quick_ratio bound."""
+        c = cutoff - _EPS
+        if c <= 0:
+            return 0, 1 << 30
+        lo = math.ceil(la * c / (2 - c))
+        hi = math.floor(la * (2 - c) / c)
+        return lo, hi
+
+    def candidates(self, name: str, cutoff: float) -> List[int]:
+        """Indices of names that could reach `cutoff` (a superset of the hits)."""
+        la = len(name)
+        lo, hi = self._length_range(la, cutoff)
+        need = self._need(la + lo, cutoff)
+        grams = qgrams(name, self.q)
+        n = sum(grams.values())
+        if need <= 0:
+            # Bound too weak to prune: scan, keeping only plausible lengths.
+            return [i for i, lb in enumerate(self.lengths) if lo <= lb <= hi]
+        if need > n:
+            return []
+
+        # Prefix filter: a candidate with >= need shared q-grams must contain
+        # one of the query's (n - need + 1) rarest q-gram occurrences.
+        order = sorted(grams, key=lambda g: len(self.postings.get(g, ())))
+        budget = n - need + 1
+        found: Set[int] = set()
+        for g in order:
+            if budget <= 0:
+                break
+            found.update(self.postings.get(g, ()))
+            budget -= grams[g]
+
+        out = []
+        for i in found:
+            lb = self.lengths[i]
+            if not lo <= lb <= hi:
+                continue
+            need_i = self._need(la + lb, cutoff)
+            if need_i > n:
+                continue
+            theirs = self._grams(i)
+            shared = 0
+            for g, k in grams.items():
+                m = theirs.get(g)
+                if m:
+                    shared += k if k < m else m
+            if shared >= need_i:
+                out.append(i)
+        return out
+
+    def best(self, name: str, cutoff: float = 0.6) -> str | None:
+        """Same result as difflib.get_close_matches(name, names, n=1, cutoff)."""
+        key = (name, cutoff)
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        out = self._best(name, cutoff)
+        if len(self._memo) >= CACHE_MAX:
+            self._memo.clear()
+        self._memo[key] = out
+        return out
+
+    def _best(self, name: str, cutoff: float) -> str | None:
+        """Uncached lookup (see best())."""
+        if not name:
+            hits = difflib.get_close_matches(name, self.names, n=1, cutoff=cutoff)
+            return hits[0] if hits else None
+        if name in self.exact:
+            return name
+        s = difflib.SequenceMatcher()
+        s.set_seq2(name)
+        best: Tuple[float, str] | None = None
+        for i in self.candidates(name, cutoff):
+            x = self.names[i]
+            s.set_seq1(x)
+            if (
+                s.real_quick_ratio() >= cutoff
+                and s.quick_ratio() >= cutoff
+                and s.ratio() >= cutoff
+            ):
+                # get_close_matches keeps the largest (score, name) pair.
+                cand = (s.ratio(), x)
+                if best is None or cand > best:
+                    best = cand
+        return best[1] if best else None
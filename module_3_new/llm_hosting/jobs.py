@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""Background jobs for bulk standardization (POST /jobs in app.py).
+
+Submitted rows wait in a FIFO queue. One daemon thread runs the jobs one at
+a time, in chunks, and is the only caller of the `process` function it was
+given. Clients poll progress and read finished rows while the job runs.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List
+
+Rows = List[Dict[str, Any]]
+
+
+class Job:
+    """One submitted batch of rows and its finished results."""
+
+    def __init__(self, rows: Rows) -> None:
+        self.id = uuid.uuid4().hex
+        self.rows = rows
+        self.results: Rows = []
+        self.status = "queued"  # → running → done | failed
+        self.error: str | None = None
+        self.created = time.time()
+        self.started: float | None = None
+        self.finished: float | None = None
+
+    def progress(self) -> Dict[str, Any]:
+        """Rows done, rows/s since the job started, and the remaining-time estimate."""
+        total = len(self.rows)
+        done = len(self.results)
+        elapsed = ((self.finished or time.time()) - self.started) if self.started else 0.0
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / rate if rate > 0 and self.status == "running" else None
+        return {
+            "id": self.id,
+            "status": self.status,
+            "rows_total": total,
+            "rows_done": done,
+            "rows_per_s": round(rate, 2),
+            "eta_s": round(eta, 1) if eta is not None else None,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """FIFO of jobs served by one worker thread.
+
+    Args:
+        process: Annotates a list of rows and returns them (same order).
+        chunk: Rows per process() call; results appear chunk by chunk. A
+               callable is asked again as each job starts.
+        keep: Finished jobs retained for reading (oldest dropped first).
+    """
+
+    def __init__(self,
+                 process: Callable[[Rows], Rows],
+                 chunk: int | Callable[[], int] = 32,
+                 keep: int = 100) -> None:
+        self.process = process
+        self.chunk = chunk
+        self.keep = keep
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._pending: "queue.Queue[Job]" = queue.Queue()
+        self._cond = threading.Condition()
+        self._worker: threading.Thread | None = None
+
+    def submit(self, rows: Rows) -> Job:
+        """Queue rows as a new job (starting the worker on first use)."""
+        job = Job(rows)
+        with self._cond:
+            self._jobs[job.id] = job
+            self._evict()
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="llm-jobs", daemon=True)
+                self._worker.start()
+        self._pending.put(job)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        """Job by id, or None if unknown or evicted."""
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def iter_results(self, job: Job, start: int = 0, follow: bool = True) -> Iterator[Dict[str, Any]]:
+        """Finished rows from index `start`; with follow, wait for the rest too."""
+        i = start
+        while True:
+            with self._cond:
+                while follow and i >= len(job.results) and job.status in ("queued", "running"):
+                    self._cond.wait()
+                ready = job.results[i:]
+                finished = job.status not in ("queued", "running")
+            yield from ready
+            i += len(ready)
+            if not follow or (finished and i >= len(job.results)):
+                return
+
+    def _evict(self) -> None:
+        """Drop the oldest finished jobs beyond `keep` (caller holds the lock)."""
+        finished = [k for k, j in self._jobs.items() if j.status in ("done", "failed")]
+        for k in finished[: max(0, len(finished) - self.keep)]:
+            del self._jobs[k]
+
+    def _run(self) -> None:
+        while True:
+            job = self._pending.get()
+            with self._cond:
+                job.status = "running"
+                job.started = time.time()
+            try:
+                size = max(1, self.chunk() if callable(self.chunk) else self.chunk)
+                for i in range(0, len(job.rows), size):
+                    out = self.process(job.rows[i:i + size])
+                    with self._cond:
+                        job.results.extend(out)
+                        self._cond.notify_all()
+                status = "done"
+            except Exception as e:  # keep serving later jobs
+                job.error = f"{type(e).__name__}: {e}"
+                status = "failed"
+            with self._cond:
+                job.status = status
+                job.finished = time.time()
+                self._cond.notify_all()
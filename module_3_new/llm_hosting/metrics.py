@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""In-process counters rendered in the Prometheus text format (/metrics).
+
+Standard library only: a counter is a (name, labels) → float entry. Deltas
+can be taken and merged, so counts from CLI worker processes add up in the
+parent.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, str]) -> Key:
+    return name, tuple(sorted(labels.items()))
+
+
+def _fmt(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metrics:
+    """Thread-safe labelled counters."""
+
+    def __init__(self) -> None:
+        self.values: Dict[Key, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """Add value to counter `name` with these labels."""
+        k = _key(name, labels)
+        with self._lock:
+            self.values[k] = self.values.get(k, 0.0) + value
+
+    def value(self, name: str, **labels: str) -> float:
+        """Current value of one labelled counter (0 if never touched)."""
+        with self._lock:
+            return self.values.get(_key(name, labels), 0.0)
+
+    def total(self, name: str) -> float:
+        """Sum of a counter over all its label sets."""
+        with self._lock:
+            return sum(v for (n, _), v in self.values.items() if n == name)
+
+    def snapshot(self) -> Dict[Key, float]:
+        """Copy of all counters."""
+        with self._lock:
+            return dict(self.values)
+
+    def diff(self, before: Dict[Key, float]) -> Dict[Key, float]:
+        """Counter increments since `before` (a snapshot)."""
+        now = self.snapshot()
+        return {k: v - before.get(k, 0.0) for k, v in now.items() if v != before.get(k, 0.0)}
+
+    def merge(self, delta: Dict[Key, float]) -> None:
+        """Add increments taken elsewhere (e.g. in a worker process)."""
+        with self._lock:
+            for k, v in delta.items():
+                self.values[k] = self.values.get(k, 0.0) + v
+
+    def render(self,
+               help_text: Dict[str, str],
+               extra: Iterable[Tuple[str, str, Dict[str, str], float]] = ()) -> str:
+        """
+        Prometheus text exposition of all counters plus `extra` samples.
+
+        Names ending in _total are counters; a <base>_sum / <base>_count pair
+        is a summary. `extra` holds (name, type, labels, value) samples kept
+        outside this registry, e.g. gauges computed at scrape time.
+
+        Args:
+            help_text: Metric family name → HELP line.
+            extra: Additional samples, rendered after the registry's own.
+        """
+        families: Dict[str, Tuple[str, List[str]]] = {}
+        samples = [(n, _kind(n), dict(labels), v) for (n, labels), v in sorted(self.snapshot().items())]
+        for name, kind, labels, v in samples + list(extra):
+            base = name.rsplit("_", 1)[0] if kind == "summary" else name
+            family = families.setdefault(base, (kind, []))
+            family[1].append(f"{name}{_labels(tuple(sorted(labels.items())))} {_fmt(v)}")
+
+        lines: List[str] = []
+        for base, (kind, series) in families.items():
+            if base in help_text:
+                lines.append(f"# HELP {base} {help_text[base]}")
+            lines.append(f"# TYPE {base} {kind}")
+            lines.extend(series)
+        return "\n".join(lines) + "\n"
+
+
+def _kind(name: str) -> str:
+    if name.endswith("_total"):
+        return "counter"
+    if name.endswith(("_sum", "_count")):
+        return "summary"
+    return "untyped"
+
+
+def _labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(
+        f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for k, v in labels
+    )
+    return "{" + inner + "}"
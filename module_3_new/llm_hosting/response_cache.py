@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""Persistent, bounded sqlite cache of LLM standardization answers."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, Tuple
+
+# ---------------- Keys ----------------
+
+
+def normalize_key_text(text: str) -> str:
+    """Collapse whitespace and case-fold, so trivial variants share a key."""
+    return " ".join((text or "").split()).casefold()
+
+
+def fingerprint(*parts: str) -> str:
+    """Short stable digest (used for model + prompt versions)."""
+    h = hashlib.blake2b(digest_size=8)
+    for p in parts:
+        h.update(p.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+# ---------------- Cache ----------------
+
+# Hits whose LRU stamp is written in one statement (also flushed by put/close).
+TOUCH_BATCH = 256
+# Puts between re-reads of the row count, which other processes sharing the
+# file (CLI --workers) also change.
+COUNT_SYNC_EVERY = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+  key         TEXT PRIMARY KEY,
+  program     TEXT NOT NULL,
+  university  TEXT NOT NULL,
+  used        INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS answers_used ON answers (used);
+"""
+
+
+class ResponseCache:
+    """
+    (namespace, normalized input) → (program, university), stored in sqlite.
+
+    The namespace should identify the model file and prompt version, so a
+    model or prompt change never serves stale answers. When the table grows
+    past max_entries, the least recently used tenth is evicted.
+
+    A hit is a plain read: its "used" stamp is queued and written with the
+    next put (or every TOUCH_BATCH hits), not in a transaction of its own.
+    """
+
+    def __init__(self, path: str, namespace: str, max_entries: int = 200_000) -> None:
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+        self._count = self._db.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+        self._puts = 0  # since the last count re-read
+        row = self._db.execute("SELECT MAX(used) FROM answers").fetchone()
+        self._tick = row[0] or 0
+        self._touched: Dict[str, int] = {}  # key → pending "used" stamp
+
+    def key(self, text: str) -> str:
+        """Cache key for an input string under this namespace."""
+        return fingerprint(self.namespace, normalize_key_text(text))
+
+    def get(self, text: str) -> Tuple[str, str] | None:
+        """Cached (program, university) for text, or None on a miss."""
+        k = self.key(text)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT program, university FROM answers WHERE key = ?", (k,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._tick += 1
+            self._touched[k] = self._tick
+            if len(self._touched) >= TOUCH_BATCH:
+                self._flush_touches()
+                self._db.commit()
+        return row[0], row[1]
+
+    def _flush_touches(self) -> None:
+        """Write the queued LRU stamps (caller holds the lock and commits)."""
+        if self._touched:
+            self._db.executemany("UPDATE answers SET used = ? WHERE key = ?",
+                                 [(t, k) for k, t in self._touched.items()])
+            self._touched.clear()
+
+    def put(self, text: str, program: str, university: str) -> None:
+        """Store an answer (replacing any previous one for the same key)."""
+        k = self.key(text)
+        with self._lock:
+            self._flush_touches()  # eviction below must see recent hits
+            self._tick += 1
+            cur = self._db.execute(
+                "INSERT OR IGNORE INTO answers (key, program, university, used) "
+                "VALUES (?, ?, ?, ?)",
+                (k, program, university, self._tick),
+            )
+            if cur.rowcount:
+                self._count += 1
+            else:
+                self._db.execute(
+                    "UPDATE answers SET program = ?, university = ?, used = ? WHERE key = ?",
+                    (program, university, self._tick, k),
+                )
+            self._puts += 1
+            if self._count > self.max_entries or self._puts >= COUNT_SYNC_EVERY:
+                self._count = self._db.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+                self._puts = 0
+            if self._count > self.max_entries:
+                drop = max(1, self.max_entries // 10)
+                cur = self._db.execute(
+                    "DELETE FROM answers WHERE key IN "
+                    "(SELECT key FROM answers ORDER BY used LIMIT ?)",
+                    (self._count - self.max_entries + drop,),
+                )
+                self._count -= cur.rowcount
+            self._db.commit()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def stats(self) -> Dict[str, float]:
+        """Cumulative hits/misses/hit_rate since this process opened the cache."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "entries": self._count,
+        }
+
+    def close(self) -> None:
+        """Write queued LRU stamps and close the sqlite connection."""
+        with self._lock:
+            self._flush_touches()
+            self._db.commit()
+            self._db.close()
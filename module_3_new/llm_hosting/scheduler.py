@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""Micro-batching scheduler: the only thread that talks to the model.
+
+Request threads (Flask handlers, the job worker, the CLI) submit inputs and
+block until their answers are ready. One worker thread takes whatever is
+queued, waits up to `window` seconds for a batch to fill up to `max_batch`,
+runs it, and hands each answer back to every thread that asked for it.
+Identical inputs (after whitespace/case normalization) that are waiting at
+the same time are sent to the model once.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List
+
+from response_cache import normalize_key_text
+
+
+class Scheduler:
+    """Coalesces concurrent inference requests into batches.
+
+    Args:
+        run_batch: Answers a list of distinct inputs (same order).
+        max_batch: Most inputs per run_batch call.
+        window: Seconds to wait for more inputs once the first one arrives.
+    """
+
+    def __init__(self,
+                 run_batch: Callable[[List[str]], List[Any]],
+                 max_batch: int = 1,
+                 window: float = 0.005) -> None:
+        self.run_batch = run_batch
+        self.max_batch = max(1, max_batch)
+        self.window = window
+        self.stats: Dict[str, int] = {"rows": 0, "distinct": 0, "batches": 0}
+        self._cond = threading.Condition()
+        self._queued: Dict[str, "Future[Any]"] = {}  # key → pending answer
+        self._texts: Dict[str, str] = {}  # key → first text submitted for it
+        self._worker: threading.Thread | None = None
+
+    def submit(self, texts: List[str]) -> List[Any]:
+        """Answers for texts (in order), blocking until all are ready."""
+        futures = []
+        with self._cond:
+            for text in texts:
+                key = normalize_key_text(text)
+                fut = self._queued.get(key)
+                if fut is None:
+                    fut = self._queued[key] = Future()
+                    self._texts[key] = text
+                    self.stats["distinct"] += 1
+                futures.append(fut)
+            self.stats["rows"] += len(texts)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="llm-scheduler",
+                                                daemon=True)
+                self._worker.start()
+            self._cond.notify_all()
+        return [f.result() for f in futures]
+
+    def _next_batch(self) -> List[str]:
+        """Wait for inputs, then up to `window` for a full batch; pop it."""
+        with self._cond:
+            while not self._queued:
+                self._cond.wait()
+            deadline = time.monotonic() + self.window
+            while len(self._queued) < self.max_batch:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+                self._cond.wait(left)
+            return list(self._queued)[: self.max_batch]  # oldest first
+
+    def _run(self) -> None:
+        while True:
+            keys = self._next_batch()
+            with self._cond:
+                futures = [self._queued.pop(k) for k in keys]
+                texts = [self._texts.pop(k) for k in keys]
+                self.stats["batches"] += 1
+            try:
+                answers = self.run_batch(texts)
+            except BaseException as e:  # surface in the submitting threads
+                for fut in futures:
+                    fut.set_exception(e)
+                continue
+            for fut, answer in zip(futures, answers):
+                fut.set_result(answer)
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""Weightless stand-in for llama_cpp.Llama, for benchmarks and tests.
+
+Implements the slice of the Llama API that app.py uses:
+create_chat_completion, input_ids / n_tokens, save_state / load_state, and
+perf_ms (llama.cpp's prompt-eval / generation timers, in simulated time).
+Prompts are rendered with a Zephyr-style chat template and tokenized into
+words and punctuation. Like llama-cpp-python, a call only evaluates the
+prompt tokens after the longest prefix shared with the tokens already in
+the (simulated) KV cache; each evaluated token costs `token_seconds`.
+
+The answer is a deterministic "split on the first comma" of the last user
+message ({"program": ...}, or a JSON array for {"programs": [...]}), so
+benchmark output is reproducible. `error_rate` makes that share of answers
+malformed (chosen by a hash of the input, so reruns agree). With `chatter`,
+unconstrained answers come wrapped in prose and a code fence, the way small
+chat models tend to reply; a `grammar` argument suppresses both, and makes
+the malformed answers schema-valid (but wrong) instead.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import time
+from typing import Any, Dict, List, Tuple
+
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+class StubLlama:
+    """Counts evaluated tokens instead of running a model."""
+
+    def __init__(self,
+                 token_seconds: float = 0.0,
+                 reuse_prefix: bool = True,
+                 call_seconds: float = 0.0,
+                 error_rate: float = 0.0,
+                 chatter: bool = False) -> None:
+        self.token_seconds = token_seconds
+        self.reuse_prefix = reuse_prefix
+        self.call_seconds = call_seconds
+        self.error_rate = error_rate
+        self.chatter = chatter
+        self.vocab: Dict[str, int] = {}
+        # Like llama_cpp.Llama: a token buffer whose first n_tokens are in
+        # the KV cache; entries past n_tokens are stale.
+        self.input_ids: List[int] = []
+        self.n_tokens = 0
+        self.calls = 0
+        self.evaluated = 0
+        # Simulated ms spent on prompt tokens / generated tokens.
+        self.prompt_ms = 0.0
+        self.generation_ms = 0.0
+
+    def tokenize(self, text: Any, add_bos: bool = True, special: bool = False) -> List[int]:
+        """Word/punctuation tokens, numbered in order of first appearance."""
+        if isinstance(text, bytes):
+            text = text.decode("utf-8", "ignore")
+        vocab = self.vocab
+        return [vocab.setdefault(t, len(vocab)) for t in TOKEN_RE.findall(text)]
+
+    @staticmethod
+    def render(messages: List[Dict[str, str]]) -> str:
+        """Zephyr-style chat template (TinyLlama chat uses the same layout)."""
+        parts = [f"<|{m['role']}|>\n{m['content']}</s>\n" for m in messages]
+        return "".join(parts) + "<|assistant|>\n"
+
+    def _evaluate(self, tokens: List[int]) -> float:
+        self.evaluated += len(tokens)
+        if self.token_seconds:
+            time.sleep(len(tokens) * self.token_seconds)
+        return len(tokens) * self.token_seconds * 1000.0
+
+    def _malformed(self, text: str) -> bool:
+        if not self.error_rate:
+            return False
+        h = hashlib.blake2b(text.encode("utf-8"), digest_size=4).digest()
+        return int.from_bytes(h, "big") / 2 ** 32 < self.error_rate
+
+    def _item(self, text: Any, constrained: bool) -> Dict[str, str]:
+        text = str(text)
+        if self._malformed(text):
+            if constrained:
+                return {"standardized_program": text, "standardized_university": "Unknown"}
+            return {"program": text}
+        prog, _, uni = text.partition(",")
+        return {
+            "standardized_program": prog.strip().title(),
+            "standardized_university": uni.strip() or "Unknown",
+        }
+
+    def _answer(self, messages: List[Dict[str, str]], constrained: bool) -> str:
+        try:
+            payload = json.loads(messages[-1]["content"])
+        except ValueError:
+            payload = {}
+        if not isinstance(payload, dict):
+            payload = {}
+        if isinstance(payload.get("programs"), list):
+            out = json.dumps([self._item(t, constrained) for t in payload["programs"]])
+        else:
+            out = json.dumps(self._item(payload.get("program", ""), constrained))
+        if self.chatter and not constrained:
+            out = f"Sure! Here is the standardized JSON:\n```json\n{out}\n```\nLet me know if you need anything else."
+        return out
+
+    def create_chat_completion(self,
+                               messages: List[Dict[str, str]],
+                               max_tokens: int = 128,
+                               grammar: Any = None,
+                               **_: Any) -> Dict[str, Any]:
+        """Evaluate the unshared prompt suffix, then "generate" the answer."""
+        self.calls += 1
+        if self.call_seconds:
+            time.sleep(self.call_seconds)
+        prompt = self.tokenize(self.render(messages))
+        keep = 0
+        if self.reuse_prefix:
+            cached = self.input_ids[: self.n_tokens]
+            # Always re-evaluate at least the last prompt token (as llama.cpp).
+            limit = min(len(cached), len(prompt) - 1)
+            while keep < limit and cached[keep] == prompt[keep]:
+                keep += 1
+        self.prompt_ms += self._evaluate(prompt[keep:])
+
+        answer = self._answer(messages, constrained=grammar is not None)
+        pieces = TOKEN_RE.findall(answer)
+        if len(pieces) > max_tokens:
+            pieces = pieces[:max_tokens]
+            answer = " ".join(pieces)  # cut short, like a real truncated reply
+        completion = self.tokenize(" ".join(pieces))
+        self.generation_ms += self._evaluate(completion)
+
+        tokens = prompt + completion
+        self.input_ids[: len(tokens)] = tokens
+        # Without reuse the KV cache is treated as discarded after each call.
+        self.n_tokens = len(tokens) if self.reuse_prefix else 0
+        return {
+            "choices": [{"message": {"role": "assistant", "content": answer}}],
+            "usage": {
+                "prompt_tokens": len(prompt),
+                "completion_tokens": len(completion),
+            },
+        }
+
+    def perf_ms(self) -> Tuple[float, float]:
+        """Cumulative (prompt eval, generation) milliseconds."""
+        return self.prompt_ms, self.generation_ms
+
+    def save_state(self) -> Tuple[Tuple[int, ...], int]:
+        """Snapshot of the token buffer (the real one also copies the KV cache)."""
+        return tuple(self.input_ids), self.n_tokens
+
+    def load_state(self, state: Tuple[Tuple[int, ...], int]) -> None:
+        """Restore a snapshot taken by save_state."""
+        self.input_ids = list(state[0])
+        self.n_tokens = state[1]
+
+    def reset(self) -> None:
+        """Drop the cached tokens."""
+        self.n_tokens = 0
@@ -6,6 +6,9 @@ Expected CSV headers (from module_2_new/clean.py):
   gpa, gre, gre_v, gre_aw, degree,
   llm_generated_program, llm_generated_university
 
+Status / degree / us_or_international are passed through the shared rule
+table in module_2/normalize.py, so rows loaded from either cleaner agree.
+
 Optional:
   Backfill LLM-normalized fields from module_2_new/data/llm_extended.jsonl
   using join key (url|entry_url, date_added).
@@ -17,11 +20,21 @@ import argparse
 import csv
 import datetime as dt
 import json
+import sys
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 import psycopg
 
+# Shared normalization rule table lives with the Module 2 scraper/cleaner.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "module_2"))
+from normalize import norm_degree, norm_nat, norm_status  # noqa: E402
+from numeric import convert_rows  # noqa: E402
+from lineindex import load_index  # noqa: E402
+
+# DB numeric column → CSV column (converted per batch with NumPy).
+NUMERIC_COLUMNS = {"gpa": ("gpa",), "gre": ("gre",), "gre_v": ("gre_v",), "gre_aw": ("gre_aw",)}
+
 
 DDL = """
 CREATE TABLE IF NOT EXISTS applicants (
@@ -69,13 +82,14 @@ def parse_date(s: Optional[str]) -> Optional[dt.date]:
 
 
 def parse_num(s: Optional[str]) -> Optional[float]:
-    """Parse float-like strings; return None on failure/empty."""
+    """Parse float-like strings; return None on failure/empty/NaN."""
     if s in (None, ""):
         return None
     try:
-        return float(str(s).strip())
+        v = float(str(s).strip())
     except Exception:
         return None
+    return None if v != v else v
 
 
 def read_llm_index(
@@ -89,12 +103,9 @@ def read_llm_index(
     if not llm_jsonl or not llm_jsonl.exists():
         return idx
 
-    with llm_jsonl.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            obj = json.loads(line)
+    with load_index(llm_jsonl) as lines:
+        for _, _, raw in lines.iter_lines():
+            obj = json.loads(raw)
             url = obj.get("entry_url") or obj.get("url") or ""
             date_added = obj.get("date_added") or ""
             if not url:
@@ -126,8 +137,14 @@ def _clean_text(s: Optional[str]) -> Optional[str]:
 def map_row(
     rec: dict,
     llm_idx: Dict[Tuple[str, str], Tuple[Optional[str], Optional[str]]],
+    parse_numbers: bool = True,
 ) -> Dict[str, object]:
-    """Map one CSV row into the DB insert dict, backfilling LLM fields if needed."""
+    """Map one CSV row into the DB insert dict, backfilling LLM fields if needed.
+
+    With parse_numbers=False the numeric columns keep their raw CSV strings
+    for map_rows to convert column-wise (``parse_num`` is the reference).
+    """
+    num = parse_num if parse_numbers else (lambda v: v)
     url = _clean_text(rec.get("url"))
     date_added_raw = rec.get("date_added") or ""
 
@@ -137,14 +154,14 @@ def map_row(
         "comments": _clean_text(rec.get("comments")),
         "date_added": parse_date(date_added_raw),
         "url": url,
-        "status": _clean_text(rec.get("status")),
+        "status": norm_status(_clean_text(rec.get("status"))),
         "term": _clean_text(rec.get("term")),
-        "us_or_international": _clean_text(rec.get("us_or_international")),
-        "gpa": parse_num(rec.get("gpa")),
-        "gre": parse_num(rec.get("gre")),
-        "gre_v": parse_num(rec.get("gre_v")),
-        "gre_aw": parse_num(rec.get("gre_aw")),
-        "degree": _clean_text(rec.get("degree")),
+        "us_or_international": norm_nat(_clean_text(rec.get("us_or_international"))),
+        "gpa": num(rec.get("gpa")),
+        "gre": num(rec.get("gre")),
+        "gre_v": num(rec.get("gre_v")),
+        "gre_aw": num(rec.get("gre_aw")),
+        "degree": norm_degree(_clean_text(rec.get("degree"))),
         "program_norm": _clean_text(rec.get("llm_generated_program")),
         "university_norm": _clean_text(rec.get("llm_generated_university")),
     }
@@ -163,6 +180,17 @@ def map_row(
     return out
 
 
+def map_rows(
+    recs: List[dict],
+    llm_idx: Dict[Tuple[str, str], Tuple[Optional[str], Optional[str]]],
+    stats: Optional[Dict[str, int]] = None,
+) -> List[Dict[str, object]]:
+    """Map a batch of CSV rows, converting numeric columns with NumPy."""
+    out = [map_row(rec, llm_idx, parse_numbers=False) for rec in recs]
+    convert_rows(out, NUMERIC_COLUMNS, stats, strip_symbols=False)
+    return out
+
+
 def load_csv_into_db(
     csv_path: Path,
     dsn: str,
@@ -174,26 +202,30 @@ def load_csv_into_db(
     llm_idx = read_llm_index(llm_jsonl) if llm_jsonl else {}
 
     loaded = 0
+    numeric_stats: Dict[str, int] = {}
     with psycopg.connect(dsn, autocommit=False) as conn:
         with conn.cursor() as cur:
             cur.execute(DDL)
             if truncate:
                 cur.execute("TRUNCATE TABLE applicants;")
 
-            batch: List[Dict[str, object]] = []
+            batch: List[dict] = []
             for rec in csv_iter(csv_path):
-                batch.append(map_row(rec, llm_idx))
+                batch.append(rec)
                 if len(batch) >= batch_size:
-                    cur.executemany(INSERT_SQL, batch)
+                    cur.executemany(INSERT_SQL, map_rows(batch, llm_idx, numeric_stats))
                     loaded += len(batch)
                     batch.clear()
 
             if batch:
-                cur.executemany(INSERT_SQL, batch)
+                cur.executemany(INSERT_SQL, map_rows(batch, llm_idx, numeric_stats))
                 loaded += len(batch)
 
         conn.commit()
 
+    bad = {k: v for k, v in numeric_stats.items() if v}
+    if bad:
+        print(f"out-of-range numeric values (kept): {bad}")
     return loaded
 
 
@@ -97,4 +97,24 @@ def soup():
 # New (accepts with or without %):
 @pytest.fixture
 def pct_two_decimals():
-    return re.compile(r"\b\d{1,3}\.\d{2}%?\b")
\ No newline at end of file
+    return re.compile(r"\b\d{1,3}\.\d{2}%?\b")
+
+
+# module_3_new/llm_hosting/app.py, loaded by path ("app" is too common a
+# module name to import bare), with its response cache off.
+LLM_HOSTING = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..",
+                                           "module_3_new", "llm_hosting"))
+
+
+@pytest.fixture
+def llm_app(monkeypatch):
+    import importlib.util
+    monkeypatch.syspath_prepend(LLM_HOSTING)
+    spec = importlib.util.spec_from_file_location("llm_hosting_app",
+                                                  os.path.join(LLM_HOSTING, "app.py"))
+    mod = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, spec.name, mod)  # picklable for worker pools
+    monkeypatch.setenv("CANON_INDEX_PATH", "")  # build in memory, leave the tree alone
+    spec.loader.exec_module(mod)
+    monkeypatch.setattr(mod, "LLM_CACHE_PATH", "")
+    return mod
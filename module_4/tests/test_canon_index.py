@@ -0,0 +1,77 @@
+import os
+import random
+import sys
+
+import pytest
+
+HOSTING = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..",
+                                       "module_3_new", "llm_hosting"))
+sys.path.insert(0, HOSTING)
+import canon_index  # noqa: E402
+from fuzzy import FuzzyIndex  # noqa: E402
+
+
+def _sources(tmp_path):
+    src = {}
+    for name, fname in (("universities", "canon_universities.txt"),
+                        ("programs", "canon_programs.txt")):
+        with open(os.path.join(HOSTING, fname), encoding="utf-8") as f:
+            (tmp_path / fname).write_text(f.read(), encoding="utf-8")
+        src[name] = str(tmp_path / fname)
+    return src
+
+
+@pytest.mark.pipeline
+def test_mapped_index_answers_like_a_fresh_one(tmp_path):
+    src = _sources(tmp_path)
+    path = str(tmp_path / "canon_index.bin")
+    canon_index.build_index(src, path)
+    loaded = canon_index.load_index(src, path)
+    assert loaded is not None
+
+    rnd = random.Random(3)
+    for name, file in src.items():
+        fresh = FuzzyIndex(canon_index.read_lines(file))
+        assert loaded[name].names == fresh.names
+        for _ in range(150):
+            q = rnd.choice(fresh.names)
+            q = "".join(c for c in q if rnd.random() > 0.08)
+            for cutoff in (0.84, 0.86, 0.92):
+                assert loaded[name].best(q, cutoff) == fresh.best(q, cutoff)
+
+
+@pytest.mark.pipeline
+def test_index_is_rebuilt_only_when_a_source_changes(tmp_path):
+    src = _sources(tmp_path)
+    path = str(tmp_path / "canon_index.bin")
+    canon_index.open_index(src, path)
+    built = os.stat(path).st_mtime_ns
+
+    os.utime(src["programs"])  # touched, same bytes
+    canon_index.open_index(src, path)
+    assert os.stat(path).st_mtime_ns == built
+
+    with open(src["programs"], "a", encoding="utf-8") as f:
+        f.write("Zymurgy\n")
+    assert canon_index.load_index(src, path) is None
+    assert "Zymurgy" in canon_index.open_index(src, path)["programs"]
+    assert canon_index.load_index(src, path) is not None
+
+
+@pytest.mark.pipeline
+def test_foreign_or_corrupt_files_are_replaced(tmp_path, monkeypatch):
+    src = _sources(tmp_path)
+    path = tmp_path / "canon_index.bin"
+    path.write_bytes(b"not an index")
+    assert len(canon_index.open_index(src, str(path))["universities"]) > 0
+    assert canon_index.load_index(src, str(path)) is not None
+
+    monkeypatch.setattr(canon_index, "INDEX_VERSION", canon_index.INDEX_VERSION + 1)
+    assert canon_index.load_index(src, str(path)) is None
+
+
+@pytest.mark.pipeline
+def test_unwritable_location_falls_back_to_memory(tmp_path):
+    src = _sources(tmp_path)
+    got = canon_index.open_index(src, str(tmp_path / "missing" / "canon_index.bin"))
+    assert "McGill University" in got["universities"]
@@ -0,0 +1,91 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "module_2")))
+import lineindex  # noqa: E402
+
+
+def _write(path, objs, mode="w"):
+    with open(path, mode, encoding="utf-8") as f:
+        f.write("".join(json.dumps(o, ensure_ascii=False) + "\n" for o in objs))
+
+
+@pytest.mark.pipeline
+def test_index_rows_skip_blank_lines_and_seek(tmp_path):
+    path = tmp_path / "rows.jsonl"
+    path.write_text('\n{"i": 0}\n\n   \n{"i": 1, "s": "é"}\n{"i": 2}', encoding="utf-8")
+    with lineindex.load_index(path) as idx:
+        assert len(idx) == 3
+        assert [idx.record(i)["i"] for i in range(3)] == [0, 1, 2]
+        assert list(idx.iter_records()) == [{"i": 0}, {"i": 1, "s": "é"}, {"i": 2}]
+    # The unterminated last line is not persisted until its newline arrives.
+    stored, indexed, *_ = lineindex._read_index(lineindex.index_path(path))
+    assert len(stored) == 2 and indexed == path.read_bytes().rindex(b"\n") + 1
+
+
+@pytest.mark.pipeline
+def test_index_extends_on_append_and_rebuilds_on_rewrite(tmp_path, monkeypatch):
+    path = tmp_path / "rows.jsonl"
+    _write(path, [{"i": i} for i in range(100)])
+    assert len(lineindex.load_index(path)) == 100
+
+    scanned = []
+    real_scan = lineindex._scan
+    monkeypatch.setattr(lineindex, "_scan",
+                        lambda mm, a, b, offs: scanned.append(a) or real_scan(mm, a, b, offs))
+    size = path.stat().st_size
+    _write(path, [{"i": i} for i in range(100, 150)], mode="a")
+    idx = lineindex.load_index(path)
+    assert scanned == [size] and len(idx) == 150 and idx.record(149) == {"i": 149}
+
+    _write(path, [{"j": j} for j in range(10)])  # rewritten, shorter
+    idx = lineindex.load_index(path)
+    assert scanned[-1] == 0 and len(idx) == 10 and idx.record(9) == {"j": 9}
+
+
+def _move_first_newline(data, a, b):
+    """Same length, but the first two rows become {"i": a} and {"i": b, ...}."""
+    cut = data.index(b"\n", data.index(b"\n") + 1) + 1
+    first = json.dumps({"i": a}).encode() + b"\n"
+    second = json.dumps({"i": b, "pad": ""}).encode()
+    second = second[:-2] + b"y" * (cut - len(first) - len(second) - 1) + b'"}\n'
+    return first + second + data[cut:]
+
+
+@pytest.mark.pipeline
+def test_index_rebuilds_when_edits_miss_the_tail_window(tmp_path):
+    path = tmp_path / "rows.jsonl"
+    _write(path, [{"i": i, "pad": "x" * 20} for i in range(1000)])
+    assert len(lineindex.load_index(path)) == 1000
+
+    # Same size, same last 4 KiB: only the mtime tells the head changed.
+    st = path.stat()
+    path.write_bytes(_move_first_newline(path.read_bytes(), 7, 8))
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    with lineindex.load_index(path) as idx:
+        assert [idx.record(k)["i"] for k in (0, 1)] == [7, 8]
+
+    # A replacement file (new inode) that keeps the size, tail and mtime.
+    st = path.stat()
+    other = tmp_path / "other.jsonl"
+    _write(other, [{"i": i, "pad": "x" * 20} for i in range(1000)])
+    other.write_bytes(_move_first_newline(other.read_bytes(), 5, 6))
+    os.utime(other, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(other, path)
+    with lineindex.load_index(path) as idx:
+        assert [idx.record(k)["i"] for k in (0, 1)] == [5, 6]
+
+
+@pytest.mark.pipeline
+def test_split_covers_file_with_balanced_rows(tmp_path):
+    path = tmp_path / "rows.jsonl"
+    _write(path, [{"i": i, "pad": "x" * (i % 37)} for i in range(1000)])
+    with lineindex.load_index(path) as idx:
+        ranges = idx.split(4)
+        assert ranges[0][0] == 0 and ranges[-1][1] == path.stat().st_size
+        assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+        data = path.read_bytes()
+        assert [data[a:b].count(b"\n") for a, b in ranges] == [250, 250, 250, 250]
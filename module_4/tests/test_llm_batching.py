@@ -0,0 +1,71 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..",
+                                                "module_3_new", "llm_hosting")))
+from stub_llm import StubLlama  # noqa: E402
+
+INPUTS = [
+    "Computer Science, McGill University",
+    "Mathematics, UBC",
+    "Physics, University of Toronto",
+    "Information, McG",
+    "History, Stanford University",
+]
+
+
+@pytest.mark.pipeline
+def test_batched_answers_match_single_row_answers(llm_app, monkeypatch):
+    llm_app._install_llm(StubLlama())
+    single = llm_app._call_llm_many(INPUTS)
+
+    monkeypatch.setattr(llm_app, "LLM_BATCH_SIZE", 4)
+    llm = llm_app._install_llm(StubLlama())
+    calls = llm.calls
+    assert llm_app._call_llm_many(INPUTS) == single
+    assert llm.calls - calls == 2  # 4 + 1 inputs
+    assert llm_app.LLM_BATCHES == {"batches": 1, "rows": 4, "fallbacks": 0}
+
+
+@pytest.mark.pipeline
+def test_malformed_batch_entries_are_asked_alone(llm_app, monkeypatch):
+    monkeypatch.setattr(llm_app, "CONSTRAINED_DECODING", False)  # grammar forbids these
+    monkeypatch.setattr(llm_app, "LLM_BATCH_SIZE", 5)
+    llm = llm_app._install_llm(StubLlama(error_rate=0.4))
+    bad = sum(llm._malformed(t) for t in INPUTS)
+    assert 0 < bad < len(INPUTS)
+
+    results = llm_app._call_llm_many(INPUTS)
+    assert len(results) == len(INPUTS)
+    assert llm_app.LLM_BATCHES["fallbacks"] == bad
+
+
+class ShortArrayLlama(StubLlama):
+    def _answer(self, messages, constrained):
+        out = json.loads(super()._answer(messages, constrained))
+        return json.dumps(out[:-1] if isinstance(out, list) else out)
+
+
+@pytest.mark.pipeline
+def test_unalignable_batch_falls_back_for_every_row(llm_app, monkeypatch):
+    monkeypatch.setattr(llm_app, "CONSTRAINED_DECODING", False)
+    monkeypatch.setattr(llm_app, "LLM_BATCH_SIZE", 3)
+    llm_app._install_llm(ShortArrayLlama())
+    results = llm_app._call_llm_many(INPUTS[:3])
+    assert [r["standardized_program"] for r in results] == [
+        "Computer Science", "Mathematics", "Physics"]
+    assert llm_app.LLM_BATCHES["fallbacks"] == 3
+
+
+@pytest.mark.pipeline
+def test_standardize_rows_keeps_order_with_rules_and_batches(llm_app, monkeypatch):
+    monkeypatch.setattr(llm_app, "LLM_BATCH_SIZE", 8)
+    llm_app._install_llm(StubLlama())
+    rows = [{"program": t} for t in INPUTS] + [{"program": "zzqx, qqzz"}]
+    results = llm_app._standardize_rows(rows)
+    assert len(results) == len(rows)
+    assert {r["source"] for r in results} <= {"rules", "llm"}
+    assert results[-1]["source"] == "llm"
@@ -0,0 +1,64 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..",
+                                                "module_3_new", "llm_hosting")))
+from stub_llm import StubLlama  # noqa: E402
+
+ROWS = [{"id": i, "program": f"Program {i}, University {i % 7}"} for i in range(40)]
+
+
+def _read(path):
+    return [json.loads(x) for x in path.read_text(encoding="utf-8").splitlines()]
+
+
+@pytest.mark.pipeline
+def test_reads_json_array_rows_object_and_jsonl(llm_app, tmp_path):
+    as_list = tmp_path / "a.json"
+    as_list.write_text(json.dumps(ROWS, indent=2), encoding="utf-8")
+    as_obj = tmp_path / "b.json"
+    as_obj.write_text(json.dumps({"rows": ROWS}), encoding="utf-8")
+    as_lines = tmp_path / "c.jsonl"
+    as_lines.write_text("".join(json.dumps(r) + "\n\n" for r in ROWS) + "{bad\n",
+                        encoding="utf-8")
+    for path in (as_list, as_obj, as_lines):
+        assert list(llm_app._iter_input_rows(str(path))) == ROWS
+
+
+@pytest.mark.pipeline
+def test_append_resumes_after_torn_last_line(llm_app, tmp_path):
+    llm_app._install_llm(StubLlama())
+    src = tmp_path / "in.jsonl"
+    src.write_text("".join(json.dumps(r) + "\n" for r in ROWS), encoding="utf-8")
+    full = tmp_path / "full.jsonl"
+    llm_app._cli_process_file(str(src), str(full), append=False, to_stdout=False)
+
+    # A run that died after 25 rows, mid-way through writing row 26.
+    lines = full.read_text(encoding="utf-8").splitlines(keepends=True)
+    part = tmp_path / "part.jsonl"
+    part.write_text("".join(lines[:25]) + lines[25][:10], encoding="utf-8")
+
+    llm = llm_app._LLM
+    calls = llm.calls
+    llm_app._cli_process_file(str(src), str(part), append=True, to_stdout=False)
+    assert _read(part) == _read(full)
+    assert llm.calls - calls == 15
+
+
+@pytest.mark.pipeline
+def test_append_by_key_skips_rows_already_written(llm_app, tmp_path):
+    llm_app._install_llm(StubLlama())
+    src = tmp_path / "in.jsonl"
+    src.write_text("".join(json.dumps(r) + "\n" for r in ROWS), encoding="utf-8")
+    out = tmp_path / "out.jsonl"
+    out.write_text("".join(json.dumps(dict(r, done=True)) + "\n" for r in ROWS[::2]),
+                   encoding="utf-8")
+
+    llm_app._cli_process_file(str(src), str(out), append=True, to_stdout=False,
+                              resume_key="id")
+    got = _read(out)
+    assert sorted(r["id"] for r in got) == list(range(40))
+    assert [r["id"] for r in got if "llm-source" in r] == list(range(1, 40, 2))
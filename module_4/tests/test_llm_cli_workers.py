@@ -0,0 +1,56 @@
+import json
+import multiprocessing
+import os
+import sys
+
+import pytest
+
+LLM_HOSTING = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..",
+                                           "module_3_new", "llm_hosting"))
+sys.path.insert(0, LLM_HOSTING)
+from stub_llm import StubLlama  # noqa: E402
+
+
+def _rows(n):
+    progs = ["Computer Science", "Mathematics", "Qzxv Studies", "Physics", "Lorem Ipsum"]
+    unis = ["McGill University", "UBC", "Unknown Place", "University of Toronto"]
+    return [{"id": i, "program": f"{progs[i % 5]}, {unis[i % 4]}"} for i in range(n)]
+
+
+@pytest.fixture
+def named_app(monkeypatch):
+    """app.py imported as "app", so spawned workers can import it by name too.
+
+    Spawned workers re-import the module and read its settings from the
+    environment, so the response cache is turned off there as well.
+    """
+    import importlib.util
+    monkeypatch.syspath_prepend(LLM_HOSTING)
+    monkeypatch.setenv("CANON_INDEX_PATH", "")
+    monkeypatch.setenv("LLM_CACHE_PATH", "")
+    spec = importlib.util.spec_from_file_location("app", os.path.join(LLM_HOSTING, "app.py"))
+    mod = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, spec.name, mod)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.mark.pipeline
+@pytest.mark.parametrize("method", [m for m in ("spawn", "fork")
+                                    if m in multiprocessing.get_all_start_methods()])
+def test_workers_write_rows_in_input_order(named_app, tmp_path, method):
+    ctx = multiprocessing.get_context(method)
+    named_app._install_llm(StubLlama())
+    src = tmp_path / "in.json"
+    src.write_text(json.dumps(_rows(101)), encoding="utf-8")
+
+    outs = {}
+    for workers in (1, 3):
+        out = tmp_path / f"out{workers}.jsonl"
+        named_app._cli_process_file(str(src), str(out), append=False, to_stdout=False,
+                                    workers=workers, mp_context=ctx, worker_llm=StubLlama())
+        outs[workers] = [json.loads(x) for x in out.read_text(encoding="utf-8").splitlines()]
+
+    assert [r["id"] for r in outs[3]] == list(range(101))
+    assert outs[3] == outs[1]
+    assert {r["llm-source"] for r in outs[3]} == {"rules", "llm"}
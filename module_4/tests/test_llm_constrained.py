@@ -0,0 +1,53 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..",
+                                                "module_3_new", "llm_hosting")))
+from stub_llm import StubLlama  # noqa: E402
+
+
+class RecordingLlama(StubLlama):
+    def __init__(self, **kw):
+        super().__init__(**kw)
+        self.kwargs = []
+
+    def create_chat_completion(self, messages, **kw):
+        self.kwargs.append(kw)
+        return super().create_chat_completion(messages, **kw)
+
+
+@pytest.mark.pipeline
+def test_grammar_fixes_keys_and_array_length(llm_app):
+    single = llm_app._grammar(0)
+    assert "root ::= item" in single
+    assert '"\\"standardized_university\\""' in single
+    triple = llm_app._grammar(3)
+    assert triple.count("ws item") == 3
+
+
+@pytest.mark.pipeline
+def test_constrained_calls_pass_grammar_and_tight_budget(llm_app, monkeypatch):
+    monkeypatch.setattr(llm_app, "LLM_BATCH_SIZE", 2)
+    llm = llm_app._install_llm(RecordingLlama(chatter=True))
+    del llm.kwargs[:]
+
+    assert llm_app._ask_llm("Info Studies, McG") == ("Info Studies", "McG")
+    kw = llm.kwargs[-1]
+    assert kw["grammar"] == llm_app._grammar(0)
+    assert kw["stop"] == ["</s>"]
+    assert kw["max_tokens"] < 64
+
+    got = llm_app._ask_llm_batch(["Physics, MIT", "History, Yale"])
+    assert got == [("Physics", "MIT"), ("History", "Yale")]
+    assert llm.kwargs[-1]["grammar"] == llm_app._grammar(2)
+
+
+@pytest.mark.pipeline
+def test_unconstrained_mode_keeps_free_text_budget(llm_app, monkeypatch):
+    monkeypatch.setattr(llm_app, "CONSTRAINED_DECODING", False)
+    llm = llm_app._install_llm(RecordingLlama(chatter=True))
+    assert llm_app._ask_llm("Physics, MIT") == ("Physics", "MIT")  # JSON found in chatter
+    assert llm.kwargs[-1]["max_tokens"] == 128
+    assert "grammar" not in llm.kwargs[-1]
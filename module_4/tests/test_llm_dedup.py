@@ -0,0 +1,70 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..",
+                                                "module_3_new", "llm_hosting")))
+from stub_llm import StubLlama  # noqa: E402
+
+ROWS = [
+    {"id": 0, "program": "zzqx, qqzz"},
+    {"id": 1, "program": "Computer Science, McGill University"},
+    {"id": 2, "program": "  ZZQX,   qqzz "},
+    {"id": 3, "program": "zzqx, qqzz"},
+    {"id": 4, "program": "Mathematics", "university": "McGill University"},
+    {"id": 5, "program": "Mathematics", "university": "UBC"},
+]
+
+
+@pytest.mark.pipeline
+def test_standardize_runs_once_per_distinct_input(llm_app):
+    llm = llm_app._install_llm(StubLlama())
+    calls = llm.calls
+    resp = llm_app.app.test_client().post("/standardize", json=ROWS)
+    body = resp.get_json()
+
+    assert [r["id"] for r in body["rows"]] == list(range(6))
+    assert body["inputs"] == {"rows": 6, "distinct": 4, "distinct_ratio": 0.6667}
+    # Rows 0, 2 and 3 normalize alike; a lone program keeps its own university.
+    assert llm.calls - calls == 1
+    dup = [r["llm-generated-program"] for r in body["rows"] if r["id"] in (0, 2, 3)]
+    assert dup == [dup[0]] * 3
+    assert [r["llm-generated-university"] for r in body["rows"][4:]] == [
+        "McGill University", "University of British Columbia"]
+
+
+@pytest.mark.pipeline
+def test_fanned_out_results_are_separate_dicts(llm_app):
+    llm_app._install_llm(StubLlama())
+    results = llm_app._standardize_rows([ROWS[0], ROWS[3]])
+    assert results[0] == results[1] and results[0] is not results[1]
+
+
+@pytest.mark.pipeline
+def test_cli_standardizes_repeats_across_chunks_once(llm_app, tmp_path, capsys):
+    llm = llm_app._install_llm(StubLlama())
+    src = tmp_path / "in.jsonl"
+    src.write_text("".join(json.dumps(r) + "\n" for r in ROWS * 3), encoding="utf-8")
+    calls = llm.calls
+    llm_app._cli_process_file(str(src), str(tmp_path / "out.jsonl"), append=False,
+                              to_stdout=False)
+
+    out = [json.loads(x) for x in (tmp_path / "out.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [r["id"] for r in out] == list(range(6)) * 3
+    assert llm.calls - calls == 1
+    assert "[llm] 4 distinct inputs standardized for 18 rows" in capsys.readouterr().err
+
+
+@pytest.mark.pipeline
+def test_llm_path_sees_the_university_hint_the_rules_use(llm_app):
+    llm_app._install_llm(StubLlama())
+    row = {"program": "zzqx", "university": "McGill University"}
+    assert llm_app._resolve_rules(row["program"], row["university"]) is None
+
+    batched = llm_app._standardize_rows([row])[0]
+    single = llm_app._standardize(row["program"], row["university"])
+    assert batched["source"] == "llm"
+    assert batched["standardized_university"] == "McGill University"
+    assert single["standardized_university"] == batched["standardized_university"]
@@ -0,0 +1,51 @@
+import difflib
+import os
+import random
+import sys
+
+import pytest
+
+HOSTING = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..",
+                                       "module_3_new", "llm_hosting"))
+sys.path.insert(0, HOSTING)
+from fuzzy import FuzzyIndex  # noqa: E402
+
+
+def _canon(name):
+    with open(os.path.join(HOSTING, name), encoding="utf-8") as f:
+        return [ln.strip() for ln in f if ln.strip()]
+
+
+def _typo(s, rnd):
+    chars = list(s)
+    for _ in range(rnd.randint(0, 4)):
+        i = rnd.randrange(len(chars) + 1)
+        if rnd.random() < 0.5 and chars:
+            del chars[min(i, len(chars) - 1)]
+        else:
+            chars.insert(i, rnd.choice("abcdefghijklmnopqrstuvwxyz "))
+    return "".join(chars)
+
+
+@pytest.mark.pipeline
+@pytest.mark.parametrize("canon", ["canon_programs.txt", "canon_universities.txt"])
+def test_index_matches_difflib(canon):
+    names = _canon(canon)
+    index = FuzzyIndex(names)
+    rnd = random.Random(3)
+    queries = [_typo(rnd.choice(names), rnd) for _ in range(120)]
+    queries += ["", "a", "MIT", "Of", "University", "Computer Science PhD"]
+    for cutoff in (0.6, 0.84, 0.86, 0.92):
+        for q in queries:
+            hits = difflib.get_close_matches(q, names, n=1, cutoff=cutoff)
+            assert index.best(q, cutoff) == (hits[0] if hits else None), (q, cutoff)
+
+
+@pytest.mark.pipeline
+def test_ties_and_exact_hits_follow_difflib():
+    names = ["abcd", "abce", "abcf", "zzzz"]
+    index = FuzzyIndex(names)
+    assert "abce" in index and "abcx" not in index
+    assert index.best("abce", 0.5) == "abce"
+    # Equal ratios: get_close_matches keeps the lexicographically largest.
+    assert index.best("abcx", 0.7) == difflib.get_close_matches("abcx", names, n=1, cutoff=0.7)[0]
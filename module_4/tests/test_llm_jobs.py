@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..",
+                                                "module_3_new", "llm_hosting")))
+from jobs import JobQueue  # noqa: E402
+from stub_llm import StubLlama  # noqa: E402
+
+ROWS = [{"id": i, "program": f"Program {i}, University {i % 3}"} for i in range(50)]
+
+
+def _wait(client, job_id):
+    for _ in range(500):
+        body = client.get(f"/jobs/{job_id}").get_json()
+        if body["status"] in ("done", "failed"):
+            return body
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+@pytest.mark.pipeline
+def test_job_runs_in_background_and_streams_ndjson(llm_app):
+    llm_app._install_llm(StubLlama())
+    client = llm_app.app.test_client()
+
+    resp = client.post("/jobs", json={"rows": ROWS})
+    assert resp.status_code == 202
+    job_id = resp.get_json()["id"]
+
+    body = _wait(client, job_id)
+    assert body["status"] == "done"
+    assert body["rows_done"] == body["rows_total"] == 50
+
+    lines = client.get(f"/jobs/{job_id}/results").get_data(as_text=True).splitlines()
+    out = [json.loads(x) for x in lines]
+    assert [r["id"] for r in out] == list(range(50))
+    assert all("llm-generated-program" in r for r in out)
+
+    tail = client.get(f"/jobs/{job_id}/results?offset=45&follow=0").get_data(as_text=True)
+    assert [json.loads(x)["id"] for x in tail.splitlines()] == list(range(45, 50))
+
+
+@pytest.mark.pipeline
+def test_job_accepts_ndjson_and_unknown_ids_404(llm_app):
+    llm_app._install_llm(StubLlama())
+    client = llm_app.app.test_client()
+    data = "".join(json.dumps(r) + "\n" for r in ROWS[:5])
+    resp = client.post("/jobs", data=data, content_type="application/x-ndjson")
+    assert _wait(client, resp.get_json()["id"])["rows_done"] == 5
+    assert client.get("/jobs/nope").status_code == 404
+    assert client.get("/jobs/nope/results").status_code == 404
+
+
+@pytest.mark.pipeline
+@pytest.mark.parametrize("bad", ["{not json", "[1, 2]"])
+def test_bad_ndjson_line_is_rejected_with_its_number(llm_app, bad):
+    client = llm_app.app.test_client()
+    data = json.dumps(ROWS[0]) + "\n\n" + bad + "\n" + json.dumps(ROWS[1]) + "\n"
+    resp = client.post("/jobs", data=data, content_type="application/x-ndjson")
+    assert resp.status_code == 400
+    assert resp.get_json()["error"].startswith("bad NDJSON, line 3: ")
+    assert not llm_app._JOBS._jobs  # nothing queued
+
+
+@pytest.mark.pipeline
+def test_failed_chunk_marks_job_failed_and_queue_keeps_going():
+    def process(rows):
+        if any(r.get("boom") for r in rows):
+            raise ValueError("bad row")
+        return rows
+
+    q = JobQueue(process, chunk=2, keep=1)
+    bad = q.submit([{"boom": True}])
+    good = q.submit([{"x": 1}, {"x": 2}, {"x": 3}])
+    assert list(q.iter_results(good)) == [{"x": 1}, {"x": 2}, {"x": 3}]
+    assert bad.status == "failed" and "bad row" in bad.error
+    assert good.progress()["rows_done"] == 3
+
+
+@pytest.mark.pipeline
+def test_job_chunk_size_follows_batch_size_set_after_import(llm_app, monkeypatch):
+    llm_app._install_llm(StubLlama())
+    sizes = []
+    process = llm_app._JOBS.process
+
+    def spy(rows):
+        sizes.append(len(rows))
+        return process(rows)
+
+    monkeypatch.setattr(llm_app._JOBS, "process", spy)
+    monkeypatch.setattr(llm_app, "LLM_BATCH_SIZE", 8)
+    client = llm_app.app.test_client()
+    resp = client.post("/jobs", json=[dict(r) for r in ROWS])
+    assert _wait(client, resp.get_json()["id"])["rows_done"] == 50
+    assert sizes == [32, 18]
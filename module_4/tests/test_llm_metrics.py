@@ -0,0 +1,90 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..",
+                                                "module_3_new", "llm_hosting")))
+from stub_llm import StubLlama  # noqa: E402
+
+ROWS = [
+    {"program": "Computer Science, McGill University"},
+    {"program": "Mathematics, UBC"},
+    {"program": "zzqx, qqzz"},
+    {"program": "Phys, uoft"},
+]
+
+
+class ProseLlama(StubLlama):
+    """Answers every single-row prompt with text that is not JSON."""
+
+    def _answer(self, messages, constrained):
+        return "I am not sure."
+
+
+def _samples(text):
+    out = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            out[name] = float(value)
+    return out
+
+
+@pytest.mark.pipeline
+def test_metrics_endpoint_reports_phases_sources_and_fuzzy(llm_app):
+    llm = llm_app._install_llm(StubLlama(token_seconds=0.0001))
+    warm = llm.perf_ms()  # prefix warm-up, not counted
+    client = llm_app.app.test_client()
+    client.post("/standardize", json=ROWS)
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    text = resp.get_data(as_text=True)
+    assert "# TYPE llm_row_seconds summary" in text
+    s = _samples(text)
+    assert s['llm_rows_total{source="rules"}'] == 2
+    assert s['llm_rows_total{source="llm"}'] == 2
+    for phase in ("completion", "prompt_eval", "generation", "post_normalize"):
+        assert s[f'llm_row_seconds_count{{phase="{phase}"}}'] == 2
+    # The split comes from the model's own prompt-eval / generation timers.
+    assert s['llm_row_seconds_sum{phase="prompt_eval"}'] == pytest.approx(
+        (llm.prompt_ms - warm[0]) / 1000.0)
+    assert s['llm_row_seconds_sum{phase="generation"}'] == pytest.approx(
+        (llm.generation_ms - warm[1]) / 1000.0)
+    assert s['llm_fuzzy_lookups_total{list="programs",stage="rules"}'] >= 2
+    assert s['llm_tokens_total{kind="generated"}'] == llm_app.LLM_TOKENS["generated"]
+    assert s['llm_tokens_per_second{phase="generation"}'] > 0
+
+
+@pytest.mark.pipeline
+def test_parse_fallbacks_and_batch_log_line(llm_app, monkeypatch, capsys):
+    monkeypatch.setattr(llm_app, "CONSTRAINED_DECODING", False)
+    monkeypatch.setattr(llm_app, "METRICS_LOG", True)
+    llm_app._install_llm(ProseLlama())
+    llm_app._call_llm_many(["zzqx, qqzz", "qqzz, zzqx"])
+
+    summary = llm_app._metrics_summary()
+    assert summary["parse_fallback_rate"] == 1.0
+    lines = [json.loads(x) for x in capsys.readouterr().err.splitlines()]
+    assert [r["parse_fallbacks"] for r in lines] == [1, 1]
+    assert all(r["rows"] == 1 and r["completions"] == 1 for r in lines)
+
+
+@pytest.mark.pipeline
+def test_worker_counts_merge_and_cli_prints_summary(llm_app, tmp_path, capsys):
+    llm_app._install_llm(StubLlama())
+    rows, counts = llm_app._process_chunk([dict(r) for r in ROWS])
+    before = llm_app.METRICS.snapshot()
+    llm_app._merge_counts(counts)
+    assert llm_app.METRICS.value("llm_rows_total", source="llm") == 2 * before[
+        ("llm_rows_total", (("source", "llm"),))]
+
+    src = tmp_path / "in.json"
+    src.write_text(json.dumps(ROWS), encoding="utf-8")
+    llm_app._cli_process_file(str(src), None, append=False, to_stdout=False)
+    err = capsys.readouterr().err
+    assert "[llm] per row: completion" in err
+    assert "[llm] fuzzy hit rate: " in err
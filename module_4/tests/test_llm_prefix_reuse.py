@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..",
+                                                "module_3_new", "llm_hosting")))
+from stub_llm import StubLlama  # noqa: E402
+
+
+@pytest.mark.pipeline
+def test_prefix_is_evaluated_once_then_only_row_suffix(llm_app):
+    llm_app._install_llm(StubLlama())
+    prefix_tokens, _ = llm_app._PREFIXES["row"]
+    assert len(prefix_tokens) > 200
+
+    for text in ("Computer Science, McGill University", "Mathematics, UBC"):
+        before = dict(llm_app.LLM_TOKENS)
+        assert llm_app._ask_llm(text)[0]
+        prompt = llm_app.LLM_TOKENS["prompt"] - before["prompt"]
+        evaluated = llm_app.LLM_TOKENS["evaluated"] - before["evaluated"]
+        assert prompt > len(prefix_tokens)
+        assert evaluated < 30
+
+
+@pytest.mark.pipeline
+def test_prefix_state_restored_after_other_prompt(llm_app):
+    llm = llm_app._install_llm(StubLlama())
+    llm.create_chat_completion(messages=[{"role": "user", "content": "other"}])
+    start = llm.evaluated
+    llm_app._ask_llm("Physics, McGill University")
+    assert llm.evaluated - start < 40
+
+
+@pytest.mark.pipeline
+def test_prefix_reuse_disabled(llm_app, monkeypatch):
+    monkeypatch.setattr(llm_app, "PREFIX_REUSE", False)
+    llm_app._install_llm(StubLlama(reuse_prefix=False))
+    assert not llm_app._PREFIXES
+    llm_app._ask_llm("Physics, McGill University")
+    assert llm_app.LLM_TOKENS["evaluated"] == llm_app.LLM_TOKENS["prompt"] > 200
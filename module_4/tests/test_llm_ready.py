@@ -0,0 +1,92 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..",
+                                                "module_3_new", "llm_hosting")))
+from stub_llm import StubLlama  # noqa: E402
+
+
+class FileLlama(StubLlama):
+    """Stub with llama_cpp.Llama's constructor signature."""
+
+    def __init__(self, model_path, **kwargs):
+        super().__init__()
+        self.model_path = model_path
+        self.kwargs = kwargs
+        self.metadata = {"general.name": "tiny", "general.architecture": "llama"}
+
+
+def _no_hub(**_):
+    raise AssertionError("hub called")
+
+
+@pytest.mark.pipeline
+def test_model_path_loads_offline_and_ready_reports_it(llm_app, monkeypatch, tmp_path):
+    gguf = tmp_path / "tiny.gguf"
+    gguf.write_bytes(b"GGUF" + b"\0" * 60)
+    monkeypatch.setattr(llm_app, "MODEL_PATH", str(gguf))
+    monkeypatch.setattr(llm_app, "Llama", FileLlama)
+    monkeypatch.setattr(llm_app, "hf_hub_download", _no_hub)
+    client = llm_app.app.test_client()
+
+    assert client.get("/").status_code == 200
+    resp = client.get("/ready")
+    assert resp.status_code == 503 and resp.get_json()["ready"] is False
+
+    llm_app._start_warm_up().join(timeout=10)
+    resp = client.get("/ready")
+    body = resp.get_json()
+    assert resp.status_code == 200 and body["ready"] is True
+    assert body["source"] == "local" and body["model"] == "tiny.gguf"
+    assert body["size_bytes"] == 64
+    assert body["gguf"] == {"general.name": "tiny", "general.architecture": "llama"}
+    assert body["load_seconds"] >= 0 and body["warmup_seconds"] >= 0
+    assert llm_app._LLM.model_path == str(gguf)
+    assert llm_app._LLM.kwargs["use_mmap"] is True
+
+
+@pytest.mark.pipeline
+def test_failed_load_keeps_ready_503_with_error(llm_app, monkeypatch):
+    monkeypatch.setattr(llm_app, "MODEL_PATH", "")
+    monkeypatch.setattr(llm_app, "Llama", FileLlama)
+    monkeypatch.setattr(llm_app, "hf_hub_download", None)
+    llm_app._warm_up()
+    resp = llm_app.app.test_client().get("/ready")
+    assert resp.status_code == 503
+    assert "MODEL_PATH" in resp.get_json()["error"]
+
+
+@pytest.mark.pipeline
+def test_without_warm_up_first_request_loads_model_and_makes_ready(llm_app, monkeypatch, tmp_path):
+    gguf = tmp_path / "tiny.gguf"
+    gguf.write_bytes(b"GGUF" + b"\0" * 60)
+    monkeypatch.setattr(llm_app, "WARMUP", False)
+    monkeypatch.setattr(llm_app, "MODEL_PATH", str(gguf))
+    monkeypatch.setattr(llm_app, "Llama", FileLlama)
+    client = llm_app.app.test_client()
+
+    assert client.get("/ready").status_code == 503
+    resp = client.post("/standardize", json=[{"program": "zzqx, qqzz"}])
+    assert resp.get_json()["rows"][0]["llm-source"] == "llm"
+    resp = client.get("/ready")
+    assert resp.status_code == 200 and resp.get_json()["load_seconds"] >= 0
+
+
+class BrokenLlama(FileLlama):
+    def create_chat_completion(self, messages, **kw):
+        if "Information Studies" in messages[-1]["content"]:  # the warm-up input
+            raise RuntimeError("warm-up blew up")
+        return super().create_chat_completion(messages, **kw)
+
+
+@pytest.mark.pipeline
+def test_failed_warm_up_still_ready_once_model_loaded(llm_app, monkeypatch, tmp_path):
+    gguf = tmp_path / "tiny.gguf"
+    gguf.write_bytes(b"GGUF" + b"\0" * 60)
+    monkeypatch.setattr(llm_app, "MODEL_PATH", str(gguf))
+    monkeypatch.setattr(llm_app, "Llama", BrokenLlama)
+    llm_app._start_warm_up().join(timeout=10)
+    body = llm_app.app.test_client().get("/ready").get_json()
+    assert body["ready"] is True and "warm-up blew up" in body["error"]
@@ -0,0 +1,82 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..",
+                                                "module_3_new", "llm_hosting")))
+import response_cache  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+
+
+@pytest.mark.pipeline
+def test_cache_keys_ignore_case_and_whitespace_and_persist(tmp_path):
+    path = str(tmp_path / "c.sqlite3")
+    cache = ResponseCache(path, namespace="m1|p1")
+    assert cache.get("Computer Science, MIT") is None
+    cache.put("Computer Science, MIT", "Computer Science", "MIT")
+    assert cache.get("  computer   science,  mit ") == ("Computer Science", "MIT")
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1}
+    cache.close()
+
+    again = ResponseCache(path, namespace="m1|p1")
+    assert again.get("COMPUTER SCIENCE, MIT") == ("Computer Science", "MIT")
+    other_prompt = ResponseCache(path, namespace="m1|p2")
+    assert other_prompt.get("Computer Science, MIT") is None
+
+
+@pytest.mark.pipeline
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path / "c.sqlite3"), namespace="ns", max_entries=10)
+    for i in range(10):
+        cache.put(f"p{i}", f"P{i}", "U")
+    cache.get("p0")  # refresh the oldest entry
+    cache.put("p10", "P10", "U")
+    assert len(cache) == 9
+    assert cache.get("p0") == ("P0", "U")
+    assert cache.get("p1") is None and cache.get("p2") is None
+    assert cache.get("p10") == ("P10", "U")
+
+
+@pytest.mark.pipeline
+def test_prompt_version_changes_with_decoding_mode(llm_app, monkeypatch):
+    constrained = llm_app.PROMPT_VERSION
+    monkeypatch.setenv("CONSTRAINED_DECODING", "0")
+    llm_app.__spec__.loader.exec_module(llm_app)  # re-read the env at import
+    assert llm_app.PROMPT_VERSION != constrained
+
+
+@pytest.mark.pipeline
+def test_hits_are_reads_and_touches_are_flushed_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(response_cache, "TOUCH_BATCH", 3)
+    cache = ResponseCache(str(tmp_path / "c.sqlite3"), namespace="ns")
+    for k in "abc":
+        cache.put(k, k.upper(), "U")
+    writes = cache._db.total_changes
+    cache.get("a"), cache.get("b"), cache.get("a")
+    assert cache._db.total_changes == writes
+    cache.get("c")  # third distinct key flushes the queued stamps
+    assert cache._db.total_changes == writes + 3
+
+
+@pytest.mark.pipeline
+def test_eviction_counts_rows_other_processes_added(tmp_path, monkeypatch):
+    monkeypatch.setattr(response_cache, "COUNT_SYNC_EVERY", 1)
+    path = str(tmp_path / "c.sqlite3")
+    one = ResponseCache(path, namespace="ns", max_entries=10)
+    two = ResponseCache(path, namespace="ns", max_entries=10)
+    for i in range(6):
+        one.put(f"one{i}", "P", "U")
+        two.put(f"two{i}", "P", "U")
+    assert two._db.execute("SELECT COUNT(*) FROM answers").fetchone()[0] <= 10
+
+
+@pytest.mark.pipeline
+def test_model_key_changes_when_the_file_is_replaced(llm_app, tmp_path, monkeypatch):
+    gguf = tmp_path / "model.gguf"
+    gguf.write_bytes(b"GGUF" + b"\0" * 16)
+    monkeypatch.setattr(llm_app, "MODEL_PATH", str(gguf))
+    first = llm_app._model_key()
+    assert first.startswith("model.gguf:")
+    gguf.write_bytes(b"GGUF" + b"\1" * 32)  # re-quantized in place
+    assert llm_app._model_key() != first
@@ -0,0 +1,97 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..",
+                                                "module_3_new", "llm_hosting")))
+from scheduler import Scheduler  # noqa: E402
+from stub_llm import StubLlama  # noqa: E402
+
+
+class ExclusiveLlama(StubLlama):
+    """Fails if two threads are inside the model at once."""
+
+    def __init__(self, **kw):
+        super().__init__(**kw)
+        self._busy = threading.Lock()
+
+    def create_chat_completion(self, messages, **kw):
+        if not self._busy.acquire(blocking=False):
+            raise AssertionError("concurrent model call")
+        try:
+            return super().create_chat_completion(messages, **kw)
+        finally:
+            self._busy.release()
+
+
+@pytest.mark.pipeline
+def test_concurrent_requests_share_batches_safely(llm_app, monkeypatch):
+    # A batch larger than all rows: the window gathers every request.
+    monkeypatch.setattr(llm_app, "LLM_BATCH_SIZE", 32)
+    monkeypatch.setattr(llm_app, "BATCH_WINDOW_MS", 50.0)
+    llm_app._install_llm(ExclusiveLlama(token_seconds=1e-5))
+    client = llm_app.app.test_client()
+
+    results, errors = {}, []
+
+    def post(k):
+        rows = [{"program": f"Program {i}, Place {i}"} for i in range(k, k + 4)]
+        try:
+            body = client.post("/standardize", json=rows).get_json()
+            results[k] = [r["llm-generated-program"] for r in body["rows"]]
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=post, args=(k,)) for k in range(0, 12, 2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    for k, progs in results.items():
+        assert progs == [f"Program {i}" for i in range(k, k + 4)]
+    stats = llm_app._get_scheduler().stats
+    assert stats["rows"] == 24
+    assert stats["distinct"] < stats["rows"]  # overlapping requests were merged
+    assert stats["batches"] < 24
+
+
+@pytest.mark.pipeline
+def test_scheduler_dedupes_and_reports_errors_to_callers():
+    seen = []
+
+    def run(texts):
+        seen.append(list(texts))
+        if "boom" in texts:
+            raise ValueError("boom")
+        return [t.upper() for t in texts]
+
+    s = Scheduler(run, max_batch=4, window=0.0)
+    assert s.submit(["a", "A ", "b", "a"]) == ["A", "A", "B", "A"]
+    assert seen == [["a", "b"]]
+    with pytest.raises(ValueError):
+        s.submit(["boom"])
+    assert s.submit(["c"]) == ["C"]
+
+
+@pytest.mark.pipeline
+def test_first_callers_racing_get_one_scheduler(llm_app, monkeypatch):
+    real = llm_app.Scheduler
+
+    def slow_scheduler(*args, **kw):
+        time.sleep(0.05)  # widen the window between the check and the assignment
+        return real(*args, **kw)
+
+    monkeypatch.setattr(llm_app, "Scheduler", slow_scheduler)
+    got = []
+    threads = [threading.Thread(target=lambda: got.append(llm_app._get_scheduler()))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(got) == 8 and all(s is got[0] for s in got)
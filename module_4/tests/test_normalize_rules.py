@@ -0,0 +1,46 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "module_2")))
+from normalize import normalize_column, norm_degree, norm_nat, norm_status, norm_term  # noqa: E402
+
+
+@pytest.mark.pipeline
+@pytest.mark.parametrize("raw,expected", [
+    ("Accepted", "Accepted"),
+    ("accepted via e-mail", "Accepted"),
+    ("Offer", "Accepted"),
+    ("Rejected", "Rejected"),
+    ("wait listed", "Waitlisted"),
+    ("Interview", "Interview"),
+    ("Total Comments Open Options See More Report", "Total Comments Open Options See More Report"),
+    ("", None),
+    (None, None),
+])
+def test_status_rules(raw, expected):
+    assert norm_status(raw) == expected
+
+
+@pytest.mark.pipeline
+def test_degree_nat_term_rules():
+    assert norm_degree("Ph.D.") == "PhD"
+    assert norm_degree("MSc") == "Masters"
+    assert norm_degree("PsyD") == "PsyD"
+    assert norm_nat("International") == "International"
+    assert norm_nat("US Citizen") == "American"
+    assert norm_nat("domestic") == "American"
+    # Unknown labels are kept (Title Cased), as the scraper always did.
+    assert norm_nat("canadian citizen") == "Canadian Citizen"
+    assert norm_nat("  ") is None
+    assert norm_term("spr") == "Spring"
+    assert norm_term("Fall") == "Fall"
+
+
+@pytest.mark.pipeline
+def test_bulk_column_matches_scalar_and_rejects_unknown_field():
+    raw = ["Accepted", "rejected", "Accepted", None, "waitlisted"] * 3
+    assert normalize_column("status", raw) == [norm_status(v) for v in raw]
+    with pytest.raises(ValueError):
+        normalize_column("nope", raw)
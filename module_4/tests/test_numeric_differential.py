@@ -0,0 +1,67 @@
+import importlib.util
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.join(ROOT, "module_2"))
+from clean import to_float  # noqa: E402
+from numeric import RANGES, convert_rows, out_of_range, to_float_array  # noqa: E402
+
+
+def _load(name, *parts):
+    """Import a module by path (module_2_new/clean.py shares clean's name)."""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, *parts))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _num():
+    return _load("module_2_new_clean", "module_2_new", "clean.py")._num
+
+
+def _parse_num():
+    pytest.importorskip("psycopg")
+    return _load("module_3_new_load_data", "module_3_new", "load_data.py").parse_num
+
+
+SAMPLES = [
+    None, "", " ", "NA", "N/A", "None", "null", "Null", "3.5", " 3.87 ", "4",
+    "1,200", "$3.2", "abc", "3.5/4", "nan", "NaN", "inf", "-inf", "-1", "1e2",
+    3, 3.25, 0, float("nan"), float("inf"), "165", "4.0 GPA", ",", "$",
+]
+
+
+@pytest.mark.pipeline
+@pytest.mark.parametrize("strip,ref", [(True, lambda: to_float), (False, _num),
+                                       (False, _parse_num)])
+def test_batch_matches_scalar_reference(strip, ref):
+    ref = ref()
+    rnd = random.Random(7)
+    values = SAMPLES + [rnd.choice(SAMPLES) for _ in range(500)]
+    assert len(to_float_array(values, strip_symbols=strip)) == len(values)
+    rows = [{"v": v} for v in values]
+    convert_rows(rows, {"out": ("v",)}, strip_symbols=strip)
+    for v, r in zip(values, rows):
+        want = ref(v)
+        # Exact: None stays None (never NaN), floats compare by value and type.
+        assert r["out"] == want and type(r["out"]) is type(want), (v, r["out"], want)
+
+
+@pytest.mark.pipeline
+def test_convert_rows_in_place_and_counts_out_of_range():
+    rows = [
+        {"gpa": "3.9", "gre_total": "330", "gre": None},
+        {"gpa": "7.5", "gre_total": None, "gre": "1500"},
+        {"gpa": "N/A", "gre_total": "", "gre": ""},
+    ]
+    stats = {}
+    convert_rows(rows, {"gpa": ("gpa",), "gre": ("gre_total", "gre")}, stats)
+    assert [r["gpa"] for r in rows] == [3.9, 7.5, None]
+    assert [r["gre"] for r in rows] == [330.0, 1500.0, None]
+    assert stats == {"gpa_out_of_range": 1, "gre_out_of_range": 1}
+    lo, hi = RANGES["gre_aw"]
+    assert out_of_range("gre_aw", to_float_array([str(lo), str(hi), "6.5"])) == 1
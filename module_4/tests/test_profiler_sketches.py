@@ -0,0 +1,63 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "module_2")))
+from profiler import HyperLogLog, Profiler, SpaceSaving  # noqa: E402
+
+
+@pytest.mark.pipeline
+def test_hll_estimate_within_a_few_percent():
+    hll = HyperLogLog()
+    for i in range(20000):
+        hll.add(f"value-{i}")
+        hll.add(f"value-{i}")  # duplicates do not move the estimate
+    assert abs(hll.count() - 20000) / 20000 < 0.05
+
+
+@pytest.mark.pipeline
+def test_space_saving_keeps_heavy_hitters():
+    ss = SpaceSaving(capacity=8)
+    for i in range(2000):
+        ss.add("Accepted" if i % 2 else f"junk-{i}")
+    assert ss.top(1)[0][0] == "Accepted"
+    assert len(ss.counts) == 8
+
+
+@pytest.mark.pipeline
+def test_profiler_counts_nulls_and_failures():
+    prof = Profiler(top_k=3)
+    for raw in ["3.5", None, "abc", "", "3.5"]:
+        prof.apply("gpa", lambda v: float(v) if v and v[0].isdigit() else None, raw)
+    rep = prof.report()["fields"]["gpa"]
+    assert rep["count"] == 5 and rep["nulls"] == 2
+    assert rep["parse_failures"] == 1
+    assert rep["top"][0] == ["3.5", 2]
+
+
+@pytest.mark.pipeline
+def test_live_cleaner_profiles_in_the_same_pass():
+    root = os.path.join(os.path.dirname(__file__), "..", "..")
+    spec = importlib.util.spec_from_file_location(
+        "module_2_new_clean", os.path.join(root, "module_2_new", "clean.py"))
+    clean = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(clean)
+
+    raws = [
+        {"program": "CS", "status": "Wait listed", "term": "Fall", "gpa": "3.9", "degree": "PhD"},
+        {"program": "CS", "status": "Maybe", "term": None, "gpa": "abc", "degree": "Masters"},
+        {"program": None, "status": "Accepted on 1 Mar", "term": "fa", "gpa": None},
+    ]
+    prof = Profiler()
+    store = clean.to_column_store(raws, prof=prof)
+    assert store.column("status") == ["Waitlisted", "Maybe", "Accepted"]
+
+    rep = prof.report()
+    assert rep["rows"] == 3
+    fields = rep["fields"]
+    assert fields["status"]["parse_failures"] == 1  # "Maybe" is not a label
+    assert fields["gpa"]["parse_failures"] == 1 and fields["gpa"]["nulls"] == 1
+    assert fields["term"]["nulls"] == 1 and fields["program"]["top"][0] == ["CS", 2]
+    assert set(fields) >= {"url", "date_added", "degree", "us_or_international", "gre_aw"}
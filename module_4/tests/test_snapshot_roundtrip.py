@@ -0,0 +1,57 @@
+import math
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "module_2")))
+from snapshot import encode_column, load_snapshot, write_snapshot  # noqa: E402
+
+
+@pytest.mark.pipeline
+def test_encode_column_shares_codes():
+    codes, table = encode_column(["Accepted", None, "Rejected", "Accepted", ""])
+    assert table == ["Accepted", "Rejected"]
+    assert codes.tolist() == [0, -1, 1, 0, -1]
+
+
+@pytest.mark.pipeline
+def test_snapshot_roundtrip(tmp_path):
+    rows = [
+        {"p_id": 1, "gpa": 3.9, "gre": None, "gre_v": 160.0, "gre_aw": 4.5,
+         "date_added": "2025-01-31", "status": "Accepted", "degree": "PhD",
+         "term": "Fall 2025", "us_or_international": None, "program": "CS",
+         "llm_generated_program": "Computer Science",
+         "llm_generated_university": "Johns Hopkins University"},
+        {"p_id": 2, "gpa": None, "gre": 320.0, "gre_v": None, "gre_aw": None,
+         "date_added": None, "status": "Accepted", "degree": "Masters",
+         "term": None, "us_or_international": "International", "program": "CS",
+         "llm_generated_program": "Computer Science",
+         "llm_generated_university": None},
+    ]
+    out = write_snapshot(rows, tmp_path / "cleaned.snapshot", extra_int=("p_id",))
+    snap = load_snapshot(out)
+    assert len(snap) == 2
+    assert snap["p_id"].tolist() == [1, 2]
+    assert snap["gpa"][0] == 3.9 and math.isnan(snap["gpa"][1])
+    assert str(snap["date_added"][0]) == "2025-01-31"
+    assert snap.decode("status") == ["Accepted", "Accepted"]
+    assert snap.decode("us_or_international") == [None, "International"]
+    assert snap.categorical("llm_generated_program")[1] == ["Computer Science"]
+    with pytest.raises(KeyError):
+        snap["comments"]
+
+
+@pytest.mark.pipeline
+def test_raw_date_text_parses_or_stays_text(tmp_path):
+    rows = [{"date_added": "Added on March 31, 2024"}, {"date_added": None},
+            {"date_added": "2025-01-31"}]
+    snap = load_snapshot(write_snapshot(rows, tmp_path / "a.snapshot", numeric=(),
+                                        categorical=()))
+    assert [str(d) for d in snap["date_added"]] == ["2024-03-31", "NaT", "2025-01-31"]
+
+    rows.append({"date_added": "last Tuesday"})
+    snap = load_snapshot(write_snapshot(rows, tmp_path / "b.snapshot", numeric=(),
+                                        categorical=()))
+    assert snap.manifest["dates"] == [] and snap.manifest["categorical"] == ["date_added"]
+    assert snap.decode("date_added") == [r["date_added"] for r in rows]
@@ -0,0 +1,204 @@
+import importlib.util
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "module_2")))
+import validate  # noqa: E402
+
+
+def _rows(n):
+    rows = []
+    for i in range(n):
+        r = {k: None for k in validate.REQUIRED}
+        r["program"] = f"Program {i} «ü»"
+        if i % 7 == 0:
+            del r["gpa"]
+        if i % 11 == 0:
+            r["comments"] = "<b>bold</b>"
+        rows.append(r)
+    return rows
+
+
+@pytest.mark.pipeline
+def test_json_array_reader_matches_json_load(tmp_path, monkeypatch):
+    monkeypatch.setattr(validate, "READ_CHUNK", 64)  # force many refills
+    path = tmp_path / "rows.json"
+    rows = _rows(50) + [1, "x", [2, 3]]
+    path.write_text(json.dumps(rows, ensure_ascii=False, indent=2), encoding="utf-8")
+    got = [obj for _, _, obj in validate.iter_json_array(str(path))]
+    assert got == rows
+
+
+@pytest.mark.pipeline
+@pytest.mark.parametrize("bad", ['{"program": "X" "gpa": 1}',     # caught in the buffer
+                                 '{"program": "X, "gpa": 1}',     # string runs on
+                                 '{"program": "X", "gpa": 1'])    # no closing brace
+def test_corrupt_array_element_is_counted_and_skipped(tmp_path, monkeypatch, bad):
+    monkeypatch.setattr(validate, "READ_CHUNK", 256)
+    rows = _rows(2000)
+    lines = [json.dumps(r, ensure_ascii=False) for r in rows]
+    head = "[\n" + ",\n".join(lines[:1000]) + ",\n"
+    cut = len(head)
+    path = tmp_path / "rows.json"
+    path.write_text(head + bad + ",\n" + ",\n".join(lines[1000:]) + "\n]\n",
+                    encoding="utf-8")
+
+    got = list(validate.iter_json_array(str(path)))
+    assert len(got) == 2001 and isinstance(got[1000][2], ValueError)
+    assert got[1000][1] == cut
+    assert [obj for _, _, obj in got[:1000] + got[1001:]] == rows
+
+    rep = validate.check(str(path), specs=None)
+    assert rep["rows"] == 2001
+    assert rep["violations"]["invalid_json"]["count"] == 1
+    assert rep["violations"]["invalid_json"]["samples"] == [{"row": 1000, "offset": cut}]
+
+
+@pytest.mark.pipeline
+def test_corrupt_last_element_and_truncated_array(tmp_path, capsys):
+    path = tmp_path / "rows.json"
+    path.write_text('[{"program": "A"}, {"program": "B" "x"}]\n', encoding="utf-8")
+    got = [obj for _, _, obj in validate.iter_json_array(str(path))]
+    assert got[0] == {"program": "A"} and isinstance(got[1], ValueError)
+
+    path.write_text('[{"program": "A"}, {"program": "B"', encoding="utf-8")
+    assert validate.check(str(path)) is None
+    assert "truncated JSON array" in capsys.readouterr().out
+
+
+@pytest.mark.pipeline
+def test_check_counts_every_row_with_offsets(tmp_path):
+    rows = _rows(3000)
+    path = tmp_path / "rows.jsonl"
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows) + "not json\n",
+                    encoding="utf-8")
+    rep = validate.check(str(path))
+    assert rep["rows"] == 3001
+    v = rep["violations"]
+    assert v["missing:gpa"]["count"] == len(range(0, 3000, 7))
+    assert v["html:comments"]["count"] == len(range(0, 3000, 11))
+    assert v["invalid_json"]["samples"] == [{"row": 3000, "offset": path.stat().st_size - 9}]
+    assert v["missing:gpa"]["samples"][1]["row"] == 7
+    with open(path, "rb") as f:
+        f.seek(v["missing:gpa"]["samples"][1]["offset"])
+        assert "gpa" not in json.loads(f.readline())
+
+
+@pytest.mark.pipeline
+@pytest.mark.parametrize("parts", [2, 3, 7])
+def test_split_and_merge_match_single_pass(tmp_path, parts):
+    rows = _rows(500)
+    path = tmp_path / "rows.jsonl"
+    path.write_text("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows)
+                    + "\nnot json\n", encoding="utf-8")
+    shards = validate.split_jsonl(str(path), parts)
+    assert shards[0][0] == 0 and shards[-1][1] == path.stat().st_size
+    assert all(a[1] == b[0] for a, b in zip(shards, shards[1:]))
+
+    merged = validate.ValidationStats()
+    for a, b in shards:
+        merged.merge(validate._validate_shard(str(path), a, b), row_base=merged.rows)
+    single = validate.ValidationStats()
+    for row, offset, rec in validate.iter_jsonl(str(path)):
+        single.observe(row, offset, rec)
+    assert merged.report() == single.report()
+    assert merged.report()["key_presence"]["gpa"] == 500 - len(range(0, 500, 7))
+
+
+@pytest.mark.pipeline
+def test_check_with_workers_matches_sequential(tmp_path, capsys):
+    path = tmp_path / "rows.jsonl"
+    path.write_text("".join(json.dumps(r) + "\n" for r in _rows(400)), encoding="utf-8")
+    par, seq = validate.check(str(path), workers=3), validate.check(str(path))
+    assert par.pop("rule_seconds").keys() == seq.pop("rule_seconds").keys()
+    assert par == seq
+
+
+@pytest.mark.pipeline
+def test_default_rules_flag_bad_values(tmp_path):
+    good = {k: None for k in validate.REQUIRED}
+    good.update(program="Computer Science", university="MIT", status="Accepted",
+                degree="PhD", gpa="3.9", gre_total="325", date_added="Jan 31, 2025",
+                entry_url="https://www.thegradcafe.com/result/1")
+    bad = dict(good, program=" N/A ", status="Maybe", gpa="7.2", gre_total="abc",
+               date_added="yesterday", entry_url="http://example.com/x")
+    path = tmp_path / "rows.jsonl"
+    path.write_text(json.dumps(good) + "\n" + json.dumps(bad) + "\n", encoding="utf-8")
+    rep = validate.check(str(path))
+    flagged = {k for k, v in rep["violations"].items() if v["samples"][0]["row"] == 1}
+    assert flagged == {"junk:program", "vocab:status", "range:gpa", "range:gre_total",
+                       "date:date_added", "pattern:entry_url"}
+    assert all(v["count"] == 1 for v in rep["violations"].values())
+    assert set(rep["rule_seconds"]) == set(validate.RuleSet(validate.DEFAULT_RULES).names)
+
+
+@pytest.mark.pipeline
+def test_fail_on_thresholds():
+    report = {"rows": 200, "violations": {"range:gpa": {"count": 12},
+                                          "range:gre_aw": {"count": 2},
+                                          "invalid_json": {"count": 0}}}
+    t = [validate.parse_threshold(x) for x in ("range:*=5%", "invalid_json=0")]
+    assert validate.threshold_failures(report, t) == ["range:gpa: 6% > 5%"]
+    with pytest.raises(ValueError):
+        validate.parse_threshold("range:gpa")
+
+
+@pytest.mark.pipeline
+def test_chunk_cache_reuses_unchanged_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(validate, "CACHE_CHUNK", 4096)
+    path = tmp_path / "rows.jsonl"
+    rows = _rows(300)
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows[:200]), encoding="utf-8")
+    first = validate.check(str(path), cache=True)
+    assert first["cache"]["reused"] == 0
+
+    with open(path, "a", encoding="utf-8") as f:  # append-only growth
+        f.write("".join(json.dumps(r) + "\n" for r in rows[200:]))
+    second = validate.check(str(path), cache=True)
+    assert second["cache"]["reused"] == first["cache"]["chunks"] - 1
+
+    full = validate.check(str(path))
+    for rep in (second, full):
+        rep.pop("rule_seconds")
+    assert second.pop("cache") and second == full
+
+    data = path.read_bytes()  # edit a byte in the middle: only that chunk reruns
+    path.write_bytes(data.replace(b'"Program 5 ', b'"Program X ', 1))
+    third = validate.check(str(path), cache=True)
+    assert third["cache"]["reused"] == third["cache"]["chunks"] - 1
+
+
+def _pull_gate():
+    path = os.path.join(os.path.dirname(__file__), "..", "..", "module_3_new", "analysis_app.py")
+    spec = importlib.util.spec_from_file_location("module_3_new_analysis_app", path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod.PULL_GATE
+
+
+@pytest.mark.pipeline
+def test_pull_gate_passes_a_real_shaped_raw_scrape(tmp_path, monkeypatch, capsys):
+    # Raw GradCafe text, under the alternate keys module_2_new/clean.py accepts.
+    raw = {
+        "program": "Information Studies", "university": "McGill University",
+        "comments": "Did any of you apply for the fellowship?",
+        "date_added": "Added on March 3, 2025",
+        "url": "https://www.thegradcafe.com/result/935454",
+        "term": "Fall 2025", "us_or_international": "International",
+        "accept_date": None, "reject_date": None, "start_year": "2025",
+        "gre": "320", "gre_v": "160", "gre_aw": "4.5", "gpa": "3.8",
+    }
+    rows = [dict(raw, status="Wait listed", degree="Masters"),
+            dict(raw, status="Accepted on 1 Mar", degree="PhD"),
+            dict(raw, status="Rejected", degree="MS")]
+    path = tmp_path / "applicant_data.json"
+    path.write_text(json.dumps(rows), encoding="utf-8")
+    argv = ["validate.py", str(path)]
+    for t in _pull_gate():
+        argv += ["--fail-on", t]
+    monkeypatch.setattr(sys, "argv", argv)
+    validate.main()  # sys.exit(1) on any failed threshold
+    assert "no violations" in capsys.readouterr().out